@@ -1,4 +1,15 @@
-def bubble_sort(array, update_callback):
+from steps import OP_COMPARE, OP_SWAP, OP_SWEEP
+
+METADATA = {
+    "avg": "O(n^2)",
+    "best": "O(n)",
+    "rank": 4,
+    "stable": True,
+    "in_place": True,
+}
+
+
+def bubble_sort(array):
     n = len(array)
     swapped = True
     pass_num = 0
@@ -6,18 +17,16 @@ def bubble_sort(array, update_callback):
         swapped = False
         for j in range(0, n - pass_num - 1):
             # Highlight compared elements
-            update_callback(array, highlight_indices=[j, j + 1], moving_index=None)
+            yield OP_COMPARE, j, j + 1, 0
             if array[j] > array[j + 1]:
                 array[j], array[j + 1] = array[j + 1], array[j]
                 swapped = True
-                # Highlight swapped elements, moving_index shows the rightmost element involved
-                update_callback(array, highlight_indices=[j, j + 1], moving_index=j + 1)
+                # The right-hand element of the swap is the one shown moving
+                yield OP_SWAP, j, j + 1, 0
         pass_num += 1
         if not swapped:
             break
 
-    update_callback(array)  # Final update before sweep
-
     # Final sweep animation
     for i in range(n):
-        update_callback(array, moving_index=i, end=True, sweep=True)
+        yield OP_SWEEP, i, -1, 0
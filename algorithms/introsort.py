@@ -0,0 +1,128 @@
+from steps import OP_COMPARE, OP_SWAP, OP_WRITE, OP_SWEEP
+
+METADATA = {
+    "avg": "O(n log n)",
+    "best": "O(n log n)",
+    "rank": 2,
+    "stable": False,
+    "in_place": True,
+}
+
+INSERTION_CUTOFF = 16  # Partitions this small are left for the final insertion sort
+NINTHER_THRESHOLD = 128  # Larger partitions take the pivot from a ninther
+
+
+def introsort(array):
+    n = len(array)
+
+    def swap(i, j):
+        array[i], array[j] = array[j], array[i]
+        yield OP_SWAP, i, j, 0
+
+    def sort2(i, j):
+        yield OP_COMPARE, i, j, 0
+        if array[j] < array[i]:
+            yield from swap(i, j)
+
+    def sift_down(lo, root, end):
+        # Max-heap on array[lo:end], with node k of the heap at lo + k
+        while True:
+            child = 2 * root + 1
+            if child >= end - lo:
+                return
+            if child + 1 < end - lo:
+                yield OP_COMPARE, lo + child, lo + child + 1, 0
+                if array[lo + child] < array[lo + child + 1]:
+                    child += 1
+            yield OP_COMPARE, lo + root, lo + child, 0
+            if not array[lo + root] < array[lo + child]:
+                return
+            yield from swap(lo + root, lo + child)
+            root = child
+
+    def heap_sort(lo, hi):
+        size = hi - lo
+        for root in range(size // 2 - 1, -1, -1):
+            yield from sift_down(lo, root, hi)
+        for end in range(hi - 1, lo, -1):
+            yield from swap(lo, end)
+            yield from sift_down(lo, 0, end)
+
+    def sort3(i, j, k):
+        # Leaves the median of the three at j
+        yield from sort2(i, j)
+        yield from sort2(j, k)
+        yield from sort2(i, j)
+
+    def partition(lo, hi):
+        # Move the median of three, or for large partitions the median of three
+        # medians (a ninther), to lo. Afterwards some element right of lo is
+        # >= pivot, which stops the left scan without bounds checks.
+        mid = lo + (hi - lo) // 2
+        if hi - lo > NINTHER_THRESHOLD:
+            eighth = (hi - lo) // 8
+            yield from sort3(lo, lo + eighth, lo + 2 * eighth)
+            yield from sort3(mid - eighth, mid, mid + eighth)
+            yield from sort3(hi - 1 - 2 * eighth, hi - 1 - eighth, hi - 1)
+            yield from sort3(lo + eighth, mid, hi - 1 - eighth)
+        else:
+            yield from sort3(lo, mid, hi - 1)
+        yield from swap(lo, mid)
+        pivot = array[lo]
+        i = lo
+        j = hi
+        while True:
+            i += 1
+            yield OP_COMPARE, lo, i, 0
+            while array[i] < pivot:
+                i += 1
+                yield OP_COMPARE, lo, i, 0
+            j -= 1
+            yield OP_COMPARE, lo, j, 0
+            while pivot < array[j]:
+                j -= 1
+                yield OP_COMPARE, lo, j, 0
+            if i >= j:
+                break
+            yield from swap(i, j)
+        # Place the pivot between the two parts
+        yield from swap(lo, j)
+        return j
+
+    def introsort_loop(lo, hi, depth_limit):
+        while hi - lo > INSERTION_CUTOFF:
+            if depth_limit == 0:
+                # Quicksort is going quadratic on this input: finish with heapsort
+                yield from heap_sort(lo, hi)
+                return
+            depth_limit -= 1
+            p = yield from partition(lo, hi)
+            # Recurse into the smaller part, so the stack stays O(log n) deep
+            if p - lo < hi - p:
+                yield from introsort_loop(lo, p, depth_limit)
+                lo = p + 1
+            else:
+                yield from introsort_loop(p + 1, hi, depth_limit)
+                hi = p
+
+    def insertion_sort():
+        # Every element is at most INSERTION_CUTOFF places from its final position
+        for i in range(1, n):
+            key = array[i]
+            j = i - 1
+            yield OP_COMPARE, i, j, 0
+            while j >= 0 and key < array[j]:
+                value = array[j]
+                array[j + 1] = value
+                yield OP_WRITE, j + 1, -1, value
+                j -= 1
+            array[j + 1] = key
+            yield OP_WRITE, j + 1, -1, key
+
+    if n > 1:
+        yield from introsort_loop(0, n, 2 * (n.bit_length() - 1))
+        yield from insertion_sort()
+
+    # Final sweep animation
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
@@ -0,0 +1,93 @@
+from steps import OP_COMPARE, OP_WRITE, OP_SWEEP
+
+METADATA = {
+    "avg": "O(nk)",
+    "best": "O(nk)",
+    "rank": 1,
+    "stable": True,
+    "in_place": False,
+    "digit_bits": 8,
+}
+
+RADIX_BITS = 8  # Bits per digit: 8 splits 32-bit keys at most 4 levels deep
+INSERTION_CUTOFF = 32  # Buckets this small are finished by insertion sort
+
+
+def msd_radix_sort(array, bits=RADIX_BITS):
+    n = len(array)
+    if n == 0:
+        return  # Handle empty array
+
+    # Keys are taken relative to the smallest element, so negative values
+    # need no special case and small ranges need few levels
+    low = min(array)
+    span = max(array) - low
+    base = 1 << bits
+    mask = base - 1
+    buffer = [0] * n  # Scatter target shared by every bucket, allocated once
+    digits = [0] * n  # Each element's digit at the current level
+    count = [0] * base
+
+    def insertion_sort(lo, hi):
+        for i in range(lo + 1, hi):
+            key = array[i]
+            j = i - 1
+            yield OP_COMPARE, i, j, 0
+            while j >= lo and key < array[j]:
+                value = array[j]
+                array[j + 1] = value
+                yield OP_WRITE, j + 1, -1, value
+                j -= 1
+            array[j + 1] = key
+            yield OP_WRITE, j + 1, -1, key
+
+    def distribute(lo, hi, shift):
+        # Stable counting sort of array[lo:hi] by one digit; returns the
+        # bounds of the non-trivial buckets it produced
+        for d in range(base):
+            count[d] = 0
+        for i in range(lo, hi):
+            digit = ((array[i] - low) >> shift) & mask
+            digits[i] = digit
+            count[digit] += 1
+            # Highlight element being read
+            yield OP_COMPARE, i, i, 0
+
+        if count[digits[lo]] == hi - lo:
+            return [(lo, hi)]  # One bucket: skip straight to the next digit
+
+        buckets = []
+        position = lo
+        for d in range(base):
+            if count[d] > 1:
+                buckets.append((position, position + count[d]))
+            position, count[d] = position + count[d], position
+        for i in range(lo, hi):
+            digit = digits[i]
+            buffer[count[digit]] = array[i]
+            count[digit] += 1
+        for i in range(lo, hi):
+            value = buffer[i]
+            array[i] = value
+            # Show the element being placed
+            yield OP_WRITE, i, -1, value
+        return buckets
+
+    # Highest digit first; every bucket is then split by the next digit down
+    top = 0
+    while span >> (top + bits):
+        top += bits
+    stack = [(0, n, top)]
+    while stack:
+        lo, hi, shift = stack.pop()
+        if hi - lo <= INSERTION_CUTOFF:
+            yield from insertion_sort(lo, hi)
+            continue
+        buckets = yield from distribute(lo, hi, shift)
+        if shift > 0:
+            # Pushed in reverse, so buckets are finished left to right
+            stack.extend((start, end, shift - bits) for start, end in reversed(buckets))
+
+    # Final sweep animation
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
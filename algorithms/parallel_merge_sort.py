@@ -0,0 +1,127 @@
+from steps import OP_COMPARE, OP_WRITE, OP_SWEEP, OP_PARTITION
+
+METADATA = {
+    "avg": "O(n log n)",
+    "best": "O(n log n)",
+    "rank": 2,
+    "stable": True,
+    "in_place": False,
+}
+
+LANES = 4  # Workers shown side by side; parallel.py runs the same scheme on real cores
+
+
+def parallel_merge_sort(array):
+    n = len(array)
+    lanes = max(1, min(LANES, n))
+    temp = [0] * n
+
+    def run_lanes(workers):
+        # Advance every worker by one step in turn, so their steps interleave as
+        # if they ran at the same time. Workers never touch the same indices.
+        workers = list(workers)
+        while workers:
+            for worker in list(workers):
+                step = next(worker, None)
+                if step is None:
+                    workers.remove(worker)
+                else:
+                    yield step
+
+    def merge_into_temp(a_lo, a_hi, b_lo, b_hi, out):
+        # Merge array[a_lo:a_hi] and array[b_lo:b_hi] into temp[out:]; ties take
+        # the left run first, which keeps the sort stable
+        while a_lo < a_hi and b_lo < b_hi:
+            yield OP_COMPARE, a_lo, b_lo, 0
+            if array[b_lo] < array[a_lo]:
+                temp[out] = array[b_lo]
+                b_lo += 1
+            else:
+                temp[out] = array[a_lo]
+                a_lo += 1
+            out += 1
+        for k in range(a_lo, a_hi):
+            temp[out] = array[k]
+            out += 1
+        for k in range(b_lo, b_hi):
+            temp[out] = array[k]
+            out += 1
+
+    def copy_back(lo, hi):
+        for i in range(lo, hi):
+            value = temp[i]
+            array[i] = value
+            yield OP_WRITE, i, -1, value
+
+    def sort_chunk(lo, hi):
+        # One worker's bottom-up merge sort of its own chunk
+        width = 1
+        while width < hi - lo:
+            for start in range(lo, hi, 2 * width):
+                mid = min(start + width, hi)
+                end = min(start + 2 * width, hi)
+                if mid < end:
+                    yield from merge_into_temp(start, mid, mid, end, start)
+                    yield from copy_back(start, end)
+            width *= 2
+
+    def co_rank(k, a_lo, a_hi, b_lo, b_hi):
+        # How many of the first k merged elements come from run a. Lets a merge
+        # be split into independent pieces without merging anything first.
+        lo = max(0, k - (b_hi - b_lo))
+        hi = min(k, a_hi - a_lo)
+        while lo < hi:
+            i = (lo + hi) // 2
+            j = k - i
+            yield OP_COMPARE, a_lo + i, b_lo + j - 1, 0
+            if not array[b_lo + j - 1] < array[a_lo + i]:
+                lo = i + 1  # a[i] precedes b[j - 1], so it is among the first k
+            else:
+                hi = i
+        return lo
+
+    # Every worker sorts one contiguous chunk
+    bounds = [n * lane // lanes for lane in range(lanes + 1)]
+    for lane in range(lanes):
+        yield OP_PARTITION, bounds[lane], bounds[lane + 1], lane
+    yield from run_lanes(
+        sort_chunk(bounds[lane], bounds[lane + 1]) for lane in range(lanes)
+    )
+
+    # Merge runs pairwise. Each merge is split by output rank among its share
+    # of the workers, so every round keeps all of them busy.
+    runs = [(bounds[lane], bounds[lane + 1]) for lane in range(lanes)]
+    while len(runs) > 1:
+        merged = []
+        pieces = []  # (a_lo, a_hi, b_lo, b_hi, out) per worker
+        share = max(1, lanes // (len(runs) // 2))
+        for pair in range(0, len(runs) - 1, 2):
+            (a_lo, a_hi), (b_lo, b_hi) = runs[pair], runs[pair + 1]
+            total = b_hi - a_lo
+            splits = []
+            for q in range(share + 1):
+                k = total * q // share
+                i = yield from co_rank(k, a_lo, a_hi, b_lo, b_hi)
+                splits.append((k, i))
+            for (k0, i0), (k1, i1) in zip(splits, splits[1:]):
+                pieces.append(
+                    (a_lo + i0, a_lo + i1, b_lo + k0 - i0, b_lo + k1 - i1, a_lo + k0)
+                )
+            merged.append((a_lo, b_hi))
+        if len(runs) % 2:
+            merged.append(runs[-1])  # Waits for the next round
+        for lane, (a_lo, a_hi, b_lo, b_hi, out) in enumerate(pieces):
+            yield OP_PARTITION, out, out + (a_hi - a_lo) + (b_hi - b_lo), lane
+        yield from run_lanes(merge_into_temp(*piece) for piece in pieces)
+        # Every piece is merged before any is copied back over its inputs
+        yield from run_lanes(
+            copy_back(out, out + (a_hi - a_lo) + (b_hi - b_lo))
+            for a_lo, a_hi, b_lo, b_hi, out in pieces
+        )
+        runs = merged
+
+    yield OP_PARTITION, 0, n, -1
+
+    # Final sweep animation
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
@@ -0,0 +1,256 @@
+from steps import OP_COMPARE, OP_SWAP, OP_WRITE, OP_SWEEP
+
+METADATA = {
+    "avg": "O(n log n)",
+    "best": "O(n)",
+    "rank": 2,
+    "stable": False,
+    "in_place": True,
+}
+
+INSERTION_SORT_THRESHOLD = 24  # Partitions smaller than this are insertion sorted
+NINTHER_THRESHOLD = 128  # Partitions larger than this take the pivot from a ninther
+PARTIAL_INSERTION_SORT_LIMIT = 8  # Moves allowed before giving up on a sorted guess
+
+
+def pdqsort(array):
+    n = len(array)
+
+    def swap(i, j):
+        array[i], array[j] = array[j], array[i]
+        yield OP_SWAP, i, j, 0
+
+    def sort2(i, j):
+        yield OP_COMPARE, i, j, 0
+        if array[j] < array[i]:
+            yield from swap(i, j)
+
+    def sort3(i, j, k):
+        # Leaves the median of the three at j
+        yield from sort2(i, j)
+        yield from sort2(j, k)
+        yield from sort2(i, j)
+
+    def insertion_sort(begin, end):
+        for i in range(begin + 1, end):
+            key = array[i]
+            j = i - 1
+            yield OP_COMPARE, i, j, 0
+            if not key < array[j]:
+                continue
+            while j >= begin and key < array[j]:
+                value = array[j]
+                array[j + 1] = value
+                yield OP_WRITE, j + 1, -1, value
+                j -= 1
+                if j >= begin:
+                    yield OP_COMPARE, i, j, 0
+            array[j + 1] = key
+            yield OP_WRITE, j + 1, -1, key
+
+    def partial_insertion_sort(begin, end):
+        # Insertion sort that gives up after PARTIAL_INSERTION_SORT_LIMIT moves;
+        # returns whether array[begin:end] ended up sorted
+        moved = 0
+        for i in range(begin + 1, end):
+            yield OP_COMPARE, i, i - 1, 0
+            if not array[i] < array[i - 1]:
+                continue
+            key = array[i]
+            j = i - 1
+            while j >= begin and key < array[j]:
+                value = array[j]
+                array[j + 1] = value
+                yield OP_WRITE, j + 1, -1, value
+                j -= 1
+            array[j + 1] = key
+            yield OP_WRITE, j + 1, -1, key
+            moved += i - (j + 1)
+            if moved > PARTIAL_INSERTION_SORT_LIMIT:
+                return False
+        return True
+
+    def sift_down(lo, root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end - lo:
+                return
+            if child + 1 < end - lo:
+                yield OP_COMPARE, lo + child, lo + child + 1, 0
+                if array[lo + child] < array[lo + child + 1]:
+                    child += 1
+            yield OP_COMPARE, lo + root, lo + child, 0
+            if not array[lo + root] < array[lo + child]:
+                return
+            yield from swap(lo + root, lo + child)
+            root = child
+
+    def heap_sort(begin, end):
+        for root in range((end - begin) // 2 - 1, -1, -1):
+            yield from sift_down(begin, root, end)
+        for last in range(end - 1, begin, -1):
+            yield from swap(begin, last)
+            yield from sift_down(begin, 0, last)
+
+    def partition_right(begin, end):
+        # Partitions around the pivot at array[begin]; elements equal to it go
+        # right. Returns the pivot's final index and whether no swap was needed.
+        pivot = array[begin]
+        first = begin + 1
+        yield OP_COMPARE, begin, first, 0
+        # The median-of-three guarantees an element >= pivot further right
+        while array[first] < pivot:
+            first += 1
+            yield OP_COMPARE, begin, first, 0
+        last = end
+        if first - 1 == begin:
+            # No guard on this side: bounds-check the scan
+            while first < last:
+                last -= 1
+                yield OP_COMPARE, begin, last, 0
+                if array[last] < pivot:
+                    break
+        else:
+            last -= 1
+            yield OP_COMPARE, begin, last, 0
+            while not array[last] < pivot:
+                last -= 1
+                yield OP_COMPARE, begin, last, 0
+        already_partitioned = first >= last
+        while first < last:
+            yield from swap(first, last)
+            first += 1
+            yield OP_COMPARE, begin, first, 0
+            while array[first] < pivot:
+                first += 1
+                yield OP_COMPARE, begin, first, 0
+            last -= 1
+            yield OP_COMPARE, begin, last, 0
+            while not array[last] < pivot:
+                last -= 1
+                yield OP_COMPARE, begin, last, 0
+        pivot_pos = first - 1
+        yield from swap(begin, pivot_pos)
+        return pivot_pos, already_partitioned
+
+    def partition_left(begin, end):
+        # Like partition_right, but elements equal to the pivot go left. Used when
+        # the pivot equals the element before the partition: all of those equal
+        # elements are then in place, so runs of duplicates take linear time.
+        pivot = array[begin]
+        last = end - 1
+        yield OP_COMPARE, begin, last, 0
+        while pivot < array[last]:
+            last -= 1
+            yield OP_COMPARE, begin, last, 0
+        first = begin
+        if last + 1 == end:
+            while first < last:
+                first += 1
+                yield OP_COMPARE, begin, first, 0
+                if pivot < array[first]:
+                    break
+        else:
+            first += 1
+            yield OP_COMPARE, begin, first, 0
+            while not pivot < array[first]:
+                first += 1
+                yield OP_COMPARE, begin, first, 0
+        while first < last:
+            yield from swap(first, last)
+            last -= 1
+            yield OP_COMPARE, begin, last, 0
+            while pivot < array[last]:
+                last -= 1
+                yield OP_COMPARE, begin, last, 0
+            first += 1
+            yield OP_COMPARE, begin, first, 0
+            while not pivot < array[first]:
+                first += 1
+                yield OP_COMPARE, begin, first, 0
+        yield from swap(begin, last)
+        return last
+
+    def break_patterns(begin, pivot_pos, end):
+        # After a badly unbalanced partition, swap a few elements around so that
+        # patterns in the input cannot keep producing bad pivots
+        left = pivot_pos - begin
+        right = end - (pivot_pos + 1)
+        if left >= INSERTION_SORT_THRESHOLD:
+            quarter = left // 4
+            yield from swap(begin, begin + quarter)
+            yield from swap(pivot_pos - 1, pivot_pos - quarter)
+            if left > NINTHER_THRESHOLD:
+                yield from swap(begin + 1, begin + quarter + 1)
+                yield from swap(begin + 2, begin + quarter + 2)
+                yield from swap(pivot_pos - 2, pivot_pos - (quarter + 1))
+                yield from swap(pivot_pos - 3, pivot_pos - (quarter + 2))
+        if right >= INSERTION_SORT_THRESHOLD:
+            quarter = right // 4
+            yield from swap(pivot_pos + 1, pivot_pos + 1 + quarter)
+            yield from swap(end - 1, end - quarter)
+            if right > NINTHER_THRESHOLD:
+                yield from swap(pivot_pos + 2, pivot_pos + 2 + quarter)
+                yield from swap(pivot_pos + 3, pivot_pos + 3 + quarter)
+                yield from swap(end - 2, end - (quarter + 1))
+                yield from swap(end - 3, end - (quarter + 2))
+
+    def pdqsort_loop(begin, end, bad_allowed, leftmost):
+        while True:
+            size = end - begin
+            if size < INSERTION_SORT_THRESHOLD:
+                yield from insertion_sort(begin, end)
+                return
+
+            # Move the pivot to begin: the median of three, or a ninther
+            half = size // 2
+            if size > NINTHER_THRESHOLD:
+                yield from sort3(begin, begin + half, end - 1)
+                yield from sort3(begin + 1, begin + half - 1, end - 2)
+                yield from sort3(begin + 2, begin + half + 1, end - 3)
+                yield from sort3(begin + half - 1, begin + half, begin + half + 1)
+                yield from swap(begin, begin + half)
+            else:
+                yield from sort3(begin + half, begin, end - 1)
+
+            # A pivot equal to the element before this partition is the smallest
+            # value in it: put every copy of it on the left and skip them
+            if not leftmost:
+                yield OP_COMPARE, begin - 1, begin, 0
+                if not array[begin - 1] < array[begin]:
+                    begin = (yield from partition_left(begin, end)) + 1
+                    continue
+
+            pivot_pos, already_partitioned = yield from partition_right(begin, end)
+            left = pivot_pos - begin
+            right = end - (pivot_pos + 1)
+            if left < size // 8 or right < size // 8:
+                bad_allowed -= 1
+                if bad_allowed == 0:
+                    # Too many bad pivots: guarantee O(n log n) with heapsort
+                    yield from heap_sort(begin, end)
+                    return
+                yield from break_patterns(begin, pivot_pos, end)
+            elif already_partitioned:
+                # No swaps were needed, so the input is probably (nearly) sorted
+                left_sorted = yield from partial_insertion_sort(begin, pivot_pos)
+                if left_sorted:
+                    right_sorted = yield from partial_insertion_sort(pivot_pos + 1, end)
+                    if right_sorted:
+                        return
+
+            # Recurse into the smaller part, so the stack stays O(log n) deep
+            if left < right:
+                yield from pdqsort_loop(begin, pivot_pos, bad_allowed, leftmost)
+                begin = pivot_pos + 1
+                leftmost = False
+            else:
+                yield from pdqsort_loop(pivot_pos + 1, end, bad_allowed, False)
+                end = pivot_pos
+
+    if n > 1:
+        yield from pdqsort_loop(0, n, n.bit_length() - 1, True)
+
+    # Final sweep animation
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
@@ -1,36 +1,45 @@
-def quick_sort(array, update_callback):
+from steps import OP_COMPARE, OP_SWAP, OP_SWEEP
+
+METADATA = {
+    "avg": "O(n log n)",
+    "best": "O(n log n)",
+    "worst": "O(n^2)",
+    "rank": 2,
+    "stable": False,
+    "in_place": True,
+}
+
+
+def quick_sort(array):
     def partition(low, high):
         pivot = array[high]
-        # Highlight the pivot element
-        update_callback(array, highlight_indices=[high], moving_index=None)
         i = low - 1
         for j in range(low, high):
-            # Highlight elements being compared
-            update_callback(array, highlight_indices=[i + 1, j, high], moving_index=j)
+            # Highlight the pivot and the element compared against it
+            yield OP_COMPARE, high, j, 0
             if array[j] < pivot:
                 i += 1
                 array[i], array[j] = array[j], array[i]
                 # Highlight the swap
-                update_callback(array, highlight_indices=[i, j, high], moving_index=j)
+                yield OP_SWAP, i, j, 0
 
         # Place pivot in correct position
         array[i + 1], array[high] = array[high], array[i + 1]
         # Highlight the pivot's final position for this partition
-        update_callback(array, highlight_indices=[i + 1], moving_index=i + 1)
+        yield OP_SWAP, high, i + 1, 0
         return i + 1
 
     def quick_sort_recursive(low, high):
         if low < high:
             # pi is partitioning index, array[p] is now at right place
-            pi = partition(low, high)
+            pi = yield from partition(low, high)
 
             # Separately sort elements before partition and after partition
-            quick_sort_recursive(low, pi - 1)
-            quick_sort_recursive(pi + 1, high)
+            yield from quick_sort_recursive(low, pi - 1)
+            yield from quick_sort_recursive(pi + 1, high)
 
-    quick_sort_recursive(0, len(array) - 1)
-    update_callback(array)  # Final update before sweep
+    yield from quick_sort_recursive(0, len(array) - 1)
 
     # Final sweep animation
     for i in range(len(array)):
-        update_callback(array, moving_index=i, end=True, sweep=True)
+        yield OP_SWEEP, i, -1, 0
@@ -1,50 +1,81 @@
-def radix_sort(array, update_callback):
-    def counting_sort(array, exp):
-        n = len(array)
-        output = [0] * n
-        count = [0] * 10
+from steps import OP_COMPARE, OP_WRITE, OP_SWEEP
 
-        # Store count of occurrences in count[]
-        for i in range(n):
-            index = array[i] // exp
-            count[index % 10] += 1
-            # Highlight element being read
-            update_callback(array, highlight_indices=[i], moving_index=None)
-
-        # Change count[i] so that count[i] now contains actual
-        # position of this digit in output[]
-        for i in range(1, 10):
-            count[i] += count[i - 1]
-
-        # Build the output array
-        i = n - 1
-        while i >= 0:
-            index = array[i] // exp
-            output_idx = count[index % 10] - 1
-            output[output_idx] = array[i]
-            count[index % 10] -= 1
-            # Highlight element being placed
-            update_callback(array, highlight_indices=[i], moving_index=output_idx)
-            i -= 1
-
-        # Copy the output array to array[], so that array[] now
-        # contains sorted numbers according to current digit
-        for i in range(n):
-            array[i] = output[i]
-            # Show the array after this pass - highlight the element just placed
-            update_callback(array, highlight_indices=[], moving_index=i)
+METADATA = {
+    "avg": "O(nk)",
+    "best": "O(nk)",
+    "rank": 1,
+    "stable": True,
+    "in_place": False,
+    "digit_bits": 8,
+}
+
+RADIX_BITS = 8  # Bits per digit: 8 sorts 32-bit keys in 4 passes, 4 (base 16) in 8
 
-    if not array:
+
+def radix_sort(array, bits=RADIX_BITS):
+    n = len(array)
+    if n == 0:
         return  # Handle empty array
 
-    max_element = max(array) if array else 0
-    exp = 1
-    while max_element // exp > 0:
-        counting_sort(array, exp)
-        exp *= 10
+    # Keys are taken relative to the smallest element, so negative values
+    # need no special case and small ranges need few passes
+    low = min(array)
+    span = max(array) - low
+    base = 1 << bits
+    mask = base - 1
+    buffer = [0] * n  # Ping-pong partner of array, allocated once
+    digits = [0] * n  # Each element's digit for the current pass
+    count = [0] * base
+
+    def counting_pass(source, target, shift):
+        # Digits are extracted once per element per pass, with a shift and a mask
+        for d in range(base):
+            count[d] = 0
+        for i in range(n):
+            digit = ((source[i] - low) >> shift) & mask
+            digits[i] = digit
+            count[digit] += 1
+            if source is array:
+                # Highlight element being read
+                yield OP_COMPARE, i, i, 0
+
+        if count[digits[0]] == n:
+            return False  # Every element has the same digit: nothing moves
+
+        # Change count[d] so that count[d] now contains the first position
+        # of digit d in target
+        position = 0
+        for d in range(base):
+            position, count[d] = position + count[d], position
+
+        # Scatter front to back, which keeps equal digits in order
+        for i in range(n):
+            digit = digits[i]
+            index = count[digit]
+            count[digit] = index + 1
+            value = source[i]
+            target[index] = value
+            if target is array:
+                # Show the element being placed
+                yield OP_WRITE, index, -1, value
+        return True
+
+    # Passes alternate between array and buffer instead of copying back
+    source, target = array, buffer
+    shift = 0
+    while shift == 0 or span >> shift:
+        moved = yield from counting_pass(source, target, shift)
+        if moved:
+            source, target = target, source
+        shift += bits
 
-    update_callback(array)  # Final update before sweep
+    if source is buffer:
+        # An odd number of passes moved elements: the result is in buffer
+        for i in range(n):
+            value = buffer[i]
+            array[i] = value
+            yield OP_WRITE, i, -1, value
 
     # Final sweep animation
-    for i in range(len(array)):
-        update_callback(array, moving_index=i, end=True, sweep=True)
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
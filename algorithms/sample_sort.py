@@ -0,0 +1,134 @@
+from steps import OP_COMPARE, OP_SWAP, OP_WRITE, OP_SWEEP, OP_PARTITION
+
+METADATA = {
+    "avg": "O(n log n)",
+    "best": "O(n log n)",
+    "rank": 2,
+    "stable": False,
+    "in_place": False,
+}
+
+LANES = 4  # Workers shown side by side; parallel.py runs the same scheme on real cores
+OVERSAMPLING = 8  # Sampled elements per bucket; more samples give more even buckets
+
+
+def sample_sort(array):
+    n = len(array)
+    lanes = max(1, min(LANES, n // OVERSAMPLING))
+    temp = [0] * n
+
+    def run_lanes(workers):
+        # Advance every worker by one step in turn, so their steps interleave as
+        # if they ran at the same time. Workers never touch the same indices.
+        workers = list(workers)
+        while workers:
+            for worker in list(workers):
+                step = next(worker, None)
+                if step is None:
+                    workers.remove(worker)
+                else:
+                    yield step
+
+    def classify(lo, hi, buckets, counts):
+        # Binary search every element of one chunk among the splitters
+        for i in range(lo, hi):
+            low, high = 0, len(splitters)
+            while low < high:
+                mid = (low + high) // 2
+                yield OP_COMPARE, i, splitter_at[mid], 0
+                if array[i] < splitters[mid]:
+                    high = mid
+                else:
+                    low = mid + 1
+            buckets[i - lo] = low
+            counts[low] += 1
+
+    def copy_back(lo, hi):
+        for i in range(lo, hi):
+            value = temp[i]
+            array[i] = value
+            yield OP_WRITE, i, -1, value
+
+    def swap(i, j):
+        array[i], array[j] = array[j], array[i]
+        yield OP_SWAP, i, j, 0
+
+    def sift_down(lo, root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end - lo:
+                return
+            if child + 1 < end - lo:
+                yield OP_COMPARE, lo + child, lo + child + 1, 0
+                if array[lo + child] < array[lo + child + 1]:
+                    child += 1
+            yield OP_COMPARE, lo + root, lo + child, 0
+            if not array[lo + root] < array[lo + child]:
+                return
+            yield from swap(lo + root, lo + child)
+            root = child
+
+    def sort_bucket(lo, hi):
+        # One worker's heapsort of its own bucket
+        for root in range((hi - lo) // 2 - 1, -1, -1):
+            yield from sift_down(lo, root, hi)
+        for end in range(hi - 1, lo, -1):
+            yield from swap(lo, end)
+            yield from sift_down(lo, 0, end)
+
+    # Splitter selection: sort an evenly spaced sample and take every
+    # OVERSAMPLING-th element of it
+    size = min(n, OVERSAMPLING * lanes)
+    sample = [(2 * k + 1) * n // (2 * size) for k in range(size)]
+    for k in range(1, size):
+        position = sample[k]
+        j = k - 1
+        while j >= 0:
+            yield OP_COMPARE, position, sample[j], 0
+            if not array[position] < array[sample[j]]:
+                break
+            sample[j + 1] = sample[j]
+            j -= 1
+        sample[j + 1] = position
+    splitter_at = [sample[OVERSAMPLING * b] for b in range(1, lanes)]
+    splitters = [array[i] for i in splitter_at]
+
+    # Every worker classifies one contiguous chunk into the buckets
+    bounds = [n * lane // lanes for lane in range(lanes + 1)]
+    chunk_buckets = [[0] * (bounds[k + 1] - bounds[k]) for k in range(lanes)]
+    chunk_counts = [[0] * lanes for _ in range(lanes)]
+    for lane in range(lanes):
+        yield OP_PARTITION, bounds[lane], bounds[lane + 1], lane
+    yield from run_lanes(
+        classify(bounds[k], bounds[k + 1], chunk_buckets[k], chunk_counts[k])
+        for k in range(lanes)
+    )
+
+    # Bucket b starts after every smaller bucket; within it, chunk k's elements
+    # follow those of the chunks before k
+    starts = []
+    offsets = [[0] * lanes for _ in range(lanes)]
+    position = 0
+    for b in range(lanes):
+        starts.append(position)
+        for k in range(lanes):
+            offsets[k][b] = position
+            position += chunk_counts[k][b]
+    starts.append(n)
+    for k in range(lanes):
+        slots = offsets[k]
+        for offset, b in enumerate(chunk_buckets[k]):
+            temp[slots[b]] = array[bounds[k] + offset]
+            slots[b] += 1
+
+    # Each worker now owns one bucket: gather it, then sort it
+    for lane in range(lanes):
+        yield OP_PARTITION, starts[lane], starts[lane + 1], lane
+    yield from run_lanes(copy_back(starts[b], starts[b + 1]) for b in range(lanes))
+    yield from run_lanes(sort_bucket(starts[b], starts[b + 1]) for b in range(lanes))
+
+    yield OP_PARTITION, 0, n, -1
+
+    # Final sweep animation
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
@@ -1,4 +1,15 @@
-def shell_sort(array, update_callback):
+from steps import OP_WRITE, OP_SWEEP
+
+METADATA = {
+    "avg": "~O(n log^2 n)",
+    "best": "O(n log n)",
+    "rank": 3,
+    "stable": False,
+    "in_place": True,
+}
+
+
+def shell_sort(array):
     n = len(array)
     # Start with a large gap, then reduce the gap
     # Using Knuth's sequence: h = h * 3 + 1 -> ..., 40, 13, 4, 1
@@ -18,22 +29,19 @@ def shell_sort(array, update_callback):
             # shift earlier gap-sorted elements up until the correct location for a[i] is found
             j = i
             while j >= gap and array[j - gap] > temp:
-                array[j] = array[j - gap]
-                # Highlight comparison and movement
-                update_callback(array, highlight_indices=[j, j - gap], moving_index=j)
+                value = array[j - gap]
+                array[j] = value
+                # Show the movement
+                yield OP_WRITE, j, -1, value
                 j -= gap
 
             # put temp (the original a[i]) in its correct location
             array[j] = temp
-            update_callback(
-                array, highlight_indices=[i], moving_index=j
-            )  # Show final placement
+            yield OP_WRITE, j, -1, temp  # Show final placement
 
         # Reduce the gap
         gap = gap // 3  # Integer division is fine here
 
-    update_callback(array)  # Final update before sweep
-
     # Final sweep animation
     for i in range(n):
-        update_callback(array, moving_index=i, end=True, sweep=True)
+        yield OP_SWEEP, i, -1, 0
@@ -0,0 +1,461 @@
+from steps import OP_COMPARE, OP_SWAP, OP_WRITE, OP_SWEEP
+
+METADATA = {
+    "avg": "O(n log n)",
+    "best": "O(n)",
+    "rank": 2,
+    "stable": True,
+    "in_place": False,
+}
+
+MIN_MERGE = 64  # Arrays shorter than this are sorted as a single binary insertion run
+MIN_GALLOP = 7  # Consecutive wins by one run before a merge starts galloping
+
+
+def timsort(array):
+    n = len(array)
+    min_gallop = MIN_GALLOP
+    runs = []  # Stack of pending runs as [base, length]
+
+    def compute_min_run(size):
+        # Between MIN_MERGE / 2 and MIN_MERGE, so size / min_run is a power of two
+        # or just below one, which keeps the final merges balanced
+        r = 0
+        while size >= MIN_MERGE:
+            r |= size & 1
+            size >>= 1
+        return size + r
+
+    def reverse(lo, hi):
+        hi -= 1
+        while lo < hi:
+            array[lo], array[hi] = array[hi], array[lo]
+            yield OP_SWAP, lo, hi, 0
+            lo += 1
+            hi -= 1
+
+    def count_run(lo, hi):
+        # Length of the run starting at lo; a strictly descending run is reversed
+        run_hi = lo + 1
+        if run_hi == hi:
+            return 1
+        yield OP_COMPARE, run_hi, lo, 0
+        run_hi += 1
+        if array[lo + 1] < array[lo]:
+            while run_hi < hi:
+                yield OP_COMPARE, run_hi, run_hi - 1, 0
+                if not array[run_hi] < array[run_hi - 1]:
+                    break
+                run_hi += 1
+            yield from reverse(lo, run_hi)
+        else:
+            while run_hi < hi:
+                yield OP_COMPARE, run_hi, run_hi - 1, 0
+                if array[run_hi] < array[run_hi - 1]:
+                    break
+                run_hi += 1
+        return run_hi - lo
+
+    def binary_insertion_sort(lo, hi, start):
+        # array[lo:start] is already sorted
+        for i in range(start, hi):
+            pivot = array[i]
+            left = lo
+            right = i
+            while left < right:
+                mid = (left + right) // 2
+                yield OP_COMPARE, i, mid, 0
+                if pivot < array[mid]:
+                    right = mid
+                else:
+                    left = mid + 1
+            # Shift the larger elements right; equal ones stay in front (stable)
+            for k in range(i, left, -1):
+                value = array[k - 1]
+                array[k] = value
+                yield OP_WRITE, k, -1, value
+            array[left] = pivot
+            yield OP_WRITE, left, -1, pivot
+
+    def gallop_left(key, key_at, seq, offset, base, length, hint):
+        # Leftmost k with key <= seq[base + k], searching outwards from hint.
+        # seq[i] is shown at array index i + offset.
+        last_ofs = 0
+        ofs = 1
+        yield OP_COMPARE, key_at, base + hint + offset, 0
+        if seq[base + hint] < key:
+            max_ofs = length - hint
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_at, base + hint + ofs + offset, 0
+                if not seq[base + hint + ofs] < key:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            ofs = min(ofs, max_ofs)
+            last_ofs += hint
+            ofs += hint
+        else:
+            max_ofs = hint + 1
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_at, base + hint - ofs + offset, 0
+                if seq[base + hint - ofs] < key:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            ofs = min(ofs, max_ofs)
+            last_ofs, ofs = hint - ofs, hint - last_ofs
+        # seq[base + last_ofs] < key <= seq[base + ofs]; binary search in between
+        last_ofs += 1
+        while last_ofs < ofs:
+            mid = last_ofs + ((ofs - last_ofs) >> 1)
+            yield OP_COMPARE, key_at, base + mid + offset, 0
+            if seq[base + mid] < key:
+                last_ofs = mid + 1
+            else:
+                ofs = mid
+        return ofs
+
+    def gallop_right(key, key_at, seq, offset, base, length, hint):
+        # Leftmost k with key < seq[base + k], so equal elements stay in front
+        last_ofs = 0
+        ofs = 1
+        yield OP_COMPARE, key_at, base + hint + offset, 0
+        if key < seq[base + hint]:
+            max_ofs = hint + 1
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_at, base + hint - ofs + offset, 0
+                if not key < seq[base + hint - ofs]:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            ofs = min(ofs, max_ofs)
+            last_ofs, ofs = hint - ofs, hint - last_ofs
+        else:
+            max_ofs = length - hint
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_at, base + hint + ofs + offset, 0
+                if key < seq[base + hint + ofs]:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            ofs = min(ofs, max_ofs)
+            last_ofs += hint
+            ofs += hint
+        # seq[base + last_ofs] <= key < seq[base + ofs]; binary search in between
+        last_ofs += 1
+        while last_ofs < ofs:
+            mid = last_ofs + ((ofs - last_ofs) >> 1)
+            yield OP_COMPARE, key_at, base + mid + offset, 0
+            if key < seq[base + mid]:
+                ofs = mid
+            else:
+                last_ofs = mid + 1
+        return ofs
+
+    def copy(seq, src, dest, count):
+        # Copy count elements of seq from src to array at dest. Within the array
+        # the copy runs backwards when moving right, so overlaps are safe.
+        order = (
+            range(count - 1, -1, -1) if seq is array and dest > src else range(count)
+        )
+        for k in order:
+            value = seq[src + k]
+            array[dest + k] = value
+            yield OP_WRITE, dest + k, -1, value
+
+    def merge_lo(base1, len1, base2, len2):
+        # Merge forwards with the shorter left run copied out; base1 + len1 == base2
+        nonlocal min_gallop
+        temp = [array[base1 + k] for k in range(len1)]
+        cursor1 = 0  # Into temp
+        cursor2 = base2
+        dest = base1
+        # array[base2] is known to be the smallest element of both runs
+        value = array[cursor2]
+        array[dest] = value
+        yield OP_WRITE, dest, -1, value
+        dest += 1
+        cursor2 += 1
+        len2 -= 1
+        if len2 == 0:
+            yield from copy(temp, cursor1, dest, len1)
+            return
+        if len1 == 1:
+            yield from copy(array, cursor2, dest, len2)
+            array[dest + len2] = temp[cursor1]
+            yield OP_WRITE, dest + len2, -1, temp[cursor1]
+            return
+
+        done = False
+        while not done:
+            count1 = count2 = 0  # Consecutive wins of each run
+            # One element at a time until a run keeps winning
+            while True:
+                yield OP_COMPARE, cursor2, dest, 0
+                if array[cursor2] < temp[cursor1]:
+                    value = array[cursor2]
+                    array[dest] = value
+                    yield OP_WRITE, dest, -1, value
+                    dest += 1
+                    cursor2 += 1
+                    count2 += 1
+                    count1 = 0
+                    len2 -= 1
+                    if len2 == 0:
+                        done = True
+                        break
+                else:
+                    value = temp[cursor1]
+                    array[dest] = value
+                    yield OP_WRITE, dest, -1, value
+                    dest += 1
+                    cursor1 += 1
+                    count1 += 1
+                    count2 = 0
+                    len1 -= 1
+                    if len1 == 1:
+                        done = True
+                        break
+                if (count1 | count2) >= min_gallop:
+                    break
+            # Galloping: find where the next element of each run goes, and
+            # copy everything in front of it at once
+            while not done:
+                # temp[k] is shown at base1 + k, where it was copied from
+                count1 = yield from gallop_right(
+                    array[cursor2], cursor2, temp, base1, cursor1, len1, 0
+                )
+                if count1:
+                    yield from copy(temp, cursor1, dest, count1)
+                    dest += count1
+                    cursor1 += count1
+                    len1 -= count1
+                    if len1 <= 1:
+                        done = True
+                        break
+                value = array[cursor2]
+                array[dest] = value
+                yield OP_WRITE, dest, -1, value
+                dest += 1
+                cursor2 += 1
+                len2 -= 1
+                if len2 == 0:
+                    done = True
+                    break
+                count2 = yield from gallop_left(
+                    temp[cursor1], dest, array, 0, cursor2, len2, 0
+                )
+                if count2:
+                    yield from copy(array, cursor2, dest, count2)
+                    dest += count2
+                    cursor2 += count2
+                    len2 -= count2
+                    if len2 == 0:
+                        done = True
+                        break
+                value = temp[cursor1]
+                array[dest] = value
+                yield OP_WRITE, dest, -1, value
+                dest += 1
+                cursor1 += 1
+                len1 -= 1
+                if len1 == 1:
+                    done = True
+                    break
+                min_gallop -= 1
+                if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+                    break
+            if not done:
+                # Galloping stopped paying off: make it harder to start again
+                min_gallop = max(min_gallop, 0) + 2
+        min_gallop = max(min_gallop, 1)
+
+        if len1 == 1:
+            yield from copy(array, cursor2, dest, len2)
+            array[dest + len2] = temp[cursor1]
+            yield OP_WRITE, dest + len2, -1, temp[cursor1]
+        elif len1 == 0:
+            raise ValueError("Comparison method violates its general contract")
+        else:
+            yield from copy(temp, cursor1, dest, len1)
+
+    def merge_hi(base1, len1, base2, len2):
+        # Merge backwards with the shorter right run copied out
+        nonlocal min_gallop
+        temp = [array[base2 + k] for k in range(len2)]
+        cursor1 = base1 + len1 - 1
+        cursor2 = len2 - 1  # Into temp
+        dest = base2 + len2 - 1
+        # array[cursor1] is known to be the largest element of both runs
+        value = array[cursor1]
+        array[dest] = value
+        yield OP_WRITE, dest, -1, value
+        dest -= 1
+        cursor1 -= 1
+        len1 -= 1
+        if len1 == 0:
+            yield from copy(temp, 0, dest - (len2 - 1), len2)
+            return
+        if len2 == 1:
+            dest -= len1
+            cursor1 -= len1
+            yield from copy(array, cursor1 + 1, dest + 1, len1)
+            array[dest] = temp[cursor2]
+            yield OP_WRITE, dest, -1, temp[cursor2]
+            return
+
+        done = False
+        while not done:
+            count1 = count2 = 0
+            while True:
+                yield OP_COMPARE, cursor1, dest, 0
+                if temp[cursor2] < array[cursor1]:
+                    value = array[cursor1]
+                    array[dest] = value
+                    yield OP_WRITE, dest, -1, value
+                    dest -= 1
+                    cursor1 -= 1
+                    count1 += 1
+                    count2 = 0
+                    len1 -= 1
+                    if len1 == 0:
+                        done = True
+                        break
+                else:
+                    value = temp[cursor2]
+                    array[dest] = value
+                    yield OP_WRITE, dest, -1, value
+                    dest -= 1
+                    cursor2 -= 1
+                    count2 += 1
+                    count1 = 0
+                    len2 -= 1
+                    if len2 == 1:
+                        done = True
+                        break
+                if (count1 | count2) >= min_gallop:
+                    break
+            while not done:
+                count1 = len1 - (
+                    yield from gallop_right(
+                        temp[cursor2], dest, array, 0, base1, len1, len1 - 1
+                    )
+                )
+                if count1:
+                    dest -= count1
+                    cursor1 -= count1
+                    len1 -= count1
+                    yield from copy(array, cursor1 + 1, dest + 1, count1)
+                    if len1 == 0:
+                        done = True
+                        break
+                value = temp[cursor2]
+                array[dest] = value
+                yield OP_WRITE, dest, -1, value
+                dest -= 1
+                cursor2 -= 1
+                len2 -= 1
+                if len2 == 1:
+                    done = True
+                    break
+                count2 = len2 - (
+                    yield from gallop_left(
+                        array[cursor1], cursor1, temp, base2, 0, len2, len2 - 1
+                    )
+                )
+                if count2:
+                    dest -= count2
+                    cursor2 -= count2
+                    len2 -= count2
+                    yield from copy(temp, cursor2 + 1, dest + 1, count2)
+                    if len2 <= 1:
+                        done = True
+                        break
+                value = array[cursor1]
+                array[dest] = value
+                yield OP_WRITE, dest, -1, value
+                dest -= 1
+                cursor1 -= 1
+                len1 -= 1
+                if len1 == 0:
+                    done = True
+                    break
+                min_gallop -= 1
+                if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+                    break
+            if not done:
+                min_gallop = max(min_gallop, 0) + 2
+        min_gallop = max(min_gallop, 1)
+
+        if len2 == 1:
+            dest -= len1
+            cursor1 -= len1
+            yield from copy(array, cursor1 + 1, dest + 1, len1)
+            array[dest] = temp[cursor2]
+            yield OP_WRITE, dest, -1, temp[cursor2]
+        elif len2 == 0:
+            raise ValueError("Comparison method violates its general contract")
+        else:
+            yield from copy(temp, 0, dest - (len2 - 1), len2)
+
+    def merge_at(i):
+        base1, len1 = runs[i]
+        base2, len2 = runs[i + 1]
+        runs[i][1] = len1 + len2
+        del runs[i + 1]
+        # Elements of run 1 that are not above run 2's first element are in place
+        k = yield from gallop_right(array[base2], base2, array, 0, base1, len1, 0)
+        base1 += k
+        len1 -= k
+        if len1 == 0:
+            return
+        # And so are the elements of run 2 not below run 1's last element
+        len2 = yield from gallop_left(
+            array[base1 + len1 - 1], base1 + len1 - 1, array, 0, base2, len2, len2 - 1
+        )
+        if len2 == 0:
+            return
+        if len1 <= len2:
+            yield from merge_lo(base1, len1, base2, len2)
+        else:
+            yield from merge_hi(base1, len1, base2, len2)
+
+    def merge_collapse():
+        # Keep the run lengths on the stack growing at least like Fibonacci
+        # numbers, so merges stay balanced and the stack stays short
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if (k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1]) or (
+                k > 1 and runs[k - 2][1] <= runs[k - 1][1] + runs[k][1]
+            ):
+                if runs[k - 1][1] < runs[k + 1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k + 1][1]:
+                break
+            yield from merge_at(k)
+
+    def merge_force_collapse():
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if k > 0 and runs[k - 1][1] < runs[k + 1][1]:
+                k -= 1
+            yield from merge_at(k)
+
+    if n > 1:
+        min_run = compute_min_run(n)
+        lo = 0
+        while lo < n:
+            run_length = yield from count_run(lo, n)
+            if run_length < min_run:
+                # Extend short natural runs to min_run with binary insertion sort
+                forced = min(n - lo, min_run)
+                yield from binary_insertion_sort(lo, lo + forced, lo + run_length)
+                run_length = forced
+            runs.append([lo, run_length])
+            yield from merge_collapse()
+            lo += run_length
+        yield from merge_force_collapse()
+
+    # Final sweep animation
+    for i in range(n):
+        yield OP_SWEEP, i, -1, 0
@@ -0,0 +1,337 @@
+import numpy as np
+from steps import OP_COMPARE, OP_SWAP, OP_WRITE, OP_PARTITION
+
+LUT_MAX_SIZE = 4096  # Color levels; values above this are quantized into buckets
+VECTORIZE_MIN_BARS = 1024  # Below this, per-bar rects beat full-area rasterization
+DENSITY_LEVELS = 256  # Brightness steps of the density heatmap
+
+# Default palette, shared by the live window and offline export
+BG_COLOR = (20, 20, 30)
+BAR_START_COLOR = (50, 150, 255)
+BAR_END_COLOR = (255, 100, 150)
+HIGHLIGHT_COLOR = (255, 255, 0)
+MOVING_COLOR = (255, 50, 50)
+FINAL_SWEEP_COLOR = (0, 255, 100)
+# Tints of the worker lanes announced by OP_PARTITION steps, cycled by lane number
+LANE_COLORS = (
+    (255, 170, 0),
+    (0, 200, 200),
+    (170, 90, 255),
+    (120, 220, 60),
+    (255, 90, 200),
+    (90, 140, 255),
+    (230, 230, 90),
+    (255, 120, 90),
+)
+PALETTE = {
+    "bg": BG_COLOR,
+    "start": BAR_START_COLOR,
+    "end": BAR_END_COLOR,
+    "highlight": HIGHLIGHT_COLOR,
+    "moving": MOVING_COLOR,
+    "sweep": FINAL_SWEEP_COLOR,
+}
+
+
+class BarRenderer:
+    """
+    Precomputed geometry and color tables for drawing the bar chart with NumPy.
+    The renderer keeps a per-value color lookup table and per-index x/width
+    arrays, and only rebuilds them when the bar area is resized or the array
+    length / maximum value changes. A full frame is rasterized column by column
+    into an RGB pixel array, so its cost scales with the bar area rather than
+    with the number of elements.
+    When there are more elements than pixel columns, indices are bucketed into
+    columns and every column is reduced once with NumPy instead of overdrawing
+    1-pixel bars: either as an envelope (solid up to the column minimum, a
+    translucent band up to its maximum, colored by its mean) or as a density
+    heatmap of how many of the column's values fall on each pixel row.
+    Bars owned by a worker lane (see OP_PARTITION in steps.py) are drawn halfway
+    between their value color and the lane's color; density maps are not tinted.
+    Attributes:
+        bg_color (tuple): The background color of the bar area.
+        start_color (tuple): The color of the smallest value.
+        end_color (tuple): The color of the largest value.
+        width (int): The width of the bar area in pixels.
+        height (int): The height of the bar area in pixels.
+        n (int): The number of bars the geometry was built for.
+        max_value (int): The value that maps to a full-height bar.
+        lut (numpy.ndarray): (levels, 3) uint8 color lookup table.
+        lut_list (list): The lookup table as tuples, for scalar lookups.
+        xs (numpy.ndarray): Left pixel column of every bar.
+        widths (numpy.ndarray): Pixel width of every bar.
+        x_list / width_list (list): Python copies of xs and widths for per-bar loops.
+        column_owner (numpy.ndarray): Bar index drawn in every pixel column, -1 for gaps.
+            The four per-bar tables are None when n > width, where drawing goes per
+            column and tables with one entry per element would only cost memory.
+        column_starts (numpy.ndarray): First index of every pixel column when n > width,
+            otherwise None.
+    Methods:
+        configure(self, width, height, n, max_value):
+            Rebuilds the cached tables if any of the inputs changed.
+        color_of(self, value, lane=-1) / height_of(self, value):
+            Scalar lookups used when only a handful of bars are repainted.
+        lut_index(self, values):
+            Maps values to rows of the color lookup table.
+        bar_colors(self, values, marks, lanes=None):
+            Returns the (n, 3) color of every bar, with lane tints and highlight
+            overrides applied.
+        bar_heights(self, values):
+            Returns the integer pixel height of every bar.
+        rasterize(self, values, marks, shifts=None, density=False, lanes=None):
+            Returns an image of the bar area, either RGB or packed for a 32-bit surface.
+        column_of(self, index):
+            Maps an element index to the pixel column it is drawn in.
+    """
+
+    def __init__(self, bg_color, start_color, end_color):
+        self.bg_color = np.array(bg_color, dtype=np.uint8)
+        self.start_color = start_color
+        self.end_color = end_color
+        self.width = self.height = self.n = self.max_value = None
+        self._lut_scale = 1
+        self._rows = None
+        self.column_starts = None
+        self._index_offsets = None  # Grid offset of every index, built for density maps
+        self._palette = None
+        self._palette_key = None
+        self.lane_lut = np.array(LANE_COLORS, dtype=np.uint16)
+
+    def configure(self, width, height, n, max_value):
+        max_value = max(1, int(max_value))
+        if max_value != self.max_value:
+            self.max_value = max_value
+            self._build_lut()
+        if (width, height, n) != (self.width, self.height, self.n):
+            self.width, self.height, self.n = width, height, n
+            self._build_geometry()
+
+    def _build_lut(self):
+        levels = min(self.max_value + 1, LUT_MAX_SIZE)
+        # value -> row is value * _lut_scale; exact per-value when the range fits
+        self._lut_scale = (levels - 1) / self.max_value
+        ratio = np.linspace(0.0, 1.0, levels)
+        start = np.array(self.start_color, dtype=np.float64)
+        end = np.array(self.end_color, dtype=np.float64)
+        lut = start * (1 - ratio[:, np.newaxis]) + end * ratio[:, np.newaxis]
+        self.lut = np.clip(lut.astype(np.int64), 0, 255).astype(np.uint8)
+        self.lut_list = [tuple(row) for row in self.lut.tolist()]
+
+    def _build_geometry(self):
+        n = self.n
+        self._rows = np.arange(self.height)[np.newaxis, :]
+        self._index_offsets = None
+        if n > self.width > 0:
+            # Every column covers at least one index, so reduceat never sees empties
+            self.column_starts = (np.arange(self.width) * n) // self.width
+            self.xs = self.widths = self.x_list = self.width_list = None
+            self.column_owner = None
+            return
+        self.column_starts = None
+        bar_total_width = self.width / n if n > 0 else self.width
+        bar_spacing = max(0, int(bar_total_width * 0.1))
+        bar_render_width = max(1, int(np.ceil(bar_total_width - bar_spacing)))
+        edges = (np.arange(n + 1) * bar_total_width).astype(np.int64)
+        self.xs = edges[:-1]
+        # Clip every bar to its own slot so neighbours never overlap and a single
+        # column can be repainted without touching the bars around it.
+        self.widths = np.clip(np.diff(edges), 1, bar_render_width)
+        self.x_list = self.xs.tolist()  # Python copies for per-bar loops
+        self.width_list = self.widths.tolist()
+
+        owner = np.full(self.width, -1, dtype=np.int64)
+        if n > 0:
+            total = int(self.widths.sum())
+            starts = np.repeat(self.xs, self.widths)
+            offsets = np.arange(total) - np.repeat(
+                np.cumsum(self.widths) - self.widths, self.widths
+            )
+            columns = starts + offsets
+            keep = columns < self.width
+            owner[columns[keep]] = np.repeat(np.arange(n), self.widths)[keep]
+        self.column_owner = owner
+
+    def color_of(self, value, lane=-1):
+        """Scalar LUT lookup for per-bar drawing loops."""
+        row = int(value * self._lut_scale)
+        color = self.lut_list[max(0, min(len(self.lut_list) - 1, row))]
+        if lane < 0:
+            return color
+        tint = LANE_COLORS[lane % len(LANE_COLORS)]
+        return tuple((a + b) // 2 for a, b in zip(color, tint))
+
+    def height_of(self, value):
+        """Scalar counterpart of bar_heights."""
+        return max(0, min(self.height, int(value * (self.height / self.max_value))))
+
+    def lut_index(self, values):
+        scaled = np.asarray(values, dtype=np.float64) * self._lut_scale
+        return np.clip(scaled.astype(np.int64), 0, len(self.lut) - 1)
+
+    def bar_colors(self, values, marks, lanes=None):
+        colors = self.lut[self.lut_index(values)]
+        if lanes is not None:
+            self._tint(colors, lanes)
+        for index, color in marks.items():
+            if 0 <= index < len(colors):
+                colors[index] = color
+        return colors
+
+    def _tint(self, colors, lanes):
+        """Blend the rows of ``colors`` owned by a lane (>= 0) with its color, in place."""
+        owned = lanes >= 0
+        if owned.any():
+            tints = self.lane_lut[lanes[owned] % len(self.lane_lut)]
+            colors[owned] = (colors[owned] + tints) // 2
+
+    def bar_heights(self, values):
+        heights = np.asarray(values, dtype=np.float64) * (self.height / self.max_value)
+        return np.clip(heights, 0, self.height).astype(np.int64)
+
+    def column_of(self, index):
+        if self.column_starts is None:
+            return index
+        return index * self.width // self.n
+
+    def rasterize(self, values, marks, shifts=None, density=False, lanes=None):
+        """
+        Draw the bar area. With ``shifts`` (the R/G/B bit offsets of a 32-bit
+        surface) the result is a (width, height) uint32 array of packed pixels
+        ready for pygame.surfarray; otherwise a (width, height, 3) RGB image.
+        Arrays wider than the bar area are reduced per pixel column, and with
+        ``density`` drawn as a heatmap instead of bars. ``lanes`` holds the lane
+        of every element, -1 where none owns it.
+        """
+        if self.column_starts is not None:
+            values = np.asarray(values)
+            if density:
+                return self._rasterize_density(values, marks, shifts)
+            return self._rasterize_envelope(values, marks, shifts, lanes)
+        colors = self.bar_colors(values, marks, lanes) if self.n else self.lut[:0]
+        if shifts is not None:
+            colors = pack_colors(colors, shifts)
+            background = pack_colors(self.bg_color[np.newaxis, :], shifts)[0]
+            image = np.full((self.width, self.height), background, dtype=np.uint32)
+        else:
+            background = self.bg_color
+            image = np.empty((self.width, self.height, 3), dtype=np.uint8)
+            image[...] = background
+        if self.n == 0:
+            return image
+        heights = self.bar_heights(values)
+
+        drawn = self.column_owner >= 0
+        owners = self.column_owner[drawn]
+        tops = self.height - heights[owners]
+        mask = self._rows >= tops[:, np.newaxis]  # (columns, rows)
+        column_colors = colors[owners]
+        if shifts is None:
+            mask = mask[:, :, np.newaxis]
+        image[drawn] = np.where(mask, column_colors[:, np.newaxis], background)
+        return image
+
+    def _column_marks(self, marks):
+        """Highlight colors keyed by pixel column instead of element index."""
+        return {
+            self.column_of(index): color
+            for index, color in marks.items()
+            if 0 <= index < self.n
+        }
+
+    def _rasterize_envelope(self, values, marks, shifts, lanes=None):
+        starts = self.column_starts
+        counts = np.diff(np.append(starts, self.n))
+        lows = np.minimum.reduceat(values, starts)
+        highs = np.maximum.reduceat(values, starts)
+        means = np.add.reduceat(values, starts, dtype=np.float64) / counts
+
+        colors = self.lut[self.lut_index(means)]
+        if lanes is not None:  # A column takes the lane of its first element
+            self._tint(colors, lanes[starts])
+        for column, color in self._column_marks(marks).items():
+            colors[column] = color
+        background = self.bg_color
+        # The min..max spread is drawn at half strength over the background
+        bands = ((colors.astype(np.uint16) + background) // 2).astype(np.uint8)
+        solid_tops = self.height - self.bar_heights(lows)
+        band_tops = self.height - self.bar_heights(highs)
+
+        if shifts is not None:
+            colors = pack_colors(colors, shifts)
+            bands = pack_colors(bands, shifts)
+            background = pack_colors(background[np.newaxis, :], shifts)[0]
+        solid = self._rows >= solid_tops[:, np.newaxis]
+        band = self._rows >= band_tops[:, np.newaxis]
+        if shifts is None:
+            solid = solid[:, :, np.newaxis]
+            band = band[:, :, np.newaxis]
+        fill = np.where(band, bands[:, np.newaxis], background)
+        return np.where(solid, colors[:, np.newaxis], fill)
+
+    def _rasterize_density(self, values, marks, shifts):
+        height = self.height
+        if self._index_offsets is None:
+            counts = np.diff(np.append(self.column_starts, self.n))
+            # Offset of every index's column in the flattened (width, height) grid
+            self._index_offsets = np.repeat(
+                np.arange(self.width, dtype=np.int64) * height, counts
+            )
+        rows = np.minimum(height - self.bar_heights(values), height - 1)
+        hits = np.bincount(
+            self._index_offsets + rows, minlength=self.width * height
+        ).reshape(self.width, height)
+
+        # Log scale keeps single values visible next to crowded rows
+        peak = int(hits.max())
+        scale = (DENSITY_LEVELS - 1) / np.log1p(max(1, peak))
+        levels = (np.log1p(hits, dtype=np.float32) * scale).astype(np.intp)
+        image = self._density_palette(shifts)[self._rows, levels]
+        for column, color in self._column_marks(marks).items():
+            lit = hits[column] > 0
+            if shifts is not None:
+                color = pack_colors(np.array([color], dtype=np.uint8), shifts)[0]
+            image[column, lit] = color
+        return image
+
+    def _density_palette(self, shifts):
+        """(height, DENSITY_LEVELS) pixels fading from background to each row's color."""
+        key = (self.width, self.height, self.max_value, shifts)
+        if self._palette_key != key:
+            row_values = (self.height - np.arange(self.height)) * (
+                self.max_value / self.height
+            )
+            row_colors = self.lut[self.lut_index(row_values)].astype(np.float32)
+            background = self.bg_color.astype(np.float32)
+            fade = np.linspace(0.0, 1.0, DENSITY_LEVELS, dtype=np.float32)
+            palette = background + fade[np.newaxis, :, np.newaxis] * (
+                row_colors[:, np.newaxis, :] - background
+            )
+            palette = palette.astype(np.uint8)
+            if shifts is not None:
+                palette = pack_colors(palette.reshape(-1, 3), shifts).reshape(
+                    self.height, DENSITY_LEVELS
+                )
+            self._palette = palette
+            self._palette_key = key
+        return self._palette
+
+
+def pack_colors(colors, shifts):
+    """Pack (k, 3) uint8 RGB rows into uint32 pixels using the given bit shifts."""
+    colors = colors.astype(np.uint32)
+    return (
+        (colors[:, 0] << shifts[0])
+        | (colors[:, 1] << shifts[1])
+        | (colors[:, 2] << shifts[2])
+    ).astype(np.uint32)
+
+
+def step_marks(opcode, i, j, palette=PALETTE):
+    """Highlight colors for one step, matching what Displayer draws for it."""
+    if opcode == OP_COMPARE or opcode == OP_SWAP:
+        return {i: palette["highlight"], j: palette["moving"]}
+    if opcode == OP_WRITE:
+        return {i: palette["moving"]}
+    if opcode == OP_PARTITION:
+        return {}
+    return {i: palette["sweep"]}
@@ -0,0 +1,213 @@
+"""
+Headless benchmark for every algorithm in the algorithms/ directory.
+
+Runs each algorithm with its steps discarded over a matrix of array sizes
+and input shapes generated from fixed seeds, and records wall time plus
+comparison/read/write/swap/step counts. Inputs are kept as .npy files in
+.input_cache/ and memory-mapped on later runs, so every run sees identical
+data. Results can be written as JSON and/or CSV and compared against a
+stored baseline JSON file:
+
+    python benchmark.py --sizes 100 1000 --json results.json
+    python benchmark.py --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import collections
+import csv
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from discovery import discover, load_algorithm
+from input_generators import INPUT_CACHE_DIR, INPUT_SHAPES, make_input
+from instrumented import InstrumentedArray, OpCounters
+from steps import PROTOCOL_CALLBACK, PROTOCOL_GENERATOR, StepSink, run_algorithm
+
+DEFAULT_SIZES = [100, 500, 1000]
+DEFAULT_MAX_VALUE = 1000
+COUNT_FIELDS = ["comparisons", "reads", "writes", "swaps", "callbacks"]
+CSV_FIELDS = ["algorithm", "shape", "size", "seconds"] + COUNT_FIELDS
+
+
+def _noop_callback(array, highlight_indices=[], moving_index=None, **kwargs):
+    pass
+
+
+class _CountingSink(StepSink):
+    """Step sink that only counts the step events it receives."""
+
+    def __init__(self, counters):
+        self.counters = counters
+
+    def compare(self, i, j):
+        self.counters.callbacks += 1
+
+    def swap(self, i, j):
+        self.counters.callbacks += 1
+        self.counters.swaps += 1
+
+    def write(self, i, value):
+        self.counters.callbacks += 1
+
+    def sweep(self, i):
+        self.counters.callbacks += 1
+
+
+def run_case(name, shape, size, max_value, seed, repeat, cache_dir=INPUT_CACHE_DIR):
+    """Time one (algorithm, shape, size) case and count its element operations."""
+    func, protocol = load_algorithm(name)
+    values = make_input(shape, size, max_value, seed, cache_dir)
+    expected = sorted(values)
+
+    # Wall time on a plain list, so instrumentation overhead is not measured
+    best = float("inf")
+    for _ in range(repeat):
+        working = list(values)
+        start = time.perf_counter()
+        if protocol == PROTOCOL_GENERATOR:
+            collections.deque(func(working), maxlen=0)  # Drain without storing
+        elif protocol == PROTOCOL_CALLBACK:
+            func(working, _noop_callback)
+        else:
+            func(working, StepSink())
+        best = min(best, time.perf_counter() - start)
+        if working != expected:
+            raise AssertionError(f"{name} did not sort {shape} input of size {size}")
+
+    result = {"algorithm": name, "shape": shape, "size": size, "seconds": best}
+    result.update(count_operations(func, protocol, values).as_dict())
+    return result
+
+
+def count_operations(func, protocol, values):
+    """
+    Run the algorithm once on an InstrumentedArray and return its OpCounters.
+    Callback-style algorithms go through LegacyCallbackAdapter, so their
+    callbacks are counted as the steps they turn into, like every other run.
+    """
+    counters = OpCounters()
+    instrumented = InstrumentedArray(values, counters)
+    run_algorithm(func, protocol, instrumented, _CountingSink(counters))
+    return counters
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return a message for every case that got slower or does more work."""
+    previous = {(r["algorithm"], r["shape"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["algorithm"], result["shape"], result["size"]))
+        if old is None:
+            continue
+        case = f"{result['algorithm']} {result['shape']} n={result['size']}"
+        if result["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{case}: {old['seconds']:.4f}s -> {result['seconds']:.4f}s"
+            )
+        for field in COUNT_FIELDS:
+            if field in old and result[field] > old[field]:
+                regressions.append(
+                    f"{case}: {field} {old[field]:,} -> {result[field]:,}"
+                )
+    return regressions
+
+
+def parse_args(argv=None):
+    algorithms = sorted(discover())
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=algorithms,
+        default=algorithms,
+        help="Algorithms to run (default: all).",
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--shapes", nargs="+", choices=list(INPUT_SHAPES), default=list(INPUT_SHAPES)
+    )
+    parser.add_argument("--max-value", type=int, default=DEFAULT_MAX_VALUE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cache-dir",
+        default=INPUT_CACHE_DIR,
+        help="Where generated inputs are kept as .npy files (default: .input_cache).",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Regenerate every input."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per case (best is kept)."
+    )
+    parser.add_argument("--json", help="Write results to this JSON file.")
+    parser.add_argument("--csv", help="Write results to this CSV file.")
+    parser.add_argument("--baseline", help="Baseline JSON file to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown before a case is flagged (default: 0.2).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for name in args.algorithms:
+        for shape in args.shapes:
+            for size in args.sizes:
+                result = run_case(
+                    name,
+                    shape,
+                    size,
+                    args.max_value,
+                    args.seed,
+                    args.repeat,
+                    None if args.no_cache else args.cache_dir,
+                )
+                results.append(result)
+                print(
+                    f"{name:<16} {shape:<14} n={size:<7} {result['seconds']:9.4f}s "
+                    f"cmp={result['comparisons']:<10,} wr={result['writes']:<10,} "
+                    f"swp={result['swaps']:<10,} cb={result['callbacks']:,}"
+                )
+
+    if args.json:
+        meta = {
+            "seed": args.seed,
+            "max_value": args.max_value,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.json}")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Wrote {len(results)} results to {args.csv}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+"""
+Empirical complexity analysis of the algorithms in the algorithms/ directory.
+
+Each algorithm runs over a geometric range of sizes for every input shape.
+Its cost is the number of lines it executes in its own source file, which
+covers the work on its private buffers as well as on the array, plus the
+element comparisons counted through an InstrumentedArray, which covers
+comparisons made inside builtins such as min(). The costs are fitted to the
+growth models in MODELS. The best-fitting model and its constant are
+reported per shape. The shapes whose fit is close, clearly better than the
+next class and stable across the size ladder are checked against the
+avg/best/worst classes the module declares in METADATA. Stability and
+extra memory use are measured as well. With --fill, a METADATA block built
+from the measurements is written into every module that does not declare
+one yet:
+
+    python complexity.py
+    python complexity.py --algorithms shell_sort radix_sort --max-size 4096
+    python complexity.py --fill --json complexity.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tracemalloc
+
+from benchmark import count_operations
+from discovery import ALGO_DIR, discover, load_algorithm, read_metadata
+from input_generators import INPUT_SHAPES, make_input
+from steps import StepSink, run_algorithm
+
+# Growth model -> f(n, k), where k is the number of digits the measured key
+# range needs, in the base 2**digit_bits that the module declares in METADATA.
+# Modules that declare no digit_bits have no k and are not fitted to O(nk).
+MODELS = {
+    "n": lambda n, k: n,
+    "nk": lambda n, k: n * k,
+    "n log n": lambda n, k: n * math.log2(n),
+    "n log^2 n": lambda n, k: n * math.log2(n) ** 2,
+    "n^2": lambda n, k: n * n,
+}
+MODEL_ORDER = list(MODELS)  # Slowest-growing first
+MODEL_RANKS = {"n": 1, "nk": 1, "n log n": 2, "n log^2 n": 3, "n^2": 4}
+DEFAULT_MIN_SIZE = 128  # Smaller inputs mostly measure the small-input cutoffs
+DEFAULT_MAX_SIZE = 16384
+DEFAULT_MAX_COST = 1_000_000  # A shape's ladder stops after the first size above this
+MEMORY_SIZES = (256, 1024)  # Extra memory is measured as the growth between these
+IN_PLACE_BYTES_PER_ELEMENT = 4  # More extra memory per element is not in place
+STABILITY_SIZE = 256
+MAX_FIT_ERROR = 0.15  # Shapes fitting worse than this do not decide best/worst
+MIN_FIT_MARGIN = 0.02  # Shapes whose runner-up fits about as well decide nothing
+MIN_SIZES = 4  # The stability check refits without the smallest and largest size
+
+
+def geometric_sizes(min_size, max_size, factor=2):
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= factor
+    return sizes
+
+
+def fit(points, models=MODEL_ORDER):
+    """
+    Fit (n, k, count) points to every model as count ~ c * f(n, k).
+    The constant is fitted in log space, so the error is the RMS of the
+    log residuals and does not favor the largest sizes. Returns
+    (model, constant, error) tuples, best fit first.
+    """
+    fits = []
+    for model in models:
+        f = MODELS[model]
+        ratios = [math.log(max(count, 1) / f(n, k)) for n, k, count in points]
+        mean = sum(ratios) / len(ratios)
+        error = math.sqrt(sum((r - mean) ** 2 for r in ratios) / len(ratios))
+        fits.append((model, math.exp(mean), error))
+    return sorted(fits, key=lambda item: (item[2], MODEL_ORDER.index(item[0])))
+
+
+def parse_class(text):
+    """Map a declared class such as "~O(n log^2 n)" to a model name, or None."""
+    if not isinstance(text, str):
+        return None
+    key = text.strip().lstrip("~").replace(" ", "")
+    if key.startswith("O(") and key.endswith(")"):
+        key = key[2:-1]
+    for model in MODEL_ORDER:
+        if model.replace(" ", "") == key:
+            return model
+    return None
+
+
+def runner_up(fits):
+    """
+    The best fit in another complexity class than the winner. O(n) and O(nk)
+    tie whenever k is the same at every size, and that decides nothing.
+    """
+    rank = MODEL_RANKS[fits[0][0]]
+    return next(item for item in fits if MODEL_RANKS[item[0]] != rank)
+
+
+def stable_fit(points, models=MODEL_ORDER):
+    """
+    Whether the best class stays the same when the smallest or the largest
+    size is left out, so that no single size decides the fit.
+    """
+    rank = MODEL_RANKS[fit(points, models)[0][0]]
+    return all(
+        MODEL_RANKS[fit(part, models)[0][0]] == rank
+        for part in (points[1:], points[:-1])
+    )
+
+
+def fit_problem(fits, stable):
+    """Why a shape's fit may not decide best/worst, or None when it may."""
+    error, runner_up_error = fits[0][2], runner_up(fits)[2]
+    if error > MAX_FIT_ERROR:
+        return "poor fit"
+    if runner_up_error - error < MIN_FIT_MARGIN:
+        return "ambiguous fit"
+    if not stable:
+        return "unstable fit"
+    return None
+
+
+def key_digits(values, digit_bits):
+    """The number of base 2**digit_bits digits that max(values) - min(values) needs."""
+    if digit_bits is None or not values:
+        return None
+    span = max(values) - min(values)
+    return max(1, -(-span.bit_length() // digit_bits))
+
+
+def count_work(func, protocol, values):
+    """
+    Run the algorithm once and return its OpCounters and the number of lines
+    it executed. Lines are only counted in the algorithm's own source file,
+    so a loop over a private buffer costs the same as one over the array,
+    while the instrumentation and step plumbing it calls into cost nothing.
+    """
+    source = func.__code__.co_filename
+    lines = 0
+
+    def trace_line(frame, event, arg):
+        nonlocal lines
+        if event == "line":
+            lines += 1
+        return trace_line
+
+    def trace_call(frame, event, arg):
+        if frame.f_code.co_filename == source:
+            return trace_line
+        return None
+
+    previous = sys.gettrace()
+    sys.settrace(trace_call)
+    try:
+        counters = count_operations(func, protocol, values)
+    finally:
+        sys.settrace(previous)
+    return counters, lines
+
+
+def measure(func, protocol, shape, sizes, seed, digit_bits=None, max_cost=None):
+    """
+    Measure the cost of one shape at every size, or only up to the first size
+    that costs more than ``max_cost`` once MIN_SIZES sizes are measured, so
+    fast algorithms are fitted over a longer ladder than quadratic ones.
+    """
+    rows = []
+    for size in sizes:
+        if max_cost is not None and len(rows) >= MIN_SIZES:
+            if rows[-1]["cost"] > max_cost:
+                break
+        values = make_input(shape, size, size, seed)
+        counters, lines = count_work(func, protocol, values)
+        rows.append(
+            {
+                "size": size,
+                "k": key_digits(values, digit_bits),
+                "comparisons": counters.comparisons,
+                "writes": counters.writes,
+                "lines": lines,
+                "cost": lines + counters.comparisons,
+            }
+        )
+    return rows
+
+
+class _Keyed(int):
+    """An int that remembers its input position, so stability can be checked."""
+
+
+def check_stability(func, protocol, seed):
+    """
+    Sort values with many duplicates and check that equal values kept their
+    input order. Returns None when the algorithm builds new ints instead of
+    moving the originals, as then it cannot be told.
+    """
+    values = []
+    for position, value in enumerate(
+        make_input("few_unique", STABILITY_SIZE, STABILITY_SIZE, seed)
+    ):
+        keyed = _Keyed(value)
+        keyed.position = position
+        values.append(keyed)
+    run_algorithm(func, protocol, values, StepSink())
+    if not all(isinstance(value, _Keyed) for value in values):
+        return None
+    return all(a.position < b.position for a, b in zip(values, values[1:]) if a == b)
+
+
+def extra_bytes_per_element(func, protocol, seed):
+    """Growth of the peak traced allocation per element between MEMORY_SIZES."""
+    peaks = []
+    for size in MEMORY_SIZES:
+        values = make_input("random", size, size, seed)
+        tracemalloc.start()
+        try:
+            run_algorithm(func, protocol, values, StepSink())
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return (peaks[1] - peaks[0]) / (MEMORY_SIZES[1] - MEMORY_SIZES[0])
+
+
+def analyze(name, shapes, sizes, seed, declared=None, max_cost=None):
+    """Measure one algorithm and return its report as a JSON-friendly dict."""
+    func, protocol = load_algorithm(name)
+    digit_bits = (declared or {}).get("digit_bits")
+    models = MODEL_ORDER
+    if digit_bits is None:
+        models = [model for model in MODEL_ORDER if model != "nk"]
+    report = {"algorithm": name, "shapes": {}}
+    for shape in shapes:
+        rows = measure(func, protocol, shape, sizes, seed, digit_bits, max_cost)
+        points = [(row["size"], row["k"], row["cost"]) for row in rows]
+        fits = fit(points, models)
+        model, constant, error = fits[0]
+        stable = stable_fit(points, models)
+        report["shapes"][shape] = {
+            "model": model,
+            "constant": constant,
+            "error": error,
+            "stable": stable,
+            "ignored": fit_problem(fits, stable),
+            "runner_up": runner_up(fits)[0],
+            "counts": rows,
+        }
+    reliable = {
+        shape: result["model"]
+        for shape, result in report["shapes"].items()
+        if result["ignored"] is None
+    }
+    measured = list(reliable.values())
+    report["measured"] = {
+        "avg": reliable.get("random"),
+        "best": min(measured, key=MODEL_ORDER.index) if measured else None,
+        "worst": max(measured, key=MODEL_ORDER.index) if measured else None,
+    }
+    report["stable"] = check_stability(func, protocol, seed)
+    report["extra_bytes_per_element"] = extra_bytes_per_element(func, protocol, seed)
+    report["in_place"] = report["extra_bytes_per_element"] < IN_PLACE_BYTES_PER_ELEMENT
+    return report
+
+
+def mismatches(report, declared):
+    """
+    Compare a report with a module's declared METADATA; one message per issue.
+    The shapes are only a sample of all inputs, so the best case is only
+    contradicted by a shape that measured below it, and the worst case by
+    one that measured above it.
+    """
+    messages = []
+    measured = report["measured"]
+    for case in ("avg", "best", "worst"):
+        text = (
+            declared.get(case, declared.get("avg"))
+            if case == "worst"
+            else declared.get(case)
+        )
+        found = measured[case]
+        if found is None:  # e.g. "avg" without a reliable random shape
+            continue
+        expected = parse_class(text)
+        if expected is None:
+            messages.append(f"{case}: cannot verify declared {text!r}")
+            continue
+        difference = MODEL_RANKS[found] - MODEL_RANKS[expected]
+        if (
+            (case == "avg" and difference != 0)
+            or (case == "best" and difference < 0)
+            or (case == "worst" and difference > 0)
+        ):
+            messages.append(f"{case}: declared {text}, measured O({found})")
+    for trait in ("stable", "in_place"):
+        if declared.get(trait) is None or report[trait] is None:
+            continue
+        if declared[trait] != report[trait]:
+            messages.append(
+                f"{trait}: declared {declared[trait]}, measured {report[trait]}"
+            )
+    return messages
+
+
+def suggest_metadata(report):
+    """METADATA for a module that has none, built from its measurements."""
+    measured = report["measured"]
+    avg = measured["avg"] or measured["worst"]
+    if avg is None:
+        return None  # No shape fitted reliably enough to suggest anything
+    metadata = {"avg": f"O({avg})", "best": f"O({measured['best']})"}
+    if measured["worst"] != avg:
+        metadata["worst"] = f"O({measured['worst']})"
+    metadata["rank"] = MODEL_RANKS[avg]
+    metadata["stable"] = report["stable"]
+    metadata["in_place"] = report["in_place"]
+    return metadata
+
+
+def fill_metadata(path, metadata):
+    """Insert a METADATA literal just above the module's sorting function."""
+    import ast
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path) as f:
+        source = f.read()
+    function = next(
+        node
+        for node in ast.parse(source).body
+        if isinstance(node, ast.FunctionDef) and node.name == name
+    )
+    first_line = min([function.lineno] + [d.lineno for d in function.decorator_list])
+    lines = source.splitlines(keepends=True)
+    block = ["METADATA = {\n"]
+    for key, value in metadata.items():
+        literal = json.dumps(value) if isinstance(value, str) else repr(value)
+        block.append(
+            f'    "{key}": {literal},\n'
+        )  # Double quotes, as black writes them
+    block += ["}\n", "\n", "\n"]
+    lines[first_line - 1 : first_line - 1] = block
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+def print_report(report, messages, note=None):
+    traits = []
+    if report["stable"] is not None:
+        traits.append("stable" if report["stable"] else "unstable")
+    traits.append("in-place" if report["in_place"] else "not in-place")
+    print(
+        f"\n{report['algorithm']} ({', '.join(traits)}, "
+        f"{report['extra_bytes_per_element']:.1f} extra bytes/element)"
+    )
+    for shape, result in report["shapes"].items():
+        print(
+            f"  {shape:<14} n<={result['counts'][-1]['size']:<6} "
+            f"O({result['model']}) c={result['constant']:<8.3f} "
+            f"fit error={result['error']:.3f} (next: O({result['runner_up']}))"
+            + (f" {result['ignored']}, ignored" if result["ignored"] else "")
+        )
+    for message in messages:
+        print(f"  MISMATCH {message}")
+    if note:
+        print(f"  {note}")
+
+
+def parse_args(argv=None):
+    algorithms = sorted(discover())
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=algorithms,
+        default=algorithms,
+        help="Algorithms to analyze (default: all).",
+    )
+    parser.add_argument(
+        "--shapes", nargs="+", choices=list(INPUT_SHAPES), default=list(INPUT_SHAPES)
+    )
+    parser.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE)
+    parser.add_argument(
+        "--max-cost",
+        type=int,
+        default=DEFAULT_MAX_COST,
+        help="Stop a shape's sizes after the first one costing more (0: no limit).",
+    )
+    parser.add_argument(
+        "--factor", type=int, default=2, help="Ratio between consecutive sizes."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the reports to this JSON file.")
+    parser.add_argument(
+        "--fill",
+        action="store_true",
+        help="Write measured METADATA into modules that declare none.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = geometric_sizes(args.min_size, args.max_size, args.factor)
+    if len(sizes) < MIN_SIZES:
+        print(f"Error: At least {MIN_SIZES} sizes are needed to fit growth models.")
+        return 2
+    print(
+        f"Sizes: {', '.join(map(str, sizes))}, each shape stopping after "
+        f"a cost of {args.max_cost:,}; cost = executed lines + element comparisons."
+    )
+
+    reports = []
+    flagged = 0
+    for name in args.algorithms:
+        path = os.path.join(ALGO_DIR, f"{name}.py")
+        declared = read_metadata(path)["metadata"]
+        report = analyze(
+            name, args.shapes, sizes, args.seed, declared, args.max_cost or None
+        )
+        note = None
+        if declared is None:
+            messages = []
+            report["suggested"] = suggest_metadata(report)
+            if report["suggested"] is None:
+                note = "No METADATA declared, and no shape fitted reliably"
+                flagged += 1
+            elif args.fill:
+                fill_metadata(path, report["suggested"])
+                note = f"No METADATA declared; wrote {report['suggested']}"
+            else:
+                note = f"No METADATA declared; measured {report['suggested']} (--fill)"
+                flagged += 1
+        else:
+            messages = mismatches(report, declared)
+            flagged += bool(messages)
+        report["mismatches"] = messages
+        reports.append(report)
+        print_report(report, messages, note)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"sizes": sizes, "seed": args.seed, "reports": reports}, f, indent=2
+            )
+        print(f"\nWrote {len(reports)} reports to {args.json}")
+    print(f"\n{flagged} of {len(reports)} algorithm(s) flagged.")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
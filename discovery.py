@@ -0,0 +1,127 @@
+"""
+Algorithm discovery without importing the algorithm modules.
+
+Every module in algorithms/ declares its metadata as a literal dict next to
+its sorting function, for example:
+
+    METADATA = {
+        "avg": "O(n log n)",
+        "best": "O(n log n)",
+        "worst": "O(n^2)",
+        "rank": 2,
+        "stable": False,
+        "in_place": True,
+    }
+
+discover() reads these with ast instead of executing the modules and caches
+the results in a manifest file keyed by each module's mtime and size, so a
+warm start touches no algorithm code at all. load_algorithm() then imports
+only the module that is actually run.
+"""
+
+import importlib
+import json
+import os
+import sys
+
+ALGO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "algorithms")
+MANIFEST_PATH = os.path.join(ALGO_DIR, ".manifest.json")
+MANIFEST_VERSION = 1
+DEFAULT_METADATA = {
+    "avg": "O(?)",
+    "best": "O(?)",
+    "rank": 99,
+    "stable": None,
+    "in_place": None,
+}
+
+
+def read_metadata(path):
+    """
+    Parse one algorithm module without running it.
+    Returns {"function": bool, "metadata": dict or None}: whether the module
+    defines a top-level function named after the file, and its METADATA
+    literal if it declares one.
+    """
+    import ast  # Only needed when the manifest is stale
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    has_function = False
+    metadata = None
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            has_function = True
+        elif isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "METADATA"
+            for target in node.targets
+        ):
+            metadata = ast.literal_eval(node.value)
+    return {"function": has_function, "metadata": metadata}
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("modules", {})
+
+
+def _save_manifest(path, modules):
+    try:
+        with open(path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "modules": modules}, f, indent=1)
+    except OSError as e:
+        print(f"Warning: Could not write algorithm manifest '{path}': {e}")
+
+
+def discover(algo_dir=ALGO_DIR, manifest_path=MANIFEST_PATH):
+    """
+    Return {name: metadata} for every usable module in ``algo_dir``.
+    Modules whose mtime and size match the manifest are not even parsed;
+    the manifest is rewritten only when something changed.
+    """
+    cached = _load_manifest(manifest_path) if manifest_path else {}
+    modules = {}
+    for file_name in sorted(os.listdir(algo_dir)):
+        if not file_name.endswith(".py") or file_name.startswith("__"):
+            continue
+        name = file_name[:-3]
+        stat = os.stat(os.path.join(algo_dir, file_name))
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = cached.get(name)
+        if entry is None or entry.get("key") != key:
+            try:
+                entry = read_metadata(os.path.join(algo_dir, file_name))
+            except (SyntaxError, ValueError) as e:
+                print(f"Error reading algorithm '{name}': {e}")
+                continue
+            entry["key"] = key
+        modules[name] = entry
+    if manifest_path and modules != cached:
+        _save_manifest(manifest_path, modules)
+
+    algorithms = {}
+    for name, entry in modules.items():
+        if not entry["function"]:
+            print(f"Warning: Could not find function '{name}' in module '{name}.py'")
+            continue
+        if entry["metadata"] is None:
+            print(f"Warning: Complexity data missing for '{name}'.")
+        algorithms[name] = dict(DEFAULT_METADATA, **(entry["metadata"] or {}))
+    return algorithms
+
+
+def load_algorithm(name, algo_dir=ALGO_DIR):
+    """Import one algorithm module and return (func, protocol)."""
+    from steps import module_protocol
+
+    if algo_dir not in sys.path:
+        sys.path.insert(0, algo_dir)
+    module = importlib.import_module(name)
+    return getattr(module, name), module_protocol(module)
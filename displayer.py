@@ -1,7 +1,33 @@
+import numpy as np
 import pygame
-import math
 import time
-from sound_manager import SoundManager
+from bar_renderer import (
+    BarRenderer,
+    VECTORIZE_MIN_BARS,
+    BG_COLOR,
+    BAR_START_COLOR,
+    BAR_END_COLOR,
+    HIGHLIGHT_COLOR,
+    MOVING_COLOR,
+    FINAL_SWEEP_COLOR,
+)
+from hud import Hud
+from profiler import NullProfiler
+from steps import OP_COMPARE, OP_SWAP, OP_WRITE, OP_PARTITION
+from storage import numpy_view, snapshot
+
+PROFILE_OVERLAY_REFRESH = 0.25  # Seconds between re-renders of the profiler overlay
+PROFILE_OVERLAY_COLOR = (10, 10, 20)
+PACED_PASS_SECONDS = 1.0  # Paced mode starts at one step per element per this long
+_EXHAUSTED = object()  # Returned by next() once a step iterator is done
+
+
+def initial_step_rate(n, target_fps):
+    """
+    The step rate paced mode starts at for an array of n elements: n steps
+    every PACED_PASS_SECONDS, but at least one step per frame.
+    """
+    return float(max(target_fps, n / PACED_PASS_SECONDS))
 
 
 class RestartAlgorithm(Exception):
@@ -10,11 +36,25 @@ class RestartAlgorithm(Exception):
     pass
 
 
+class SilentSound:
+    """Stands in for SoundManager when audio is off; sound_manager is never imported."""
+
+    def note(self, value):
+        pass
+
+    def flush(self):
+        pass
+
+    def play_sound(self, value):
+        pass
+
+
 class Displayer:
     """
     A class to visualize sorting algorithms using Pygame.
     Attributes:
-        original_array (list): The original unsorted array.
+        original_array (list): A snapshot of the unsorted array, restored by reset_array().
+            Typed buffers (see storage.py) are snapshotted as typed buffers.
         algorithm_name (str): The name of the sorting algorithm.
         width (int): The width of the display window.
         height (int): The height of the display window.
@@ -30,7 +70,8 @@ class Displayer:
         title_color (tuple): The color of the title text.
         font (pygame.font.Font): The font used for displaying text.
         title_font (pygame.font.Font): The font used for the title.
-        array (list): The current state of the array being sorted.
+        array (list): The current state of the array being sorted. This is the caller's
+            buffer, not a copy, and the renderer reads it zero-copy when it is typed.
         n (int): The number of elements in the array.
         max_value (int): The maximum value in the array.
         bar_area_height (int): The height of the area where bars are drawn.
@@ -38,22 +79,60 @@ class Displayer:
         elapsed_time (float): The time elapsed since the sorting started.
         running (bool): A flag indicating whether the visualization is running.
         paused (bool): A flag indicating whether the visualization is paused.
+        step_once (bool): Set by [S] while paused to advance exactly one step.
+        step_source (iterator): The iterator play() is pulling from. If it has a
+            set_paused() method, such as shared_runner.SharedMemoryRunner, pauses
+            are forwarded to it so the algorithm stops too.
+        timeline (Timeline): The recorded run being played by play_timeline(), or None.
+        timeline_position (int): The number of timeline steps currently applied.
         restart_requested (bool): A flag indicating whether a restart has been requested.
-        sound_manager (SoundManager): An instance of the SoundManager class for playing sounds.
+        hud (Hud): Cached, pre-rendered layers of the info strip above the bars.
+        renderer (BarRenderer): Cached bar geometry, color LUT and NumPy rasterizer.
+        audio (bool): Whether sound is played. When off, neither the mixer nor the
+            sound_manager module is loaded.
+        sound_manager (SoundManager): An instance of the SoundManager class for playing sounds,
+            or a SilentSound when audio is off.
         delay_ms (int): The delay in milliseconds between each update.
         min_delay (int): The minimum allowed delay.
         max_delay (int): The maximum allowed delay.
+        incremental (bool): A flag enabling dirty-rectangle rendering, where only the bars
+            that changed value or highlight state since the last frame are repainted.
+        target_fps (int): Frame rate of the paced mode, or None to draw every step.
+        steps_per_second (float): Algorithm step rate in paced mode, None for unlimited.
+        min_steps_per_second (int): The slowest step rate reachable with [-].
+        max_steps_per_second (int): The fastest throttled step rate; [+] beyond it is unlimited.
+        density (bool): When there are more elements than pixel columns, draw each column
+            as a density heatmap of its values instead of a min/mean/max bar. Toggled with [D].
+        lanes (numpy.ndarray): The worker lane owning every index, -1 for none, as
+            announced by OP_PARTITION steps; owned bars are tinted in their lane's
+            color. None until the algorithm announces a partition.
+        counters (OpCounters): The running algorithm's comparisons, swaps, writes,
+            reads and steps (see instrumented.py), shown live along the bottom of the
+            HUD and in the final-screen summary, or None to hide the row.
+        profiler (FrameProfiler): Times the algorithm, event, bar, HUD, sound and delay
+            phases of every frame (see profiler.py), or a NullProfiler when profiling is
+            off. Its p50/p99 overlay is toggled with [F].
     Methods:
-        __init__(self, array, algorithm_name="Unknown Algorithm", delay_ms=1):
+        __init__(self, array, algorithm_name="Unknown Algorithm", delay_ms=1, incremental=True, target_fps=None, density=False, audio=True, profiler=None):
             Initializes the Displayer with the given array, algorithm name, and delay.
-        _get_bar_color(self, index, value, highlight_indices=[], moving_index=None, sweep=False):
-            Determines the color of a bar based on its index, value, and other flags.
+        _bar_marks(self, highlight_indices=[], moving_index=None, sweep=False):
+            Maps each highlighted or moving index to its override color.
+        _get_bar_color(self, index, value, marks):
+            Determines the color of a bar based on its index, value, and the marks of this frame.
         toggle_fullscreen(self):
             Toggles between fullscreen and windowed mode.
         _draw_info_text(self, end, final_screen=False):
-            Draws the algorithm title, timer, and control hints on the screen.
+            Blits the algorithm title, timer, and control hints from the cached HUD.
+        _draw_profile_overlay(self):
+            Blits the profiler's FPS and per-phase p50/p99 table over the bars.
         _draw_frame(self, highlight_indices=[], moving_index=None, end=False, sweep=False, final_screen=False):
             Draws a single frame of the visualization, including bars and info text.
+        _draw_full_frame(self, marks, end, final_screen):
+            Clears the screen, redraws every bar and the info text, and flips the display.
+            Large arrays are rasterized with NumPy and blitted through pygame.surfarray,
+            reduced to one bar (or density column) per pixel column once n exceeds the width.
+        _draw_dirty_frame(self, dirty, marks, end):
+            Repaints only the given bar columns plus the info strip and updates those rects.
         _handle_events(self):
             Handles user input events such as quitting, toggling fullscreen, pausing, and restarting.
         reset_timer(self):
@@ -62,14 +141,50 @@ class Displayer:
             Resets the array to its original state and redraws the screen.
         update(self, array, highlight_indices=[], moving_index=None, end=False, sweep=False):
             Updates the display with the current state of the array and highlights.
+        bind(self, array):
+            Shares the algorithm's buffer so step events need not pass the array.
+        compare(self, i, j) / swap(self, i, j) / write(self, i, value) / sweep(self, i):
+            Step-protocol events (see steps.py); each marks only its own indices dirty.
+        partition(self, lo, hi, lane):
+            Assigns array[lo:hi] to a worker lane without drawing a frame.
+        _paced_step(self, highlight_indices, moving_index, end, sweep):
+            Records a step without drawing, emitting frames only at the target FPS.
+        _present_paced_frame(self, now):
+            Polls events and draws/sounds the latest step of the elapsed frame interval.
+        play(self, step_iter):
+            Pulls (opcode, i, j, value) steps from an iterator, such as a generator
+            algorithm, advancing it lazily: one step per draw, or as many steps per
+            frame as the step rate allows in paced mode.
+        play_timeline(self, timeline):
+            Plays a recorded run with seeking, single steps in both directions and a
+            draggable progress bar, until the window is closed.
+        idle(self):
+            Polls input and refreshes the screen while no algorithm step is available.
         finalize(self):
             Keeps the final sorted state displayed until user action.
     """
 
-    def __init__(self, array, algorithm_name="Unknown Algorithm", delay_ms=1):
-        if not pygame.get_init():
-            pygame.init()
-        self.original_array = list(array)
+    def __init__(
+        self,
+        array,
+        algorithm_name="Unknown Algorithm",
+        delay_ms=1,
+        incremental=True,
+        target_fps=None,
+        density=False,
+        audio=True,
+        profiler=None,
+    ):
+        self.audio = audio
+        self.profiler = profiler if profiler is not None else NullProfiler()
+        self._profile_overlay = None  # (refresh time, rendered overlay surface)
+        if audio:
+            if not pygame.get_init():
+                pygame.init()
+        else:  # Leave the mixer uninitialized
+            pygame.display.init()
+            pygame.font.init()
+        self.original_array = snapshot(array)  # The only copy; typed buffers stay typed
         self.algorithm_name = algorithm_name.replace("_", " ").title()
         try:
             info = pygame.display.Info()
@@ -88,14 +203,17 @@ class Displayer:
             )
             self.fullscreen = False
         pygame.display.set_caption(f"Sorting Visualizer - {self.algorithm_name}")
-        self.bg_color = (20, 20, 30)
-        self.bar_start_color = (50, 150, 255)
-        self.bar_end_color = (255, 100, 150)
-        self.highlight_color = (255, 255, 0)
-        self.moving_color = (255, 50, 50)
-        self.final_sweep_color = (0, 255, 100)
+        self.bg_color = BG_COLOR
+        self.bar_start_color = BAR_START_COLOR
+        self.bar_end_color = BAR_END_COLOR
+        self.highlight_color = HIGHLIGHT_COLOR
+        self.moving_color = MOVING_COLOR
+        self.final_sweep_color = FINAL_SWEEP_COLOR
         self.text_color = (220, 220, 220)
         self.title_color = (255, 255, 255)
+        self.renderer = BarRenderer(
+            self.bg_color, self.bar_start_color, self.bar_end_color
+        )
         try:
             self.font = pygame.font.SysFont("Consolas", 24)
             self.title_font = pygame.font.SysFont("Consolas", 36, bold=True)
@@ -103,52 +221,87 @@ class Displayer:
             print(f"Warning: Font loading error ({e}). Using Arial.")
             self.font = pygame.font.SysFont("Arial", 24)
             self.title_font = pygame.font.SysFont("Arial", 36, bold=True)
-        self.array = list(self.original_array)
+        self.array = array
         self.n = len(self.array)
         self.max_value = max(self.array) if self.array else 1
         self.bar_area_height = self.height - 70
+        self.hud = Hud(
+            self.width,
+            self.height - self.bar_area_height,
+            self.font,
+            self.title_font,
+            self.text_color,
+            self.title_color,
+            self.bg_color,
+        )
         self.start_time = time.time()
         self.elapsed_time = 0
         self.running = True
         self.paused = False
+        self.step_once = False
+        self.step_source = None
+        self.lanes = None
+        self.counters = None
+        self.timeline = None
+        self.timeline_position = 0
+        self._seek_target = None  # Timeline step requested by keys or the progress bar
+        self._scrubbing = False  # True while the progress bar is being dragged
         self.restart_requested = False
-        self.sound_manager = SoundManager(self.max_value)
+        if audio:
+            from sound_manager import PITCH_CACHE_DIR, SoundManager
+
+            self.sound_manager = SoundManager(self.max_value, cache_dir=PITCH_CACHE_DIR)
+        else:
+            self.sound_manager = SilentSound()
         self.delay_ms = delay_ms
         self.min_delay = 0
         self.max_delay = 200
+        self.target_fps = target_fps if target_fps and target_fps > 0 else None
+        self.min_steps_per_second = 1
+        self.max_steps_per_second = 2**24
+        # The delay setting is per step, so paced mode starts from the array size
+        self.steps_per_second = (
+            min(self.max_steps_per_second, initial_step_rate(self.n, self.target_fps))
+            if self.target_fps is not None
+            else None
+        )
+        self._latest_step = ([], None, False, False)  # Newest step of this frame
+        self._next_frame_time = 0.0
+        self._reset_pace_clock()
+        self.incremental = incremental
+        self.density = density
+        self._drawn_array = None  # Bar values as of the last presented frame
+        self._drawn_marks = {}  # Highlight colors as of the last presented frame
+        self._full_redraw = True  # Forces the next frame to repaint everything
+        self._tracks_writes = False  # True once bound to an algorithm's buffer
+        self._pending_dirty = set()  # Indices written through step events
+        self._step_highlights = [-1, -1]  # Reused by step events, -1 is unused
         self._draw_frame()  # Initial draw
 
-    def _get_bar_color(
-        self, index, value, highlight_indices=[], moving_index=None, sweep=False
-    ):
-        if sweep and index == moving_index:
-            return self.final_sweep_color
-        if index == moving_index:
-            return self.moving_color
-        elif index in highlight_indices:
-            return self.highlight_color
-        else:
-            ratio = value / self.max_value if self.max_value > 0 else 0
-            red = int(
-                self.bar_start_color[0] * (1 - ratio) + self.bar_end_color[0] * ratio
-            )
-            green = int(
-                self.bar_start_color[1] * (1 - ratio) + self.bar_end_color[1] * ratio
-            )
-            blue = int(
-                self.bar_start_color[2] * (1 - ratio) + self.bar_end_color[2] * ratio
-            )
-            return (
-                max(0, min(255, red)),
-                max(0, min(255, green)),
-                max(0, min(255, blue)),
-            )  # Clamp colors
+    def _bar_marks(self, highlight_indices=[], moving_index=None, sweep=False):
+        """Map highlighted/moving indices to their override colors."""
+        marks = {}
+        for index in highlight_indices:
+            marks[index] = self.highlight_color
+        if moving_index is not None:
+            marks[moving_index] = self.final_sweep_color if sweep else self.moving_color
+        return marks
+
+    def _get_bar_color(self, index, value, marks):
+        color = marks.get(index)
+        if color is not None:
+            return color
+        if self.lanes is not None:
+            return self.renderer.color_of(value, self.lanes[index])
+        return self.renderer.color_of(value)  # Precomputed gradient lookup
 
     def toggle_fullscreen(self):
         current_caption = pygame.display.get_caption()[0]
         pygame.display.quit()
         pygame.display.init()
-        if not pygame.mixer.get_init():  # Re-init mixer
+        if self.audio and not pygame.mixer.get_init():  # Re-init mixer
+            from sound_manager import SAMPLE_RATE
+
             try:
                 pygame.mixer.init(
                     frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512
@@ -183,6 +336,7 @@ class Displayer:
         pygame.display.set_caption(current_caption)
         self.fullscreen = not self.fullscreen
         self.bar_area_height = self.height - 70
+        self._full_redraw = True
         try:
             self.font = pygame.font.SysFont("Consolas", 24)
             self.title_font = pygame.font.SysFont("Consolas", 36, bold=True)
@@ -190,74 +344,104 @@ class Displayer:
             print(f"Warning: Font reloading error ({e}). Using Arial.")
             self.font = pygame.font.SysFont("Arial", 24)
             self.title_font = pygame.font.SysFont("Arial", 36, bold=True)
+        self._reset_hud()
         self._draw_frame()  # Redraw after mode change
 
     def _draw_info_text(self, end, final_screen=False):  # Add final_screen flag
-        """Draw the algorithm title and other info text, adapting for final screen."""
-        # --- Draw Algorithm Title (Top Center) ---
-        try:
-            title_surface = self.title_font.render(
-                self.algorithm_name, True, self.title_color
-            )
-            title_rect = title_surface.get_rect(center=(self.width // 2, 25))
-            self.screen.blit(title_surface, title_rect)
-            info_y_pos = title_rect.top + 5  # Start below the title
-        except Exception as e:
-            print(f"Error rendering title font: {e}")
-            info_y_pos = 15  # Fallback position
+        """Blit the cached HUD strip (title, timer, hints), adapting for final screen."""
+        with self.profiler.phase("hud"):
+            self._compose_info_text(end, final_screen)
 
-        # --- Draw Other Info (Below Title) ---
+    def _compose_info_text(self, end, final_screen):
         try:
-            # Determine Timer Text
-            timer_prefix = "Final Time:" if final_screen else "Time:"
             # Update elapsed time only if running and not paused/final
             if not end and not self.paused and not final_screen:
                 self.elapsed_time = time.time() - self.start_time
-            timer_text_surface = self.font.render(
-                f"{timer_prefix} {self.elapsed_time:.2f}s", True, self.text_color
-            )
-
-            # Blit Timer
-            self.screen.blit(timer_text_surface, (10, info_y_pos))
-
-            # Determine and Blit Control Hints based on state
             if final_screen:
                 # Only show Quit/Restart on final screen
-                controls_text_surface = self.font.render(
-                    "Quit [Q] Restart [R]", True, self.text_color
-                )
-                self.screen.blit(
-                    controls_text_surface,
-                    (self.width - controls_text_surface.get_width() - 10, info_y_pos),
-                )
+                hints = ()
+                right_hint = "Quit [Q] Restart [R]"
             else:
-                # Show standard controls during sorting
-                current_x = (
-                    10 + timer_text_surface.get_width() + 30
-                )  # Position relative to timer
-
-                delay_text_surface = self.font.render(
-                    f"Delay: {self.delay_ms}ms [+/-]", True, self.text_color
-                )
-                self.screen.blit(delay_text_surface, (current_x, info_y_pos))
-                current_x += delay_text_surface.get_width() + 30
+                if self.target_fps is None:
+                    speed_text = f"Delay: {self.delay_ms}ms [+/-]"
+                elif self.steps_per_second is None:
+                    speed_text = "Speed: max steps/s [+/-]"
+                else:
+                    speed_text = f"Speed: {self.steps_per_second:,.0f} steps/s [+/-]"
+                pause_text_str = "PAUSED [P] Step [S]" if self.paused else "Running [P]"
+                hints = (speed_text, f"{pause_text_str} Restart [R]")
+                if self.timeline is not None:
+                    hints += ("Seek [Left/Right]",)
+                if self.n > self.width:  # Per-column rendering is active
+                    hints += ("Bars [D]" if self.density else "Density [D]",)
+                right_hint = "Quit [Q] Fullscreen [ESC]"
+            hud_surface = self.hud.compose(
+                self.algorithm_name,
+                "Final Time:" if final_screen else "Time:",
+                self.elapsed_time,
+                hints,
+                right_hint,
+                self._counter_row(),
+            )
+            self.screen.blit(hud_surface, (0, 0))
+            if self.timeline is not None:
+                self._draw_progress()
+        except Exception as e:
+            print(f"Error rendering info font: {e}")
 
-                pause_text_str = "PAUSED [P]" if self.paused else "Running [P]"
-                pause_restart_surface = self.font.render(
-                    f"{pause_text_str} Restart [R]", True, self.text_color
-                )
-                self.screen.blit(pause_restart_surface, (current_x, info_y_pos))
+    def _counter_row(self):
+        """The (label, value) pairs of the HUD's operation counters row."""
+        counters = self.counters
+        if counters is None:
+            return ()
+        return (
+            ("Comparisons", counters.comparisons),
+            ("Swaps", counters.swaps),
+            ("Writes", counters.writes),
+            ("Reads", counters.reads),
+            ("Steps", counters.callbacks),
+        )
 
-                quit_fullscreen_surface = self.font.render(
-                    "Quit [Q] Fullscreen [ESC]", True, self.text_color
-                )
-                self.screen.blit(
-                    quit_fullscreen_surface,
-                    (self.width - quit_fullscreen_surface.get_width() - 10, info_y_pos),
+    def _draw_profile_overlay(self):
+        """
+        Blit the profiler's statistics in the top-left corner of the bar area,
+        re-rendered at most every PROFILE_OVERLAY_REFRESH seconds. Returns the
+        covered rect, or None when the overlay is hidden.
+        """
+        if not self.profiler.overlay:
+            return None
+        with self.profiler.phase("hud"):
+            now = time.perf_counter()
+            if (
+                self._profile_overlay is None
+                or now - self._profile_overlay[0] >= PROFILE_OVERLAY_REFRESH
+            ):
+                lines = [
+                    self.font.render(line, True, self.text_color)
+                    for line in self.profiler.overlay_lines()
+                ]
+                surface = pygame.Surface(
+                    (
+                        max(line.get_width() for line in lines) + 16,
+                        sum(line.get_height() for line in lines) + 12,
+                    )
                 )
+                surface.fill(PROFILE_OVERLAY_COLOR)
+                y = 6
+                for line in lines:
+                    surface.blit(line, (8, y))
+                    y += line.get_height()
+                self._profile_overlay = (now, surface)
+            surface = self._profile_overlay[1]
+            position = (8, self.height - self.bar_area_height + 8)
+            self.screen.blit(surface, position)
+            return surface.get_rect(topleft=position)
 
-        except Exception as e:
-            print(f"Error rendering info font: {e}")
+    def _reset_hud(self):
+        """Drop cached HUD layers after a resize or font reload."""
+        self.hud.reset(
+            self.width, self.height - self.bar_area_height, self.font, self.title_font
+        )
 
     def _draw_frame(
         self,
@@ -268,40 +452,122 @@ class Displayer:
         final_screen=False,
     ):  # Add final_screen param
         """Draws a single frame of the visualization."""
+        with self.profiler.phase("bars"):
+            marks = self._bar_marks(highlight_indices, moving_index, sweep)
+
+            # Bars share pixel columns once there are more bars than pixels, and a
+            # column repaint would then erase neighbours we did not redraw.
+            can_draw_dirty = (
+                self.incremental
+                and not self._full_redraw
+                and not final_screen
+                and self._drawn_array is not None
+                and len(self._drawn_array) == self.n == len(self.array)
+                and self.n <= self.width
+            )
+            if can_draw_dirty:
+                dirty = self._changed_indices()
+                if len(dirty) <= self.n // 2:
+                    dirty.update(marks)
+                    dirty.update(self._drawn_marks)
+                    self._draw_dirty_frame(dirty, marks, end)
+                else:
+                    self._draw_full_frame(marks, end, final_screen)
+            else:
+                self._draw_full_frame(marks, end, final_screen)
+        self.profiler.frame()
+
+    def _changed_indices(self):
+        """Collect indices whose value differs from the last presented frame."""
+        drawn = self._drawn_array
+        if self._tracks_writes:  # Step sinks report every write, no scan needed
+            changed = self._pending_dirty
+            self._pending_dirty = set()
+            for i in changed:
+                drawn[i] = self.array[i]
+            return changed
+        if drawn == self.array:  # C-level comparison, cheap when nothing moved
+            return set()
+        changed = {
+            i for i, (old, new) in enumerate(zip(drawn, self.array)) if old != new
+        }
+        for i in changed:
+            drawn[i] = self.array[i]
+        return changed
+
+    def _configure_renderer(self):
+        """Rebuild the cached geometry/color tables if the layout changed."""
+        self.renderer.configure(
+            self.width, self.bar_area_height, self.n, self.max_value
+        )
+
+    def _draw_bar(self, i, marks):
+        val = self.array[i]
+        if self.renderer.x_list is None:  # More bars than columns: one per column
+            x, bar_render_width = self.renderer.column_of(i), 1
+        else:
+            x = self.renderer.x_list[i]
+            bar_render_width = self.renderer.width_list[i]
+        bar_height = self.renderer.height_of(val)
+        y = self.height - bar_height
+        color = self._get_bar_color(i, val, marks)
+        try:
+            pygame.draw.rect(self.screen, color, (x, y, bar_render_width, bar_height))
+        except Exception as e:
+            print(
+                f"Error drawing rect at ({x},{y}) size ({bar_render_width},{bar_height}): {e}"
+            )
+
+    def _blit_bars_vectorized(self, marks):
+        """Rasterize every bar with NumPy and write the pixels in one go."""
+        bar_area = pygame.Rect(
+            0, self.height - self.bar_area_height, self.width, self.bar_area_height
+        )
+        surface = self.screen.subsurface(bar_area)
+        values = numpy_view(self.array)  # Zero-copy for typed buffers
+        if surface.get_bytesize() == 4:
+            shifts = surface.get_shifts()[:3]
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[...] = self.renderer.rasterize(
+                values, marks, shifts, self.density, self.lanes
+            )
+            del pixels  # Release the surface lock before flipping
+        else:
+            pixels = self.renderer.rasterize(
+                values, marks, density=self.density, lanes=self.lanes
+            )
+            pygame.surfarray.blit_array(surface, pixels)
+
+    def _draw_full_frame(self, marks, end, final_screen):
         try:
             self.screen.fill(self.bg_color)  # Clear screen first
         except Exception as e:
             print(f"Error filling screen: {e}")
             return  # Avoid drawing if screen fill fails
 
-        bar_total_width = self.width / self.n if self.n > 0 else self.width
-        bar_spacing = max(0, int(bar_total_width * 0.1))
-        bar_render_width = max(1, math.ceil(bar_total_width - bar_spacing))
+        self._configure_renderer()
 
         # Draw Bars
-        for i, val in enumerate(self.array):
-            x = int(i * bar_total_width)
-            bar_height = max(
-                0,
-                (
-                    (val / self.max_value) * self.bar_area_height
-                    if self.max_value > 0
-                    else 0
-                ),
-            )
-            y = self.height - bar_height
-            color = self._get_bar_color(i, val, highlight_indices, moving_index, sweep)
+        drawn = False
+        # More bars than columns always goes through the per-column reduction
+        vectorize = self.n >= VECTORIZE_MIN_BARS or self.n > self.width
+        if vectorize and self.bar_area_height > 0:
             try:
-                pygame.draw.rect(
-                    self.screen, color, (x, y, bar_render_width, bar_height)
-                )
-            except Exception as e:
-                print(
-                    f"Error drawing rect at ({x},{y}) size ({bar_render_width},{bar_height}): {e}"
-                )
+                self._blit_bars_vectorized(marks)
+                drawn = True
+            except Exception as e:  # e.g. a surface format surfarray cannot map
+                print(f"Warning: vectorized bar drawing failed ({e}), using rects.")
+        if not drawn:
+            if self.renderer.column_starts is None:
+                indices = range(self.n)
+            else:  # The first element of every pixel column
+                indices = self.renderer.column_starts.tolist()
+            for i in indices:
+                self._draw_bar(i, marks)
 
         # Draw Info Text (passing the flag)
         self._draw_info_text(end, final_screen)  # Pass final_screen flag here
+        self._draw_profile_overlay()
 
         # Update Display
         try:
@@ -309,66 +575,193 @@ class Displayer:
         except Exception as e:
             print(f"Error flipping display: {e}")
 
+        # Only incremental frames diff against it, and those need n <= width
+        self._drawn_array = snapshot(self.array) if self.n <= self.width else None
+        self._drawn_marks = marks
+        self._full_redraw = False
+        self._pending_dirty.clear()
+
+    def _draw_dirty_frame(self, dirty, marks, end):
+        self._configure_renderer()
+        bar_area_top = self.height - self.bar_area_height
+        rects = []
+        try:
+            for i in dirty:
+                if not 0 <= i < self.n:
+                    continue
+                column = pygame.Rect(
+                    self.renderer.x_list[i],
+                    bar_area_top,
+                    self.renderer.width_list[i],
+                    self.bar_area_height,
+                )
+                self.screen.fill(self.bg_color, column)
+                self._draw_bar(i, marks)
+                rects.append(column)
+
+            hud_strip = pygame.Rect(0, 0, self.width, bar_area_top)
+            self._draw_info_text(end)  # The HUD strip is opaque, no fill needed
+            rects.append(hud_strip)
+            overlay = self._draw_profile_overlay()  # Over any bars repainted under it
+            if overlay is not None:
+                rects.append(overlay)
+        except Exception as e:
+            print(f"Error drawing dirty columns: {e}")
+            self._full_redraw = True
+            return
+
+        try:
+            pygame.display.update(rects)
+        except Exception as e:
+            print(f"Error updating display rects: {e}")
+
+        self._drawn_marks = marks
+
     def _handle_events(self):
         """Handle user input events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
+        with self.profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     self.running = False
-                elif event.key == pygame.K_ESCAPE:
-                    try:
-                        self.toggle_fullscreen()
-                    except Exception as e:
-                        print(f"Error toggling fullscreen: {e}")
-                elif event.key == pygame.K_p:
-                    self.paused = not self.paused
-                    caption_suffix = " [PAUSED]" if self.paused else ""
-                    try:
-                        pygame.display.set_caption(
-                            f"Sorting Visualizer - {self.algorithm_name}{caption_suffix}"
-                        )
-                    except Exception as e:
-                        print(f"Error setting caption: {e}")
-                elif event.key == pygame.K_r:
-                    print("Restart requested...")
-                    self.restart_requested = True
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:
+                        self.running = False
+                    elif event.key == pygame.K_ESCAPE:
+                        try:
+                            self.toggle_fullscreen()
+                        except Exception as e:
+                            print(f"Error toggling fullscreen: {e}")
+                    elif event.key == pygame.K_p:
+                        self._set_paused(not self.paused)
+                    elif event.key == pygame.K_s and self.paused:
+                        self.step_once = True
+                    elif self.timeline is not None and event.key in (
+                        pygame.K_LEFT,
+                        pygame.K_RIGHT,
+                    ):
+                        jump = 1
+                        if event.mod & pygame.KMOD_SHIFT:
+                            jump = max(1, len(self.timeline) // 100)
+                        if event.key == pygame.K_LEFT:
+                            jump = -jump
+                        base = self._seek_target
+                        if base is None:
+                            base = self.timeline_position
+                        self._request_seek(base + jump)
+                        self._set_paused(True)
+                    elif self.timeline is not None and event.key == pygame.K_HOME:
+                        self._request_seek(0)
+                    elif event.key == pygame.K_r:
+                        print("Restart requested...")
+                        self.restart_requested = True
+                    elif event.key == pygame.K_d:
+                        self.density = not self.density
+                        self._full_redraw = True
+                    elif event.key == pygame.K_f and self.profiler.enabled:
+                        self.profiler.overlay = not self.profiler.overlay
+                        self._profile_overlay = None
+                        self._full_redraw = True  # Uncover the bars under it
+                    elif (
+                        event.key == pygame.K_PLUS
+                        or event.key == pygame.K_KP_PLUS
+                        or event.key == pygame.K_EQUALS
+                    ):
+                        # Faster in both modes: a higher rate or a shorter delay
+                        if self.target_fps is not None:
+                            self._change_step_rate(faster=True)
+                        else:
+                            self.delay_ms = max(
+                                self.min_delay,
+                                (
+                                    self.delay_ms - 1
+                                    if self.delay_ms <= 10
+                                    else self.delay_ms - 5
+                                ),
+                            )
+                    elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:
+                        if self.target_fps is not None:
+                            self._change_step_rate(faster=False)
+                        else:
+                            self.delay_ms = min(
+                                self.max_delay,
+                                (
+                                    self.delay_ms + 1
+                                    if self.delay_ms < 10
+                                    else self.delay_ms + 5
+                                ),
+                            )
                 elif (
-                    event.key == pygame.K_PLUS
-                    or event.key == pygame.K_KP_PLUS
-                    or event.key == pygame.K_EQUALS
+                    event.type == pygame.MOUSEBUTTONDOWN
+                    and event.button == 1
+                    and self.timeline is not None
+                    and self._progress_rect().inflate(0, 10).collidepoint(event.pos)
                 ):
-                    self.delay_ms = min(
-                        self.max_delay,
-                        self.delay_ms + 1 if self.delay_ms < 10 else self.delay_ms + 5,
-                    )
-                elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:
-                    self.delay_ms = max(
-                        self.min_delay,
-                        self.delay_ms - 1 if self.delay_ms <= 10 else self.delay_ms - 5,
-                    )
-            elif event.type == pygame.VIDEORESIZE and not self.fullscreen:
-                try:
-                    if event.w > 0 and event.h > 0:  # Ensure valid dimensions
-                        self.width, self.height = event.w, event.h
-                        self.screen = pygame.display.set_mode(
-                            (self.width, self.height),
-                            pygame.RESIZABLE | pygame.DOUBLEBUF,
-                        )
-                        self.bar_area_height = self.height - 70
-                        self._draw_frame()  # Redraw immediately
-                except Exception as e:
-                    print(f"Error handling resize event: {e}")
+                    self._scrubbing = True
+                    self._seek_to_x(event.pos[0])
+                elif event.type == pygame.MOUSEMOTION and self._scrubbing:
+                    if self.timeline is not None:
+                        self._seek_to_x(event.pos[0])
+                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                    self._scrubbing = False
+                elif event.type == pygame.VIDEORESIZE and not self.fullscreen:
+                    try:
+                        if event.w > 0 and event.h > 0:  # Ensure valid dimensions
+                            self.width, self.height = event.w, event.h
+                            self.screen = pygame.display.set_mode(
+                                (self.width, self.height),
+                                pygame.RESIZABLE | pygame.DOUBLEBUF,
+                            )
+                            self.bar_area_height = self.height - 70
+                            self._reset_hud()
+                            self._full_redraw = True
+                            self._draw_frame()  # Redraw immediately
+                    except Exception as e:
+                        print(f"Error handling resize event: {e}")
+
+    def _change_step_rate(self, faster):
+        """Double or halve the paced step rate; past the maximum it is unlimited."""
+        rate = self.steps_per_second
+        if faster:
+            if rate is not None:
+                rate *= 2
+                if rate > self.max_steps_per_second:
+                    rate = None
+        else:
+            rate = self.max_steps_per_second if rate is None else rate / 2
+            rate = max(self.min_steps_per_second, rate)
+        self.steps_per_second = rate
+        self._reset_pace_clock()
+
+    def _set_paused(self, paused):
+        self.paused = paused
+        set_source_paused = getattr(self.step_source, "set_paused", None)
+        if set_source_paused is not None:
+            set_source_paused(paused)  # e.g. a child process sorting shared memory
+        caption_suffix = " [PAUSED]" if self.paused else ""
+        try:
+            pygame.display.set_caption(
+                f"Sorting Visualizer - {self.algorithm_name}{caption_suffix}"
+            )
+        except Exception as e:
+            print(f"Error setting caption: {e}")
+
+    def _reset_pace_clock(self):
+        """Restart the step budget so rate changes and pauses don't cause bursts."""
+        self._pace_origin = time.perf_counter()
+        self._pace_steps = 0
 
     def reset_timer(self):
         self.start_time = time.time()
         self.elapsed_time = 0
+        self._reset_pace_clock()
 
     def reset_array(self):
-        self.array = list(self.original_array)
+        self.array = snapshot(self.original_array)
+        self.lanes = None
+        self._tracks_writes = False
         self.n = len(self.array)
         self.max_value = max(self.array) if self.array else 1
+        self._full_redraw = True
         self._draw_frame()  # Redraw immediately to show reset state
         pygame.time.delay(50)
 
@@ -377,36 +770,429 @@ class Displayer:
     ):
         if not self.running:
             return
+        self._tracks_writes = False  # Legacy callers hand over the whole array
+        if self.target_fps is not None:
+            # Keep a reference instead of copying; the array is only read at frame time
+            self.array = array
+            self._paced_step(highlight_indices, moving_index, end, sweep)
+            return
+        if not self._wait_while_paused(highlight_indices, moving_index, end, sweep):
+            return
+        # Normal Update; the array is only read when drawing, so no copy is needed
+        self.array = array
+        self._present_step(highlight_indices, moving_index, end, sweep)
+
+    def bind(self, array):
+        """Share the algorithm's buffer; later steps only report what changed."""
+        self.array = array
+        self.n = len(array)
+        self._tracks_writes = True
+        self._pending_dirty.clear()
+        self._full_redraw = True
+
+    def compare(self, i, j):
+        highlights = self._step_highlights
+        highlights[0] = i
+        highlights[1] = -1
+        self._step(highlights, j, False)
+
+    def swap(self, i, j):
+        self._pending_dirty.add(i)
+        self._pending_dirty.add(j)
+        highlights = self._step_highlights
+        highlights[0] = i
+        highlights[1] = j
+        self._step(highlights, j, False)
+
+    def write(self, i, value):
+        # The algorithm already stored value in the shared buffer
+        self._pending_dirty.add(i)
+        highlights = self._step_highlights
+        highlights[0] = highlights[1] = -1
+        self._step(highlights, i, False)
+
+    def sweep(self, i):
+        self._step((), i, True)
+
+    def partition(self, lo, hi, lane):
+        if self.lanes is None or len(self.lanes) != self.n:
+            if lane < 0:
+                return
+            self.lanes = np.full(self.n, -1, dtype=np.int16)
+        self.lanes[lo:hi] = lane
+        self._full_redraw = True  # Rare, and may recolor any number of bars
+
+    def _step(self, highlight_indices, moving_index, sweep):
+        if not self.running:
+            return
+        if self.target_fps is not None:
+            self._paced_step(highlight_indices, moving_index, sweep, sweep)
+            return
+        if not self._wait_while_paused(highlight_indices, moving_index, sweep, sweep):
+            return
+        self._present_step(highlight_indices, moving_index, sweep, sweep)
+
+    def _wait_while_paused(self, highlight_indices, moving_index, end, sweep):
+        """Handle input and block while paused; returns False once quit."""
         self._handle_events()
         if not self.running:
-            return  # Check again after handling events
+            return False  # Check again after handling events
         if self.restart_requested:
             self.restart_requested = False
             raise RestartAlgorithm()
         while self.paused and self.running:
+            if self.step_once:  # Present this one step, then pause again
+                self.step_once = False
+                return True
             self._draw_frame(
                 highlight_indices, moving_index, end, sweep
             )  # Draw paused state
             self._handle_events()
             if not self.running:
-                return
+                return False
             if self.restart_requested:
                 self.restart_requested = False
                 raise RestartAlgorithm()
-            pygame.time.delay(100)  # Yield CPU while paused
-        # Normal Update
-        self.array = list(array)
+            with self.profiler.phase("delay"):
+                pygame.time.delay(100)  # Yield CPU while paused
+        return True
+
+    def _present_step(self, highlight_indices, moving_index, end, sweep):
+        if moving_index is not None and 0 <= moving_index < len(self.array):
+            self.sound_manager.note(self.array[moving_index])
         # Calls _draw_frame with default final_screen=False
         self._draw_frame(highlight_indices, moving_index, end, sweep)
-        # Sound logic
-        sound_value = None
-        if moving_index is not None and 0 <= moving_index < len(self.array):
-            sound_value = self.array[moving_index]
-        if sound_value is not None:
-            self.sound_manager.play_sound(sound_value)
+        with self.profiler.phase("sound"):
+            self.sound_manager.flush()  # One block per presented frame, as when paced
         # Delay
         if self.delay_ms > 0:
-            pygame.time.delay(self.delay_ms)
+            with self.profiler.phase("delay"):
+                pygame.time.delay(self.delay_ms)
+
+    def _paced_step(self, highlight_indices, moving_index, end, sweep):
+        self._latest_step = (highlight_indices, moving_index, end, sweep)
+        self._pace_steps += 1
+        if moving_index is not None and 0 <= moving_index < len(self.array):
+            self.sound_manager.note(self.array[moving_index])  # Mixed per frame
+        now = time.perf_counter()
+        if now >= self._next_frame_time:
+            self._present_paced_frame(now)
+        if self.steps_per_second is None:
+            return
+        # Sleep off any lead over the step budget, waking up for frames on the way
+        due = self._pace_origin + self._pace_steps / self.steps_per_second
+        while self.running and self.steps_per_second is not None:
+            now = time.perf_counter()
+            if due - now <= 0.001:  # Finer sleeps are below timer resolution
+                break
+            with self.profiler.phase("delay"):
+                time.sleep(min(due - now, max(0.0, self._next_frame_time - now)))
+            now = time.perf_counter()
+            if now >= self._next_frame_time:
+                self._present_paced_frame(now)
+                due = self._pace_origin + self._pace_steps / (
+                    self.steps_per_second or float("inf")
+                )
+
+    def _present_paced_frame(self, now):
+        """Poll input and draw the newest step once per frame interval."""
+        self._handle_events()
+        if not self.running:
+            return
+        if self.restart_requested:
+            self.restart_requested = False
+            raise RestartAlgorithm()
+        highlight_indices, moving_index, end, sweep = self._latest_step
+        if self.paused:
+            while self.paused and self.running:
+                self._draw_frame(highlight_indices, moving_index, end, sweep)
+                self._handle_events()
+                if self.restart_requested:
+                    self.restart_requested = False
+                    raise RestartAlgorithm()
+                with self.profiler.phase("delay"):
+                    pygame.time.delay(100)  # Yield CPU while paused
+            self._reset_pace_clock()
+            now = time.perf_counter()
+            if not self.running:
+                return
+        self._draw_frame(highlight_indices, moving_index, end, sweep)
+        with self.profiler.phase("sound"):
+            self.sound_manager.flush()  # One mixed block for every step of the frame
+        frame_interval = 1.0 / self.target_fps
+        # Keep a steady cadence, but don't try to catch up on frames we missed
+        self._next_frame_time += frame_interval
+        if self._next_frame_time <= now:
+            self._next_frame_time = now + frame_interval
+
+    def play(self, step_iter):
+        """
+        Drive the visualization from an iterator of (opcode, i, j, value) steps
+        that have already been applied to the bound array. A None item means no
+        step is ready yet. The iterator is only advanced while running, so a
+        pause costs nothing; it is closed on return, including on restart.
+        """
+        step_iter = iter(step_iter)
+        self.step_source = step_iter
+        if self.paused:
+            self._set_paused(True)  # Carry a pause over from the previous run
+        try:
+            if self.target_fps is None:
+                self._play_per_step(step_iter)
+            else:
+                self._play_paced(step_iter)
+        finally:
+            self.step_source = None
+            close = getattr(step_iter, "close", None)
+            if close is not None:
+                close()
+
+    def _play_per_step(self, step_iter):
+        algorithm = self.profiler.phase("algorithm")
+        while True:
+            with algorithm:  # Pulling a step runs the algorithm up to its next step
+                step = next(step_iter, _EXHAUSTED)
+            if step is _EXHAUSTED or not self.running:
+                return
+            if step is None:
+                self.idle()
+                continue
+            opcode, i, j, value = step
+            if opcode == OP_COMPARE:
+                self.compare(i, j)
+            elif opcode == OP_SWAP:
+                self.swap(i, j)
+            elif opcode == OP_WRITE:
+                self.write(i, value)
+            elif opcode == OP_PARTITION:
+                self.partition(i, j, value)
+            else:
+                self.sweep(i)
+
+    def _play_paced(self, step_iter):
+        frame_interval = 1.0 / self.target_fps
+        self._reset_pace_clock()
+        next_frame_time = time.perf_counter()
+        was_paused = False
+        while self.running:
+            self._handle_events()
+            if not self.running:
+                return
+            if self.restart_requested:
+                self.restart_requested = False
+                raise RestartAlgorithm()
+            now = time.perf_counter()
+            if self.paused and not self.step_once:
+                self._draw_frame(*self._latest_step)
+                was_paused = True
+                with self.profiler.phase("delay"):
+                    pygame.time.delay(100)  # Yield CPU while paused
+                continue
+            if self.step_once:
+                self.step_once = False
+                budget = 1
+            else:
+                if was_paused:
+                    self._reset_pace_clock()  # No burst to catch up on the pause
+                    was_paused = False
+                if self.steps_per_second is None:
+                    budget = None  # As many as fit in this frame
+                else:
+                    due = int((now - self._pace_origin) * self.steps_per_second)
+                    budget = due - self._pace_steps
+            with self.profiler.phase("algorithm"):
+                _, finished = self._advance(step_iter, budget, now + frame_interval)
+            self._draw_frame(*self._latest_step)
+            with self.profiler.phase("sound"):
+                self.sound_manager.flush()
+            if finished:
+                return
+            next_frame_time += frame_interval
+            now = time.perf_counter()
+            if next_frame_time <= now:  # Fell behind: don't try to catch up
+                next_frame_time = now + frame_interval
+            else:
+                with self.profiler.phase("delay"):
+                    time.sleep(next_frame_time - now)
+
+    def _advance(self, step_iter, budget, deadline):
+        """
+        Pull up to ``budget`` steps (or until ``deadline`` when None) without
+        drawing. Returns the number of steps pulled and whether the iterator
+        is exhausted.
+        """
+        if budget is not None and budget <= 0:
+            return 0, False
+        dirty = self._pending_dirty
+        note = self.sound_manager.note
+        array = self.array
+        last = None
+        count = 0
+        finished = False
+        for step in step_iter:
+            if step is None:
+                break  # Nothing ready yet, draw what we have
+            opcode, i, j, value = step
+            if opcode == OP_SWAP:
+                dirty.add(i)
+                dirty.add(j)
+                note(array[j])
+            elif opcode == OP_WRITE:
+                dirty.add(i)
+                note(array[i])
+            elif opcode == OP_COMPARE:
+                note(array[j])
+            elif opcode == OP_PARTITION:  # Neither sounded nor highlighted
+                self.partition(i, j, value)
+                step = last
+            else:
+                note(array[i])
+            last = step
+            count += 1
+            if budget is not None:
+                if count >= budget:
+                    break
+            elif count & 255 == 0 and time.perf_counter() >= deadline:
+                break
+        else:
+            finished = True
+        self._pace_steps += count
+        if last is not None:
+            self._latest_step = self._step_marks(last)
+        return count, finished
+
+    def _step_marks(self, step):
+        """The highlight arguments the equivalent sink method would draw."""
+        opcode, i, j, value = step
+        if opcode == OP_COMPARE:
+            return (i,), j, False, False
+        if opcode == OP_SWAP:
+            return (i, j), j, False, False
+        if opcode == OP_WRITE:
+            return (), i, False, False
+        if opcode == OP_PARTITION:
+            return (), None, False, False
+        return (), i, True, True
+
+    def play_timeline(self, timeline):
+        """
+        Play a recorded run from the bound array's initial state. Unlike play(),
+        the run can be sought: [Left]/[Right] step back/forward (one percent of
+        the run with [Shift]) and pause, [Home] or [R] rewinds without
+        recomputing anything, and the progress bar can be clicked or dragged.
+        Reaching the end shows the final screen but keeps the timeline open for
+        review; returns once the window is closed.
+        """
+        self.timeline = timeline
+        self._seek_target = 0
+        paced = self.target_fps is not None
+        next_frame_time = time.perf_counter()
+        was_paused = False
+        final_shown = False
+        step_iter = None
+        try:
+            while self.running:
+                self._handle_events()
+                if not self.running:
+                    return
+                if self.restart_requested:  # Rewind instead of re-running
+                    self.restart_requested = False
+                    self._seek_target = 0
+                    self.reset_timer()
+                if self._seek_target is not None:
+                    step_iter = self._seek(self._seek_target)
+                    was_paused = True  # Restart the step budget after the jump
+                    final_shown = False
+                frame_interval = (
+                    1.0 / self.target_fps if paced else self.delay_ms / 1000
+                )
+                now = time.perf_counter()
+                at_end = self.timeline_position >= len(timeline)
+                if self.step_once and not at_end:
+                    self.step_once = False
+                    budget = 1
+                elif self.paused or at_end:
+                    if not (at_end and final_shown):  # The final screen is static
+                        self._draw_frame(*self._latest_step, final_screen=at_end)
+                        final_shown = at_end
+                    was_paused = True
+                    with self.profiler.phase("delay"):
+                        pygame.time.delay(20 if self._scrubbing else 50)
+                    continue
+                else:
+                    if was_paused:
+                        self._reset_pace_clock()
+                        was_paused = False
+                    if not paced:
+                        budget = 1  # Per-step mode: one step per delay_ms
+                    elif self.steps_per_second is None:
+                        budget = None
+                    else:
+                        due = int((now - self._pace_origin) * self.steps_per_second)
+                        budget = due - self._pace_steps
+                with self.profiler.phase("algorithm"):
+                    count, _ = self._advance(step_iter, budget, now + frame_interval)
+                self.timeline_position += count
+                self._draw_frame(*self._latest_step)
+                with self.profiler.phase("sound"):
+                    self.sound_manager.flush()
+                next_frame_time += frame_interval
+                now = time.perf_counter()
+                if next_frame_time <= now:  # Fell behind: don't try to catch up
+                    next_frame_time = now + frame_interval
+                else:
+                    with self.profiler.phase("delay"):
+                        time.sleep(next_frame_time - now)
+        finally:
+            self.timeline = None
+
+    def _seek(self, step):
+        """Jump the bound array to a timeline step and return an iterator from there."""
+        self._seek_target = None
+        position = self.timeline.seek(self.array, step)
+        self.timeline_position = position
+        self.lanes = None
+        for lo, hi, lane in self.timeline.partitions_before(position):
+            self.partition(lo, hi, lane)
+        self._pending_dirty.clear()
+        self._full_redraw = True  # Any number of bars may have changed
+        if position > 0:
+            self._latest_step = self._step_marks(self.timeline.step_at(position - 1))
+        else:
+            self._latest_step = ((), None, False, False)
+        return self.timeline.iter_from(self.array, position)
+
+    def _request_seek(self, step):
+        self._seek_target = max(0, min(len(self.timeline), step))
+
+    def _progress_rect(self):
+        """The progress bar along the bottom edge of the info strip."""
+        bar_area_top = self.height - self.bar_area_height
+        return pygame.Rect(10, bar_area_top - 10, max(1, self.width - 20), 6)
+
+    def _seek_to_x(self, x):
+        rect = self._progress_rect()
+        fraction = max(0.0, min(1.0, (x - rect.left) / rect.width))
+        self._request_seek(round(fraction * len(self.timeline)))
+
+    def _draw_progress(self):
+        rect = self._progress_rect()
+        pygame.draw.rect(self.screen, (60, 60, 75), rect)
+        total = len(self.timeline)
+        fraction = self.timeline_position / total if total else 1.0
+        filled = rect.copy()
+        filled.width = int(rect.width * fraction)
+        if filled.width > 0:
+            pygame.draw.rect(self.screen, self.highlight_color, filled)
+
+    def idle(self):
+        """Keep the window responsive while the algorithm has no step ready."""
+        if not self.running:
+            return False
+        if not self._wait_while_paused((), None, False, False):
+            return False
+        self._draw_frame()  # Only the timer changed, so this is a HUD-strip update
+        return self.running
 
     def finalize(self):
         """Keeps the final sorted state displayed until user action."""
@@ -0,0 +1,260 @@
+"""
+Headless export of a sorting run to a PNG sequence or a raw/Y4M video stream.
+
+The selected algorithm is recorded first. Its frames are then rasterized
+offscreen at a fixed resolution and frame rate by a pool of worker processes.
+Each worker receives the array state a contiguous chunk of frames starts
+from and replays only that chunk's steps. No display is needed,
+because SDL is forced onto its dummy driver.
+
+    python exporter.py --algorithm merge_sort --size 100000 --output run.y4m
+    python exporter.py --algorithm quick_sort --format png --output frames/
+    ffmpeg -i run.y4m run.mp4
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import math
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bar_renderer import BarRenderer, PALETTE, step_marks
+from discovery import discover, load_algorithm
+from input_generators import INPUT_SHAPES, make_input
+from recorder import RECORD_WIDTH, record_algorithm
+from steps import OP_SWAP, OP_WRITE
+
+FORMATS = ("y4m", "raw", "png")
+FRAMES_PER_TASK = 16  # Frames one worker renders from a single snapshot
+RGBA_SHIFTS = (0, 8, 16)  # Packed so that little-endian bytes read R, G, B, 0
+
+_renderer = None  # Per-process BarRenderer, set up by _init_worker
+_settings = None
+_palette = None
+
+
+def frame_steps(total_steps, frames):
+    """The number of applied steps shown by each frame, first and last included."""
+    if frames <= 1:
+        return [total_steps]
+    return [math.ceil(k * total_steps / (frames - 1)) for k in range(frames)]
+
+
+def apply_ops(model, ops, start, stop):
+    """Apply the flat records of steps [start, stop) in ``ops`` to model."""
+    for k in range(start * RECORD_WIDTH, stop * RECORD_WIDTH, RECORD_WIDTH):
+        opcode = ops[k]
+        if opcode == OP_SWAP:
+            i, j = ops[k + 1], ops[k + 2]
+            model[i], model[j] = model[j], model[i]
+        elif opcode == OP_WRITE:
+            model[ops[k + 1]] = ops[k + 3]
+
+
+def y4m_header(width, height, fps):
+    return f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C444\n".encode("ascii")
+
+
+def rgb_to_yuv(color):
+    """Convert one RGB color to BT.601 limited-range (Y, U, V)."""
+    r, g, b = color
+    yuv = (
+        16 + 0.257 * r + 0.504 * g + 0.098 * b,
+        128 - 0.148 * r - 0.291 * g + 0.439 * b,
+        128 + 0.439 * r - 0.368 * g - 0.071 * b,
+    )
+    return tuple(max(0, min(255, int(c + 0.5))) for c in yuv)
+
+
+def make_palette(fmt):
+    """
+    The export colors, converted to YUV for y4m. The conversion is affine, so
+    rasterizing with converted endpoints yields the converted gradient and
+    the whole frame is produced in YUV without a per-pixel conversion.
+    """
+    if fmt == "y4m":
+        return {name: rgb_to_yuv(color) for name, color in PALETTE.items()}
+    return dict(PALETTE)
+
+
+def _init_worker(settings):
+    global _renderer, _settings, _palette
+    _settings = settings
+    _palette = make_palette(settings["format"])
+    _renderer = BarRenderer(_palette["bg"], _palette["start"], _palette["end"])
+    _renderer.configure(
+        settings["width"], settings["height"], settings["n"], settings["max_value"]
+    )
+
+
+def _rasterize(values, marks):
+    """Render one frame as an (h, w, 3) uint8 image in the palette's color space."""
+    packed = _renderer.rasterize(np.asarray(values), marks, RGBA_SHIFTS, False)
+    rgba = packed.T.copy().view(np.uint8)  # (h, w * 4)
+    return rgba.reshape(packed.shape[1], packed.shape[0], 4)[:, :, :3]
+
+
+def _encode(rgb, frame_index):
+    fmt = _settings["format"]
+    if fmt == "raw":
+        return rgb.tobytes()
+    if fmt == "y4m":  # Already YUV, see make_palette; y4m wants planar data
+        return b"FRAME\n" + np.ascontiguousarray(rgb.transpose(2, 0, 1)).tobytes()
+    import pygame  # Only PNG output needs pygame, and only in the workers
+
+    height, width = rgb.shape[:2]
+    surface = pygame.image.frombuffer(
+        np.ascontiguousarray(rgb).tobytes(), (width, height), "RGB"
+    )
+    path = os.path.join(_settings["output"], f"frame_{frame_index:06d}.png")
+    pygame.image.save(surface, path)
+    return b""
+
+
+def _render_chunk(task):
+    """Replay one chunk of steps from its snapshot and encode each of its frames."""
+    first_frame, base_step, state, ops, steps = task
+    model = list(state)
+    position = base_step
+    encoded = []
+    for offset, target in enumerate(steps):
+        apply_ops(model, ops, position - base_step, target - base_step)
+        position = target
+        marks = {}
+        if 0 < target < _settings["total_steps"]:  # The final frame is unmarked
+            k = (target - base_step - 1) * RECORD_WIDTH
+            marks = step_marks(ops[k], ops[k + 1], ops[k + 2], _palette)
+        encoded.append(_encode(_rasterize(model, marks), first_frame + offset))
+    return encoded
+
+
+def _tasks(recording, steps):
+    """
+    Yield one picklable task per FRAMES_PER_TASK frames: the array snapshot
+    its first frame starts from and just the steps the chunk covers.
+    """
+    model = list(recording.initial_array)
+    ops = recording.ops
+    position = 0
+    for first in range(0, len(steps), FRAMES_PER_TASK):
+        chunk = steps[first : first + FRAMES_PER_TASK]
+        base = chunk[0]
+        apply_ops(model, ops, position, base)
+        position = base
+        chunk_ops = ops[base * RECORD_WIDTH : chunk[-1] * RECORD_WIDTH]
+        yield first, base, array("q", model), chunk_ops, chunk
+
+
+def export(recording, settings, workers=None, out=None):
+    """
+    Render every frame with a process pool and write them to ``out`` (a binary
+    file for raw/y4m) or into ``settings['output']`` (PNG). At most two tasks
+    per worker are in flight, so memory stays bounded however long the run is.
+    """
+    steps = frame_steps(len(recording), settings["frames"])
+    workers = workers or os.cpu_count() or 1
+    if settings["format"] == "y4m":
+        out.write(y4m_header(settings["width"], settings["height"], settings["fps"]))
+    written = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(settings,)
+    ) as pool:
+        pending = deque()
+        for task in _tasks(recording, steps):
+            pending.append(pool.submit(_render_chunk, task))
+            if len(pending) >= 2 * workers:
+                written += _write(pending.popleft().result(), out)
+        while pending:
+            written += _write(pending.popleft().result(), out)
+    return written
+
+
+def _write(frames, out):
+    if out is not None:
+        for frame in frames:
+            out.write(frame)
+    return len(frames)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithm", choices=sorted(discover()), required=True)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument(
+        "--max-value", type=int, help="Largest element (default: --size)."
+    )
+    parser.add_argument("--shape", choices=list(INPUT_SHAPES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Length of the exported run in seconds (default: 10).",
+    )
+    parser.add_argument("--format", choices=FORMATS, default="y4m")
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="Output file for raw/y4m, or a directory for png.",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count)."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    func, protocol = load_algorithm(args.algorithm)
+    max_value = args.max_value or args.size
+    values = make_input(args.shape, args.size, max_value, args.seed)
+
+    recording = record_algorithm(func, protocol, values)
+    frames = max(1, round(args.fps * args.duration))
+    print(
+        f"Recorded {len(recording):,} steps of {args.algorithm} on {args.size:,} "
+        f"elements in {recording.record_seconds:.2f}s; rendering {frames:,} frames "
+        f"at {args.width}x{args.height}."
+    )
+    settings = {
+        "width": args.width,
+        "height": args.height,
+        "fps": args.fps,
+        "frames": frames,
+        "format": args.format,
+        "output": args.output,
+        "n": len(values),
+        "max_value": max(values) if values else 1,
+        "total_steps": len(recording),
+    }
+
+    start = time.perf_counter()
+    if args.format == "png":
+        os.makedirs(args.output, exist_ok=True)
+        written = export(recording, settings, args.workers)
+    else:
+        with open(args.output, "wb") as out:
+            written = export(recording, settings, args.workers, out)
+    seconds = time.perf_counter() - start
+    print(
+        f"Wrote {written:,} frames to {args.output} in {seconds:.1f}s "
+        f"({seconds / args.duration:.2f}x real time)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
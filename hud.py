@@ -0,0 +1,158 @@
+import pygame
+
+TIMER_GLYPHS = "0123456789.s"
+COUNTER_GLYPHS = "0123456789,"
+COUNTER_SPACING = 24  # Pixels between two counters in the counters row
+TEXT_CACHE_LIMIT = 64  # Distinct hint strings kept before the cache is reset
+
+
+class Hud:
+    """
+    Cached, layered renderer for the info strip above the bars.
+    Every piece of text is rendered once and reused: the title and control
+    hints are cached surfaces that are only rebuilt after a resize or font
+    change, and the timer and the operation counters row are assembled from
+    a pre-rendered digit-glyph atlas whenever their displayed values change.
+    The layers are composited onto one persistent strip surface, which is
+    only recomposed when one of them changed, so an unchanged HUD costs a
+    single blit.
+    Attributes:
+        width (int): The width of the HUD strip.
+        height (int): The height of the HUD strip.
+        font (pygame.font.Font): The font used for the timer and hints.
+        title_font (pygame.font.Font): The font used for the title.
+        text_color (tuple): The color of the timer and hints.
+        title_color (tuple): The color of the title.
+        bg_color (tuple): The background color of the strip.
+        surface (pygame.Surface): The composited HUD strip.
+    Methods:
+        reset(self, width, height, font, title_font):
+            Drops every cached layer, e.g. after a resize or fullscreen toggle.
+        compose(self, title, timer_prefix, elapsed, hints, right_hint, counters=()):
+            Returns the HUD strip for the given state, recomposing only on change.
+    """
+
+    def __init__(
+        self, width, height, font, title_font, text_color, title_color, bg_color
+    ):
+        self.text_color = text_color
+        self.title_color = title_color
+        self.bg_color = bg_color
+        self.reset(width, height, font, title_font)
+
+    def reset(self, width, height, font, title_font):
+        self.width = width
+        self.height = height
+        self.font = font
+        self.title_font = title_font
+        self.surface = pygame.Surface((max(1, width), max(1, height)))
+        self._text_cache = {}
+        self._title = None
+        self._glyphs = {
+            ch: font.render(ch, True, self.text_color)
+            for ch in set(TIMER_GLYPHS + COUNTER_GLYPHS)
+        }
+        self._timer_key = None
+        self._timer_surface = None
+        self._counters_key = None
+        self._counters_surface = None
+        self._state = None  # Inputs of the last composition
+
+    def _text(self, text):
+        surface = self._text_cache.get(text)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_LIMIT:
+                self._text_cache.clear()
+            surface = self.font.render(text, True, self.text_color)
+            self._text_cache[text] = surface
+        return surface
+
+    def _title_layer(self, title):
+        if self._title is None or self._title[0] != title:
+            surface = self.title_font.render(title, True, self.title_color)
+            self._title = (
+                title,
+                surface,
+                surface.get_rect(center=(self.width // 2, 25)),
+            )
+        return self._title[1], self._title[2]
+
+    def _timer_layer(self, prefix, centiseconds):
+        key = (prefix, centiseconds)
+        if key != self._timer_key:
+            prefix_surface = self._text(prefix + " ")
+            digits = f"{centiseconds / 100:.2f}s"
+            glyphs = [self._glyphs[ch] for ch in digits]
+            width = prefix_surface.get_width() + sum(g.get_width() for g in glyphs)
+            height = max(
+                [prefix_surface.get_height()] + [g.get_height() for g in glyphs]
+            )
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            surface.blit(prefix_surface, (0, 0))
+            x = prefix_surface.get_width()
+            for glyph in glyphs:
+                surface.blit(glyph, (x, 0))
+                x += glyph.get_width()
+            self._timer_key = key
+            self._timer_surface = surface
+        return self._timer_surface
+
+    def _counters_layer(self, counters):
+        """Labels from the text cache, values from the glyph atlas."""
+        if counters != self._counters_key:
+            pieces = []
+            for label, value in counters:
+                pieces.append((self._text(label + " "), 0))
+                pieces += [(self._glyphs[ch], 0) for ch in f"{value:,}"]
+                pieces[-1] = (pieces[-1][0], COUNTER_SPACING)
+            width = sum(p.get_width() + gap for p, gap in pieces) or 1
+            height = max([p.get_height() for p, _ in pieces] or [1])
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            x = 0
+            for piece, gap in pieces:
+                surface.blit(piece, (x, 0))
+                x += piece.get_width() + gap
+            self._counters_key = counters
+            self._counters_surface = surface
+        return self._counters_surface
+
+    def compose(self, title, timer_prefix, elapsed, hints, right_hint, counters=()):
+        """
+        Return the HUD strip. ``hints`` are laid out left to right after the
+        timer and ``right_hint`` is right-aligned, matching the original layout.
+        ``counters`` is a tuple of (label, int) pairs shown on a row of their own
+        along the bottom edge.
+        """
+        centiseconds = int(elapsed * 100)
+        state = (title, timer_prefix, centiseconds, hints, right_hint, counters)
+        if state == self._state:
+            return self.surface
+
+        surface = self.surface
+        surface.fill(self.bg_color)
+        try:
+            title_surface, title_rect = self._title_layer(title)
+            surface.blit(title_surface, title_rect)
+            info_y_pos = title_rect.top + 5  # Start below the title
+        except Exception as e:
+            print(f"Error rendering title font: {e}")
+            info_y_pos = 15  # Fallback position
+
+        timer_surface = self._timer_layer(timer_prefix, centiseconds)
+        surface.blit(timer_surface, (10, info_y_pos))
+        current_x = 10 + timer_surface.get_width() + 30  # Position relative to timer
+        for hint in hints:
+            hint_surface = self._text(hint)
+            surface.blit(hint_surface, (current_x, info_y_pos))
+            current_x += hint_surface.get_width() + 30
+        right_surface = self._text(right_hint)
+        surface.blit(
+            right_surface, (self.width - right_surface.get_width() - 10, info_y_pos)
+        )
+        if counters:
+            counters_surface = self._counters_layer(counters)
+            surface.blit(
+                counters_surface, (10, self.height - counters_surface.get_height() - 2)
+            )
+        self._state = state
+        return surface
@@ -0,0 +1,170 @@
+"""
+Seeded, NumPy-backed input arrays for the visualizer and the headless tools.
+
+Every shape is built from one base sample of ``size`` values in
+[1, max_value] (uniform, or distinct when ``unique`` is set) and arranged
+with whole-array NumPy operations, so multi-million element inputs take
+milliseconds. The same (shape, size, max_value, seed, unique) always gives
+the same array. load_input() can keep generated arrays as .npy files and
+memory-map them on later runs, so repeated benchmarks reuse identical data.
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+INPUT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".input_cache"
+)
+SAWTOOTH_TEETH = 8  # Ascending runs in the sawtooth shape
+FEW_UNIQUE_KEYS = 8  # Distinct values in the few-unique shape
+# Bumped whenever a shape changes, so stale cache files are not reused
+INPUT_CACHE_VERSION = 2
+
+
+def _base(rng, size, max_value, unique):
+    if unique:
+        return rng.choice(max_value, size, replace=False).astype(np.int64) + 1
+    return rng.integers(1, max_value + 1, size, dtype=np.int64)
+
+
+def _random(rng, values, swaps):
+    return values
+
+
+def _sorted(rng, values, swaps):
+    return np.sort(values)
+
+
+def _reversed(rng, values, swaps):
+    return np.sort(values)[::-1].copy()
+
+
+def _nearly_sorted(rng, values, swaps):
+    values = np.sort(values)
+    if len(values) > 1:
+        if swaps is None:
+            swaps = max(1, len(values) // 20)  # Swap ~5% of the positions
+        # Disjoint pairs, so the vectorized swap below moves every value exactly
+        # once; pairs sharing an index would duplicate one value and lose another
+        swaps = min(swaps, len(values) // 2)
+        positions = rng.choice(len(values), 2 * swaps, replace=False)
+        i, j = positions[0::2], positions[1::2]
+        values[i], values[j] = values[j], values[i]  # Fancy indexing copies
+    return values
+
+
+def _few_unique(rng, values, swaps):
+    keys = rng.choice(values, min(FEW_UNIQUE_KEYS, len(values)), replace=False)
+    return keys[rng.integers(0, len(keys), len(values))]
+
+
+def _sawtooth(rng, values, swaps):
+    """SAWTOOTH_TEETH ascending runs, each spanning the whole value range."""
+    values = np.sort(values)
+    return np.concatenate(
+        [values[tooth::SAWTOOTH_TEETH] for tooth in range(SAWTOOTH_TEETH)]
+    )
+
+
+def _organ_pipe(rng, values, swaps):
+    """Ascending to the maximum in the middle, then descending."""
+    values = np.sort(values)
+    return np.concatenate([values[::2], values[1::2][::-1]])
+
+
+def median_of_3_killer_ranks(size):
+    """
+    Musser's median-of-3 killer permutation of range(size). A quicksort that
+    takes the median of the first, middle and last elements as its pivot
+    splits off only two elements per partition on it and degrades to O(n^2).
+    """
+    # The construction interleaves pairs, so it needs an even half; any
+    # remaining largest elements are appended in order
+    core = size - size % 4
+    half = core // 2
+    ranks = np.empty(core, dtype=np.int64)
+    i = np.arange(1, half + 1)
+    odd = i[i % 2 == 1]
+    ranks[odd - 1] = odd
+    ranks[odd] = half + odd
+    ranks[half + i - 1] = 2 * i
+    ranks = np.concatenate((ranks, np.arange(core + 1, size + 1)))
+    return ranks - 1
+
+
+def _median_of_3_killer(rng, values, swaps):
+    return np.sort(values)[median_of_3_killer_ranks(len(values))]
+
+
+INPUT_SHAPES = {
+    "random": _random,
+    "sorted": _sorted,
+    "reversed": _reversed,
+    "nearly_sorted": _nearly_sorted,
+    "few_unique": _few_unique,
+    "sawtooth": _sawtooth,
+    "organ_pipe": _organ_pipe,
+    "median3_killer": _median_of_3_killer,
+}
+
+
+def generate(shape, size, max_value, seed=None, unique=False, swaps=None):
+    """
+    Return one input as an int64 array. ``seed=None`` draws fresh entropy.
+    ``swaps`` sets the number of random swaps of nearly_sorted (5% of size by
+    default). Raises ValueError if ``unique`` asks for more values than
+    [1, max_value] holds.
+    """
+    if shape not in INPUT_SHAPES:
+        raise ValueError(f"Unknown input shape '{shape}'")
+    if unique and size > max_value:
+        raise ValueError(f"Cannot draw {size} unique values from 1..{max_value}")
+    entropy = None
+    if seed is not None:  # Independent streams for every (seed, shape, size)
+        entropy = [seed, zlib.crc32(shape.encode()), size, max_value, int(unique)]
+    rng = np.random.default_rng(entropy)
+    return INPUT_SHAPES[shape](rng, _base(rng, size, max_value, unique), swaps)
+
+
+def cache_path(shape, size, max_value, seed, unique=False, cache_dir=INPUT_CACHE_DIR):
+    suffix = "_unique" if unique else ""
+    return os.path.join(
+        cache_dir,
+        f"{shape}_{size}_{max_value}_{seed}{suffix}_v{INPUT_CACHE_VERSION}.npy",
+    )
+
+
+def load_input(shape, size, max_value, seed, unique=False, cache_dir=INPUT_CACHE_DIR):
+    """
+    Like generate(), but the array is stored in ``cache_dir`` the first time
+    and returned read-only memory-mapped from there afterwards. With
+    ``cache_dir=None`` nothing is cached.
+    """
+    if not cache_dir:
+        return generate(shape, size, max_value, seed, unique)
+    path = cache_path(shape, size, max_value, seed, unique, cache_dir)
+    if os.path.exists(path):
+        try:
+            values = np.load(path, mmap_mode="r")
+            if values.shape == (size,):
+                return values
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable input cache ({e}).")
+    values = generate(shape, size, max_value, seed, unique)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"  # Concurrent runs never see half a file
+        with open(partial, "wb") as f:
+            np.save(f, values)
+        os.replace(partial, path)
+    except OSError as e:
+        print(f"Warning: Could not write input cache ({e}).")
+        return values
+    return np.load(path, mmap_mode="r")
+
+
+def make_input(shape, size, max_value, seed, cache_dir=None):
+    """The same input for a given (shape, size, max_value, seed), as a list of ints."""
+    return load_input(shape, size, max_value, seed, cache_dir=cache_dir).tolist()
@@ -0,0 +1,139 @@
+TRACKED_CACHE_LIMIT = 1 << 16  # Distinct values InstrumentedView keeps wrapped
+
+
+class OpCounters:
+    """
+    Plain counters for the element operations an algorithm performs.
+    Attributes:
+        reads (int): Element reads through array indexing.
+        writes (int): Element writes through array indexing.
+        comparisons (int): Ordering comparisons (<, <=, >, >=) between elements.
+        swaps (int): OP_SWAP steps the algorithm emitted.
+        callbacks (int): Step events the algorithm emitted, partition markers aside.
+    """
+
+    __slots__ = ("reads", "writes", "comparisons", "swaps", "callbacks")
+
+    def __init__(self):
+        self.reads = self.writes = self.comparisons = self.swaps = self.callbacks = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _tracked_int_type(counters):
+    """Build an int subclass whose ordering comparisons bump ``counters``."""
+
+    class TrackedInt(int):
+        __slots__ = ()
+
+        def __lt__(self, other):
+            counters.comparisons += 1
+            return int.__lt__(self, other)
+
+        def __le__(self, other):
+            counters.comparisons += 1
+            return int.__le__(self, other)
+
+        def __gt__(self, other):
+            counters.comparisons += 1
+            return int.__gt__(self, other)
+
+        def __ge__(self, other):
+            counters.comparisons += 1
+            return int.__ge__(self, other)
+
+    return TrackedInt
+
+
+class InstrumentedArray:
+    """
+    A list-like wrapper that counts element reads, writes and comparisons.
+    Elements are stored as an int subclass that counts its own ordering
+    comparisons, so comparisons are caught wherever the values travel,
+    including temporary buffers and local variables inside the algorithm.
+    Arithmetic on them yields plain ints.
+    Attributes:
+        counters (OpCounters): The running totals for this array.
+        data: The underlying storage. Reading it directly is not counted.
+    """
+
+    def __init__(self, values, counters=None):
+        self.counters = counters if counters is not None else OpCounters()
+        self._tracked = _tracked_int_type(self.counters)
+        self._data = [self._tracked(value) for value in values]
+
+    @property
+    def data(self):
+        return self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        self.counters.reads += 1
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        self.counters.writes += 1
+        self._data[index] = value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, InstrumentedArray):
+            other = other._data
+        return self._data == other
+
+    def tolist(self):
+        return [int(value) for value in self._data]
+
+
+class InstrumentedView(InstrumentedArray):
+    """
+    An InstrumentedArray over an existing buffer, such as the typed buffer
+    bound to the Displayer, which the algorithm then sorts in place.
+    Nothing is copied: every read wraps the stored value in the counting int
+    type on the way out, and writes store plain ints. The wrapped ints are
+    cached per value (up to TRACKED_CACHE_LIMIT of them), which keeps a
+    counted read at a few times the cost of a plain one.
+    Attributes:
+        counters (OpCounters): The running totals for this array.
+        data: The wrapped buffer.
+    """
+
+    def __init__(self, buffer, counters=None):
+        self.counters = counters if counters is not None else OpCounters()
+        self._tracked = _tracked_int_type(self.counters)
+        self._data = buffer
+        self._cache = {}  # value -> tracked int
+
+    def _track(self, value):
+        try:
+            return self._cache[value]
+        except KeyError:
+            tracked = self._tracked(value)
+            if len(self._cache) < TRACKED_CACHE_LIMIT:
+                self._cache[value] = tracked
+            return tracked
+
+    def __getitem__(self, index):
+        self.counters.reads += 1
+        value = self._data[index]
+        try:
+            return self._cache[value]
+        except KeyError:
+            return self._track(value)
+
+    def __iter__(self):
+        track = self._track
+        counters = self.counters
+        for value in self._data:
+            counters.reads += 1
+            yield track(value)
+
+    def __eq__(self, other):
+        if isinstance(other, InstrumentedArray):
+            other = other._data
+        return list(self._data) == list(other)
@@ -1,92 +1,38 @@
-import displayer as displayer
-from displayer import RestartAlgorithm
-import random
+from discovery import ALGO_DIR, discover, load_algorithm
 import sys
 import os
 import time
 import traceback  # Import traceback for better error printing
-import pygame
 
-ALGORITHMS = (
-    {}
-)  # Will store {'name': {'func': <func>, 'avg': 'O(..)', 'best': 'O(..)', 'rank': N}}
-algo_path = os.path.join(os.path.dirname(__file__), "algorithms")
-if not os.path.isdir(algo_path):
-    if "__file__" in globals():
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        algo_path = os.path.join(script_dir, "algorithms")
-if not os.path.isdir(algo_path):
+# pygame, NumPy, the displayer and the chosen algorithm are imported only once
+# the menu has been answered, so the menu appears right after startup.
+
+if not os.path.isdir(ALGO_DIR):
     print(
-        f"Error: Cannot find the 'algorithms' directory at expected location: {algo_path}"
+        f"Error: Cannot find the 'algorithms' directory at expected location: {ALGO_DIR}"
     )
     sys.exit(1)
-sys.path.insert(0, algo_path)
-ALGO_COMPLEXITY_DATA = {
-    "merge_sort": {"avg": "O(n log n)", "best": "O(n log n)", "rank": 2},
-    "heap_sort": {"avg": "O(n log n)", "best": "O(n log n)", "rank": 2},
-    "quick_sort": {
-        "avg": "O(n log n)",
-        "best": "O(n log n)",
-        "rank": 2,
-        "worst": "O(n^2)",
-    },
-    "insertion_sort": {"avg": "O(n^2)", "best": "O(n)", "rank": 4},
-    "bubble_sort": {"avg": "O(n^2)", "best": "O(n)", "rank": 4},
-    "selection_sort": {"avg": "O(n^2)", "best": "O(n^2)", "rank": 4},
-    "shell_sort": {"avg": "~O(n log^2 n)", "best": "O(n log n)", "rank": 3},
-    "radix_sort": {"avg": "O(nk)", "best": "O(nk)", "rank": 1},
-}
-algo_files = [
-    f for f in os.listdir(algo_path) if f.endswith(".py") and not f.startswith("__")
-]
-available_algo_names = sorted([f[:-3] for f in algo_files])
-for module_name in available_algo_names:
-    try:
-        module = __import__(module_name)
-        if hasattr(module, module_name):
-            func = getattr(module, module_name)
-            complexity_info = ALGO_COMPLEXITY_DATA.get(module_name)
-            if complexity_info:
-                ALGORITHMS[module_name] = {
-                    "func": func,
-                    "avg": complexity_info["avg"],
-                    "best": complexity_info["best"],
-                    "rank": complexity_info["rank"],
-                }
-                if "worst" in complexity_info:
-                    ALGORITHMS[module_name]["worst"] = complexity_info["worst"]
-            else:
-                print(f"Warning: Complexity data missing for '{module_name}'.")
-                ALGORITHMS[module_name] = {
-                    "func": func,
-                    "avg": "O(?)",
-                    "best": "O(?)",
-                    "rank": 99,
-                }
-        else:
-            print(
-                f"Warning: Could not find function '{module_name}' in module '{module_name}.py'"
-            )
-    except ImportError as e:
-        print(f"Error importing algorithm '{module_name}': {e}")
-if algo_path in sys.path:
-    sys.path.remove(algo_path)
+ALGORITHMS = (
+    discover()
+)  # Will store {'name': {'avg': 'O(..)', 'best': 'O(..)', 'rank': N, 'stable': bool, 'in_place': bool}}
 if not ALGORITHMS:
     print("Error: No valid sorting algorithms found.")
     sys.exit(1)
 
 
-def get_int_input(prompt, default_value):
+def get_int_input(prompt, default_value, minimum=1):
     while True:
         try:
             value_str = input(f"{prompt} (default: {default_value}): ")
             if not value_str:
                 return default_value
             value = int(value_str)
-            if value > 0:
+            if value >= minimum:
                 return value
-            else:
+            elif minimum == 1:
                 print("Please enter a positive integer.")
+            else:
+                print(f"Please enter an integer of at least {minimum}.")
         except ValueError:
             print("Invalid input. Please enter an integer.")
 
@@ -107,7 +53,16 @@ def get_choice_input(prompt, algorithms_data, default_key=None):
     )
     for i, name in enumerate(sorted_algo_names):
         info = algorithms_data[name]
-        complexity_str = f"(Avg: {info['avg']}, Best: {info['best']})"
+        traits = [
+            label
+            for label, flag in (
+                ("stable", info["stable"]),
+                ("in-place", info["in_place"]),
+            )
+            if flag
+        ]
+        complexity_str = f"(Avg: {info['avg']}, Best: {info['best']}"
+        complexity_str += f", {', '.join(traits)})" if traits else ")"
         default_marker = " (default)" if i == default_index else ""
         print(
             f"  {i+1}. {name.replace('_', ' ').title():<{max_name_len+1}} {complexity_str}{default_marker}"
@@ -143,17 +98,66 @@ def display_menu_and_get_settings():
     )
     array_size = get_int_input("Enter Array Size", default_value=100)
     max_value = get_int_input("Enter Max Element Value", default_value=500)
-    initial_delay = get_int_input("Enter Initial Delay (ms)", default_value=5)
+    initial_delay = get_int_input(
+        "Enter Initial Delay (ms)", default_value=5, minimum=0
+    )
     unique_choice = (
         input("Generate Unique Elements? (y/N, default: N): ").strip().lower()
     )
     use_unique = unique_choice == "y"
+    from input_generators import INPUT_SHAPES  # Loads NumPy, so not at startup
+
+    shape_names = ", ".join(INPUT_SHAPES)
+    while True:
+        shape = input(f"Input Shape ({shape_names}; default: random): ").strip()
+        if not shape:
+            shape = "random"
+        if shape in INPUT_SHAPES:
+            break
+        print(f"Unknown shape. Choose one of: {shape_names}.")
+    pacing_choice = (
+        input("Use Fixed-FPS Frame Pacing? (y/N, default: N): ").strip().lower()
+    )
+    target_fps = (
+        get_int_input("Enter Target FPS", default_value=60)
+        if pacing_choice == "y"
+        else None
+    )
+    precompute_choice = (
+        input("Precompute Steps Before Playback? (y/N, default: N): ").strip().lower()
+    )
+    use_precompute = precompute_choice == "y"
+    use_process = False
+    if not use_precompute:
+        process_choice = (
+            input("Sort In A Separate Process? (y/N, default: N): ").strip().lower()
+        )
+        use_process = process_choice == "y"
+    audio_choice = input("Enable Sound? (Y/n, default: Y): ").strip().lower()
+    use_audio = audio_choice != "n"
+    count_choice = input("Count Operations? (Y/n, default: Y): ").strip().lower()
+    use_counters = count_choice != "n"
+    profile_choice = input("Enable Frame Profiler? (y/N, default: N): ").strip().lower()
+    use_profiler = profile_choice == "y"
+    trace_path = None
+    if use_profiler:
+        trace_path = input("Chrome Trace File (default: none): ").strip() or None
     print("\nSettings Chosen:")
     print(f"- Algorithm: {selected_algo_name.replace('_', ' ').title()}")
     print(f"- Array Size: {array_size}")
     print(f"- Max Value: {max_value}")
     print(f"- Delay: {initial_delay} ms")
     print(f"- Unique Elements: {'Yes' if use_unique else 'No'}")
+    print(f"- Input Shape: {shape}")
+    print(f"- Frame Pacing: {f'{target_fps} FPS' if target_fps else 'Off'}")
+    print(f"- Precompute Steps: {'Yes' if use_precompute else 'No'}")
+    print(f"- Separate Process: {'Yes' if use_process else 'No'}")
+    print(f"- Sound: {'On' if use_audio else 'Off'}")
+    print(f"- Operation Counters: {'On' if use_counters else 'Off'}")
+    print(
+        f"- Frame Profiler: {'On' if use_profiler else 'Off'}"
+        + (f" (trace: {trace_path})" if trace_path else "")
+    )
     print("-" * 20)
     time.sleep(1)
     return {
@@ -162,9 +166,48 @@ def display_menu_and_get_settings():
         "max_value": max_value,
         "delay": initial_delay,
         "unique": use_unique,
+        "shape": shape,
+        "target_fps": target_fps,
+        "precompute": use_precompute,
+        "process": use_process,
+        "audio": use_audio,
+        "counters": use_counters,
+        "profile": use_profiler,
+        "trace_path": trace_path,
     }
 
 
+def report_recording(recording, settings):
+    """Print the op count, storage size and expected playback time of a run."""
+    steps = len(recording)
+    print(
+        f"\nRecorded {steps:,} steps in {recording.record_seconds:.2f}s "
+        f"({recording.nbytes() / 1e6:.1f} MB)."
+    )
+    if settings["target_fps"]:
+        from displayer import initial_step_rate
+
+        steps_per_second = initial_step_rate(settings["size"], settings["target_fps"])
+        print(
+            f"Estimated playback time: {steps / steps_per_second:.1f}s "
+            f"at {steps_per_second:,.0f} steps/s."
+        )
+    else:
+        print(
+            f"Estimated playback time: at least {steps * settings['delay'] / 1000:.1f}s "
+            f"at {settings['delay']} ms per step."
+        )
+
+
+def report_counters(counters):
+    """Print the operation totals of a finished run."""
+    print(
+        f"Operations: {counters.comparisons:,} comparisons, {counters.swaps:,} swaps, "
+        f"{counters.writes:,} writes, {counters.reads:,} reads, "
+        f"{counters.callbacks:,} steps"
+    )
+
+
 def main():
     settings = display_menu_and_get_settings()
 
@@ -187,16 +230,22 @@ def main():
         )
         time.sleep(1)
 
-    # Helper to create array instance
+    from input_generators import generate  # Already loaded by the menu
+    from storage import snapshot, typed_buffer
+
+    # Helper to create array instance; a new unseeded draw on every restart
     def create_array_instance():
-        if initial_unique:
-            try:
-                return random.sample(range(1, initial_max_value + 1), initial_size)
-            except ValueError as e:
-                print(f"\nError generating unique sample: {e}")
-                sys.exit(1)
-        else:
-            return [random.randint(1, initial_max_value) for _ in range(initial_size)]
+        try:
+            values = generate(
+                settings["shape"],
+                initial_size,
+                initial_max_value,
+                unique=initial_unique,
+            )
+        except ValueError as e:
+            print(f"\nError generating input: {e}")
+            sys.exit(1)
+        return typed_buffer(values)  # 4 bytes per element, shared with the renderer
 
     # Get algorithm details
     selected_algo_details = ALGORITHMS.get(settings["algorithm"])
@@ -205,7 +254,27 @@ def main():
             f"Error: Algorithm '{settings['algorithm']}' implementation details not found."
         )
         sys.exit(1)
-    sorting_algorithm = selected_algo_details["func"]
+    try:
+        sorting_algorithm, algorithm_protocol = load_algorithm(settings["algorithm"])
+    except (ImportError, AttributeError) as e:
+        print(f"Error importing algorithm '{settings['algorithm']}': {e}")
+        sys.exit(1)
+
+    # Deferred until the menu is answered; see the note at the top of the file
+    import pygame
+    import displayer
+    from displayer import RestartAlgorithm
+    import recorder
+    from timeline import Timeline
+    from producer import iter_steps
+    from shared_runner import SharedMemoryRunner
+    from instrumented import OpCounters
+
+    profiler = None
+    if settings["profile"]:
+        from profiler import FrameProfiler
+
+        profiler = FrameProfiler(trace=settings["trace_path"] is not None)
 
     display = None
     keep_running_app = True  # Controls the outer restart loop
@@ -215,29 +284,94 @@ def main():
         is_first_run = display is None  # Check if display needs initialization
 
         try:
+            recording = None
+            recorded_counters = None
+            if settings["precompute"]:
+                if settings["counters"]:
+                    recorded_counters = OpCounters()
+                # Run the whole sort headless first so playback is independent of it
+                recording = recorder.record_algorithm(
+                    sorting_algorithm,
+                    algorithm_protocol,
+                    current_array,
+                    counters=recorded_counters,
+                )
+                timeline = Timeline(recording)
+                report_recording(recording, settings)
+                print(
+                    f"Timeline: {len(timeline.keyframes):,} keyframes every "
+                    f"{timeline.interval:,} steps ({timeline.nbytes() / 1e6:.1f} MB)."
+                )
+
             if is_first_run:
                 # Initialize Pygame Display (only once)
                 print(f"\nInitializing Pygame and starting visualization...")
                 print(
                     "Controls: [P] Pause | [R] Restart | [+/-] Speed | [ESC] Fullscreen | [Q] Quit"
                 )
+                if profiler is not None:
+                    print("Profiler: [F] Toggle the p50/p99 timing overlay")
                 display = displayer.Displayer(
                     current_array,  # Pass the first array instance
                     algorithm_name=settings["algorithm"],
                     delay_ms=settings["delay"],
+                    target_fps=settings["target_fps"],
+                    audio=settings["audio"],
+                    profiler=profiler,
                 )
             else:
                 # Reset display state for subsequent runs
                 print("\nResetting and restarting visualization...")
-                display.original_array = list(
+                display.original_array = snapshot(
                     current_array
                 )  # Update displayer's original array
                 display.reset_array()  # Resets display's internal array and redraws
                 display.reset_timer()  # Resets display's timer
 
-            sorting_algorithm(current_array, display.update)
+            display.counters = None  # Set again below for runs that count
+            if recording is not None:
+                display.counters = recorded_counters  # The recorded run's totals
+                # Seekable playback; [R] rewinds it instead of re-running the sort
+                print(
+                    "Timeline: [Left/Right] Step back/forward | [Shift] Jump 1% | "
+                    "[Home]/[R] Rewind | Click or drag the progress bar to seek"
+                )
+                # Typecode "q" matches the timeline's keyframes, which seek() copies in
+                display.bind(typed_buffer(recording.initial_array, "q"))
+                display.play_timeline(timeline)  # Returns once the window is closed
+            elif settings["process"]:
+                # The child process sorts shared memory that frames read directly
+                runner = SharedMemoryRunner(
+                    settings["algorithm"], current_array, count=settings["counters"]
+                )
+                if settings["counters"]:
+                    display.counters = runner.counters  # Refreshed from the ring
+                try:
+                    display.bind(runner.array)
+                    display.play(runner)
+                finally:
+                    # Keep the final state, then unmap the shared memory
+                    current_array = snapshot(runner.array)
+                    display.bind(current_array)
+                    runner.release()
+            else:
+                # Steps are pulled lazily: generator algorithms sort the bound
+                # buffer in place, push-style ones run on a worker thread.
+                display.bind(current_array)
+                if settings["counters"]:
+                    display.counters = OpCounters()
+                display.play(
+                    iter_steps(
+                        sorting_algorithm,
+                        algorithm_protocol,
+                        current_array,
+                        display.counters,
+                    )
+                )
 
             print("\nSorting complete. Displaying final result.")
+            if display.counters is not None:
+                report_counters(display.counters)
             print("Press Q or close the window to exit. Press R to restart.")
             # finalize() now also listens for 'R' and raises RestartAlgorithm
             display.finalize()
@@ -261,9 +395,16 @@ def main():
             print("------------------------------------")
             keep_running_app = False  # Stop loop on other errors
 
+    if settings["trace_path"]:
+        try:
+            count = profiler.write_trace(settings["trace_path"])
+            print(f"Wrote {count:,} trace events to {settings['trace_path']}")
+        except OSError as e:
+            print(f"Warning: Could not write the trace file ({e}).")
+
     print("\nExiting Sorting Visualizer.")
     # Ensure Pygame is quit cleanly
-    if pygame.get_init():
+    if pygame.get_init() or pygame.display.get_init():
         try:
             pygame.quit()
         except Exception as quit_err:
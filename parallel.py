@@ -0,0 +1,311 @@
+"""
+Parallel merge sort and sample sort on a process pool over shared memory.
+
+The array and a scratch buffer of the same size live in
+multiprocessing.shared_memory blocks that every worker maps once when the
+pool starts. Tasks only name index ranges, so no element is ever pickled
+between processes, and every worker sorts its ranges with NumPy:
+
+    merge:  each worker sorts one chunk; the runs are then merged pairwise,
+            and every merge is split by output rank (co-ranking) into one
+            piece per worker, so the final merge keeps every core busy too
+    sample: splitters are taken from a sorted, evenly spaced sample; each
+            worker counts its chunk's elements per bucket, then scatters them
+            to prefix-summed offsets in the scratch buffer, and finally
+            every bucket is sorted by one worker
+
+Run as a script, it times both engines for a list of worker counts and
+reports the speedup over a single worker next to the machine's core count:
+
+    python parallel.py --size 4000000 --workers 1 2 4 8
+
+algorithms/parallel_merge_sort.py and algorithms/sample_sort.py animate the
+same two schemes, with the range of every worker tinted in its own color.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from input_generators import INPUT_CACHE_DIR, INPUT_SHAPES, load_input
+
+ENGINES = ("merge", "sample")
+OVERSAMPLING = 64  # Sampled elements per bucket; more samples give more even buckets
+DEFAULT_SIZE = 2_000_000
+
+_buffers = None  # Per-worker views of the (data, scratch) blocks, set by _init_worker
+_blocks = None
+
+
+def _init_worker(names, capacity):
+    global _blocks, _buffers
+    _blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _buffers = [
+        np.ndarray(capacity, dtype=np.int64, buffer=block.buf) for block in _blocks
+    ]
+
+
+def _sort_range(task):
+    lo, hi = task
+    _buffers[0][lo:hi].sort(kind="stable")
+
+
+def _merge_piece(task):
+    """Merge source[a_lo:a_hi] and source[b_lo:b_hi] into the other buffer at out."""
+    src, a_lo, a_hi, b_lo, b_hi, out = task
+    source = _buffers[src]
+    merged = np.concatenate((source[a_lo:a_hi], source[b_lo:b_hi]))
+    merged.sort(kind="stable")  # Two runs: a single linear merge pass
+    _buffers[1 - src][out : out + len(merged)] = merged
+
+
+def _bucket_counts(task):
+    lo, hi, splitters = task
+    buckets = np.searchsorted(splitters, _buffers[0][lo:hi], side="right")
+    return np.bincount(buckets, minlength=len(splitters) + 1)
+
+
+def _scatter(task):
+    """Move one chunk's elements to their bucket offsets in the scratch buffer."""
+    lo, hi, splitters, offsets = task
+    chunk = _buffers[0][lo:hi]
+    buckets = np.searchsorted(splitters, chunk, side="right").astype(np.uint16)
+    grouped = chunk[np.argsort(buckets, kind="stable")]  # Radix sort on small keys
+    ends = np.cumsum(np.bincount(buckets, minlength=len(offsets)))
+    start = 0
+    scratch = _buffers[1]
+    for offset, end in zip(offsets, ends):
+        scratch[offset : offset + end - start] = grouped[start:end]
+        start = end
+
+
+def _sort_bucket(task):
+    lo, hi = task
+    _buffers[1][lo:hi].sort()
+
+
+def co_rank(k, a, b):
+    """How many of the first k elements of the stable merge of a and b come from a."""
+    lo = max(0, k - len(b))
+    hi = min(k, len(a))
+    while lo < hi:
+        i = (lo + hi) // 2
+        if b[k - i - 1] < a[i]:
+            hi = i
+        else:
+            lo = i + 1
+    return lo
+
+
+def chunk_bounds(n, parts):
+    return [n * part // parts for part in range(parts + 1)]
+
+
+class ParallelSorter:
+    """
+    A pool of worker processes sorting int64 arrays in shared memory.
+    The pool and both blocks are created once and reused by every sort, so a
+    sort only pays for copying its input in and its result out.
+    Attributes:
+        workers (int): The number of worker processes.
+        capacity (int): The largest array the shared blocks can hold.
+    Methods:
+        merge_sort(self, values):
+            Returns a sorted copy of values, from the parallel merge sort.
+        sample_sort(self, values):
+            Returns a sorted copy of values, from the sample sort.
+        close(self):
+            Stops the workers and removes the shared memory blocks.
+    """
+
+    def __init__(self, workers, capacity):
+        self.workers = max(1, workers)
+        self.capacity = max(1, capacity)
+        self._blocks = [
+            shared_memory.SharedMemory(create=True, size=self.capacity * 8)
+            for _ in range(2)
+        ]
+        self._buffers = [
+            np.ndarray(self.capacity, dtype=np.int64, buffer=block.buf)
+            for block in self._blocks
+        ]
+        self._pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=([block.name for block in self._blocks], self.capacity),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _load(self, values):
+        n = len(values)
+        if n > self.capacity:
+            raise ValueError(f"{n} elements exceed the capacity of {self.capacity}")
+        self._buffers[0][:n] = values
+        return n
+
+    def _run(self, function, tasks):
+        return self._pool.map(function, tasks, chunksize=1)
+
+    def merge_sort(self, values):
+        n = self._load(values)
+        bounds = chunk_bounds(n, self.workers)
+        runs = list(zip(bounds, bounds[1:]))
+        self._run(_sort_range, runs)
+        src = 0
+        while len(runs) > 1:
+            source = self._buffers[src]
+            share = max(1, self.workers // (len(runs) // 2))
+            tasks = []
+            merged = []
+            for pair in range(0, len(runs) - 1, 2):
+                (a_lo, a_hi), (b_lo, b_hi) = runs[pair], runs[pair + 1]
+                a, b = source[a_lo:a_hi], source[b_lo:b_hi]
+                splits = [
+                    (k, co_rank(k, a, b)) for k in chunk_bounds(b_hi - a_lo, share)
+                ]
+                for (k0, i0), (k1, i1) in zip(splits, splits[1:]):
+                    tasks.append(
+                        (src, a_lo + i0, a_lo + i1, b_lo + k0 - i0, b_lo + k1 - i1)
+                        + (a_lo + k0,)
+                    )
+                merged.append((a_lo, b_hi))
+            if len(runs) % 2:  # The odd run out is copied across unchanged
+                lo, hi = runs[-1]
+                tasks.append((src, lo, hi, hi, hi, lo))
+                merged.append(runs[-1])
+            self._run(_merge_piece, tasks)
+            src = 1 - src
+            runs = merged
+        return self._buffers[src][:n].copy()
+
+    def sample_sort(self, values):
+        n = self._load(values)
+        data = self._buffers[0][:n]
+        size = min(n, OVERSAMPLING * self.workers)
+        if size == 0:
+            return data.copy()
+        sample = np.sort(data[(2 * np.arange(size) + 1) * n // (2 * size)])
+        splitters = sample[OVERSAMPLING::OVERSAMPLING][: self.workers - 1]
+        bounds = chunk_bounds(n, self.workers)
+        chunks = list(zip(bounds, bounds[1:]))
+        counts = np.array(
+            self._run(_bucket_counts, [(lo, hi, splitters) for lo, hi in chunks])
+        )
+        # Bucket b starts after every smaller bucket; within it, chunk k's
+        # elements follow those of the chunks before k
+        bucket_starts = np.concatenate(([0], np.cumsum(counts.sum(axis=0))))
+        offsets = bucket_starts[:-1] + np.cumsum(counts, axis=0) - counts
+        self._run(
+            _scatter,
+            [(lo, hi, splitters, offsets[k]) for k, (lo, hi) in enumerate(chunks)],
+        )
+        buckets = [
+            (int(lo), int(hi))
+            for lo, hi in zip(bucket_starts, bucket_starts[1:])
+            if hi - lo > 1
+        ]
+        self._run(_sort_bucket, buckets)
+        return self._buffers[1][:n].copy()
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+        self._buffers = None  # Release the exported buffers before closing
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+
+def default_worker_counts(cores):
+    """Powers of two up to the core count, plus the core count itself."""
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def time_engine(engine, values, workers, repeat, expected):
+    """Best wall time of one engine with ``workers`` processes; checks the result."""
+    with ParallelSorter(workers, len(values)) as sorter:
+        sort = getattr(sorter, f"{engine}_sort")
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = sort(values)
+            best = min(best, time.perf_counter() - start)
+            if not np.array_equal(result, expected):
+                raise AssertionError(f"{engine} sort with {workers} workers is wrong")
+    return best
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument(
+        "--max-value", type=int, help="Largest element (default: --size)."
+    )
+    parser.add_argument("--shape", choices=list(INPUT_SHAPES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        help="Worker counts to time (default: powers of two up to the core count).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per case (best is kept)."
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Regenerate the input.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cores = os.cpu_count() or 1
+    counts = sorted(set(args.workers or default_worker_counts(cores)) | {1})
+    values = np.asarray(
+        load_input(
+            args.shape,
+            args.size,
+            args.max_value or args.size,
+            args.seed,
+            cache_dir=None if args.no_cache else INPUT_CACHE_DIR,
+        ),
+        dtype=np.int64,
+    )
+    start = time.perf_counter()
+    expected = np.sort(values, kind="stable")
+    reference = time.perf_counter() - start
+    print(
+        f"{args.size:,} {args.shape} elements, {cores} core(s); "
+        f"numpy.sort in one process: {reference:.4f}s"
+    )
+    for engine in args.engines:
+        single = None
+        for workers in counts:
+            seconds = time_engine(engine, values, workers, args.repeat, expected)
+            single = single or seconds
+            speedup = single / seconds
+            note = "  (more workers than cores)" if workers > cores else ""
+            print(
+                f"{engine:<7} workers={workers:<3} {seconds:9.4f}s "
+                f"speedup={speedup:5.2f}x efficiency={speedup / workers:4.0%}{note}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
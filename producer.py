@@ -0,0 +1,203 @@
+import queue
+import threading
+from instrumented import InstrumentedView
+from storage import snapshot
+from steps import (
+    OP_COMPARE,
+    OP_SWAP,
+    OP_WRITE,
+    OP_SWEEP,
+    OP_PARTITION,
+    PROTOCOL_GENERATOR,
+    StepSink,
+    count_steps,
+    run_algorithm,
+)
+
+BATCH_SIZE = 512  # Steps per queue item; amortizes the queue's locking
+QUEUE_MAX_BATCHES = 64  # Backpressure: at most this many batches in flight
+IDLE_POLL_SECONDS = 1 / 60  # How long the consumer waits before idling
+
+_DONE = object()  # Queued once the algorithm has returned
+
+
+class AlgorithmStopped(Exception):
+    """Raised inside the worker thread to unwind an algorithm that was stopped."""
+
+
+class QueueSink(StepSink):
+    """
+    A step sink for the worker thread that batches steps into a bounded queue.
+    Putting a full batch blocks while the queue is full, so a fast algorithm
+    can never run more than QUEUE_MAX_BATCHES * BATCH_SIZE steps ahead of the
+    display. The block is interrupted once the producer is stopped.
+    """
+
+    def __init__(self, ops_queue, stop_event, batch_size=BATCH_SIZE):
+        self._queue = ops_queue
+        self._stop = stop_event
+        self._batch_size = batch_size
+        self._batch = []
+
+    def _emit(self, step):
+        batch = self._batch
+        batch.append(step)
+        if len(batch) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        batch = self._batch
+        self._batch = []
+        self.put(batch)
+
+    def put(self, item):
+        while True:
+            if self._stop.is_set():
+                raise AlgorithmStopped()
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def compare(self, i, j):
+        self._emit((OP_COMPARE, i, j, 0))
+
+    def swap(self, i, j):
+        self._emit((OP_SWAP, i, j, 0))
+
+    def write(self, i, value):
+        self._emit((OP_WRITE, i, -1, value))
+
+    def sweep(self, i):
+        self._emit((OP_SWEEP, i, -1, 0))
+
+    def partition(self, lo, hi, lane):
+        self._emit((OP_PARTITION, lo, hi, lane))
+
+
+class AlgorithmProducer:
+    """
+    Runs a push-style sorting algorithm on a worker thread and streams its
+    steps to the main thread through a bounded queue.
+    The worker sorts its own copy of the array. The consumer pulls the steps
+    with iter_steps(), which applies each one to a model array of its own
+    (normally the buffer bound to the Displayer) before yielding it, so the
+    two threads never share mutable state. While no steps are available it
+    yields None, which lets the consumer keep the window responsive even when
+    the algorithm is slow to produce its next step.
+    Attributes:
+        sorting_algorithm (callable): The algorithm function to run.
+        protocol (str): steps.PROTOCOL_STEPS or steps.PROTOCOL_CALLBACK.
+        counters (OpCounters): Totals of the algorithm's element operations on
+            its copy, updated live from the worker thread, or None.
+        error (BaseException): The exception the algorithm raised, if any.
+    Methods:
+        iter_steps(self, model):
+            Starts the worker and yields its steps as (opcode, i, j, value) tuples.
+        stop(self):
+            Stops the worker, unblocking it if the queue is full, and waits for it.
+    """
+
+    def __init__(
+        self,
+        sorting_algorithm,
+        protocol,
+        array,
+        max_batches=QUEUE_MAX_BATCHES,
+        batch_size=BATCH_SIZE,
+        counters=None,
+    ):
+        self.sorting_algorithm = sorting_algorithm
+        self.protocol = protocol
+        self.counters = counters
+        self.error = None
+        self._working = snapshot(array)  # Typed buffers stay typed
+        if counters is not None:
+            self._working = InstrumentedView(self._working, counters)
+        self._queue = queue.Queue(maxsize=max_batches)
+        self._stop = threading.Event()
+        self._sink = QueueSink(self._queue, self._stop, batch_size)
+        self._thread = threading.Thread(
+            target=self._run, name="sorting-algorithm", daemon=True
+        )
+
+    def _run(self):
+        sink = self._sink
+        try:
+            run_algorithm(self.sorting_algorithm, self.protocol, self._working, sink)
+            sink.flush()
+        except AlgorithmStopped:
+            return
+        except BaseException as e:  # Surfaced on the consumer side by iter_steps()
+            self.error = e
+        try:
+            sink.put(_DONE)
+        except AlgorithmStopped:
+            pass
+
+    def iter_steps(self, model):
+        """
+        Yield the algorithm's steps once each has been applied to ``model``,
+        or None when no step arrived within IDLE_POLL_SECONDS. An exception
+        raised by the algorithm is re-raised here, and closing the generator
+        stops the worker.
+        """
+        self._thread.start()
+        get = self._queue.get
+        try:
+            while True:
+                try:
+                    batch = get(timeout=IDLE_POLL_SECONDS)
+                except queue.Empty:
+                    yield None
+                    continue
+                if batch is _DONE:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                for step in batch:
+                    opcode, i, j, value = step
+                    if opcode == OP_SWAP:
+                        model[i], model[j] = model[j], model[i]
+                    elif opcode == OP_WRITE:
+                        model[i] = value
+                    yield step
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        while self._thread.is_alive():
+            try:  # Make room so a blocked put() notices the stop flag
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(timeout=0.05)
+
+
+def iter_steps(sorting_algorithm, protocol, array, counters=None):
+    """
+    Return an iterator over the steps of an algorithm of any protocol, each
+    yielded after it has been applied to ``array``. Generator algorithms run
+    directly on ``array``; push-style ones run on a worker thread (see
+    AlgorithmProducer) and may also yield None while no step is ready.
+    With ``counters`` (an OpCounters), the algorithm sees its array through
+    an InstrumentedView that counts reads, writes and comparisons, and the
+    steps are counted as they are yielded.
+    """
+    if protocol == PROTOCOL_GENERATOR:
+        if counters is None:
+            return sorting_algorithm(array)
+        steps = sorting_algorithm(InstrumentedView(array, counters))
+    else:
+        producer = AlgorithmProducer(
+            sorting_algorithm, protocol, array, counters=counters
+        )
+        steps = producer.iter_steps(array)
+        if counters is None:
+            return steps
+    return count_steps(steps, counters)
@@ -0,0 +1,203 @@
+"""
+Per-frame phase timing for the Displayer.
+
+A FrameProfiler times named phases of every frame with
+time.perf_counter_ns. Phases nest, and each one is charged only its own
+(exclusive) time, so the HUD drawn inside the bar drawing is not counted
+twice. At every presented frame, the per-phase totals go into a rolling
+window. That window gives the p50/p99 and FPS figures shown by the
+Displayer's overlay. With tracing on, every phase and frame is also kept
+as a compact (phase, start, duration) record. write_trace() dumps them
+as a Chrome trace-event JSON file for chrome://tracing or Perfetto.
+
+When profiling is off, the Displayer holds a NullProfiler, whose hooks
+do nothing.
+"""
+
+import json
+import os
+import time
+from array import array
+from collections import deque
+
+PHASES = ("algorithm", "events", "bars", "hud", "sound", "delay")
+PHASE_INDEX = {phase: index for index, phase in enumerate(PHASES)}
+FRAME = len(PHASES)  # Trace records with this phase index are whole frames
+WINDOW_FRAMES = 240  # Frames in the rolling window of the overlay statistics
+TRACE_RECORD_WIDTH = 3  # (phase index, start ns, duration ns)
+
+
+class _Phase:
+    """Context manager timing one phase; one instance per phase is reused."""
+
+    __slots__ = ("profiler", "index")
+
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+
+    def __enter__(self):
+        self.profiler._begin(self.index)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._end()
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler:
+    """Stands in for FrameProfiler when profiling is off; every hook is a no-op."""
+
+    enabled = False
+    overlay = False
+    trace = None
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def frame(self):
+        pass
+
+
+class FrameProfiler:
+    """
+    Collects per-frame phase timings for the overlay and an optional trace.
+    Attributes:
+        enabled (bool): Always True; NullProfiler has False.
+        overlay (bool): Whether the Displayer draws the statistics overlay.
+        history (list): Per phase, a deque of its exclusive nanoseconds per frame.
+        frame_ends (deque): perf_counter_ns timestamps of the last frames.
+        trace (array.array): Flat (phase, start, duration) records, or None
+            when tracing is off. FRAME as the phase index marks a whole frame.
+    Methods:
+        phase(self, name):
+            Returns the context manager timing the named phase (see PHASES).
+        frame(self):
+            Closes the current frame and moves its totals into the window.
+        percentiles(self, name):
+            Returns (p50, p99) of a phase over the window, in milliseconds.
+        fps(self):
+            Returns the frame rate over the window.
+        overlay_lines(self):
+            Returns the overlay's text: FPS and p50/p99 per phase.
+        write_trace(self, path):
+            Writes the recorded trace as Chrome trace-event JSON.
+    """
+
+    enabled = True
+
+    def __init__(self, trace=False, window=WINDOW_FRAMES):
+        self.overlay = True
+        self._clock = time.perf_counter_ns
+        self._origin = self._clock()
+        self._phases = {
+            name: _Phase(self, index) for name, index in PHASE_INDEX.items()
+        }
+        self._stack = []  # [phase index, start, time spent in nested phases]
+        self._totals = [0] * len(PHASES)
+        self.history = [deque(maxlen=window) for _ in PHASES]
+        self.frame_ends = deque(maxlen=window)
+        self._frame_start = self._origin
+        self.trace = array("q") if trace else None
+
+    def phase(self, name):
+        return self._phases[name]
+
+    def _begin(self, index):
+        self._stack.append([index, self._clock(), 0])
+
+    def _end(self):
+        index, start, nested = self._stack.pop()
+        duration = self._clock() - start
+        self._totals[index] += duration - nested
+        if self._stack:
+            self._stack[-1][2] += duration
+        if self.trace is not None:
+            self.trace.extend((index, start, duration))
+
+    def frame(self):
+        now = self._clock()
+        totals = self._totals
+        for index, history in enumerate(self.history):
+            history.append(totals[index])
+            totals[index] = 0
+        self.frame_ends.append(now)
+        if self.trace is not None:
+            self.trace.extend((FRAME, self._frame_start, now - self._frame_start))
+        self._frame_start = now
+
+    def percentiles(self, name):
+        samples = sorted(self.history[PHASE_INDEX[name]])
+        if not samples:
+            return 0.0, 0.0
+        p50 = samples[(len(samples) - 1) // 2]
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        return p50 / 1e6, p99 / 1e6
+
+    def fps(self):
+        ends = self.frame_ends
+        if len(ends) < 2 or ends[-1] == ends[0]:
+            return 0.0
+        return (len(ends) - 1) * 1e9 / (ends[-1] - ends[0])
+
+    def overlay_lines(self):
+        lines = [f"FPS {self.fps():6.1f}   p50 / p99 ms"]
+        for name in PHASES:
+            p50, p99 = self.percentiles(name)
+            lines.append(f"{name:<10}{p50:7.2f} {p99:7.2f}")
+        return lines
+
+    def write_trace(self, path):
+        """Write the trace as Chrome trace-event JSON; returns the event count."""
+        if self.trace is None:
+            raise ValueError("Tracing was not enabled for this profiler")
+        pid = os.getpid()
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "Sorting Visualizer"},
+            },
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 1,
+                "args": {"name": "phases"},
+            },
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 2,
+                "args": {"name": "frames"},
+            },
+        ]
+        trace = self.trace
+        for k in range(0, len(trace), TRACE_RECORD_WIDTH):
+            index, start, duration = trace[k], trace[k + 1], trace[k + 2]
+            events.append(
+                {
+                    "name": "frame" if index == FRAME else PHASES[index],
+                    "ph": "X",  # Complete event: start and duration
+                    "ts": (start - self._origin) / 1000,  # Microseconds
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": 2 if index == FRAME else 1,
+                }
+            )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events) - 3
@@ -0,0 +1,385 @@
+"""
+Race several sorting algorithms side by side on the same input.
+
+Every algorithm runs in its own worker process and streams its steps back
+in batches through a bounded queue. The window shows one tiled viewport per
+algorithm. All lanes advance on one shared step clock: a frame only moves
+the clock as far as every unfinished lane has steps for, so each lane has
+always performed the same number of steps and the finish order is a fair
+comparison of step counts.
+
+    python race.py --algorithms quick_sort merge_sort heap_sort shell_sort --size 500
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from array import array
+from collections import deque
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+from bar_renderer import PALETTE, BarRenderer, step_marks
+from discovery import discover, load_algorithm
+from input_generators import INPUT_SHAPES, make_input
+from producer import iter_steps
+from recorder import RECORD_WIDTH
+from steps import OP_COMPARE, OP_PARTITION, OP_SWAP, OP_WRITE
+
+BATCH_SIZE = 1024  # Steps per message from a lane's worker process
+QUEUE_MAX_BATCHES = 16  # Backpressure per lane
+HEADER_HEIGHT = 44  # Global info strip
+LANE_HEADER_HEIGHT = 24  # Name and counters above each lane
+TEXT_COLOR = (220, 220, 220)
+BORDER_COLOR = (45, 45, 60)
+
+_DONE = "done"
+
+
+def _lane_worker(name, values, ops_queue):
+    """Worker process: sort ``values`` with one algorithm and stream its steps."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)  # Forked after SDL installed its own
+    try:
+        steps = iter_steps(*load_algorithm(name), values)
+        batch = array("q")
+        for step in steps:
+            if step is None:  # A push-style algorithm has no step ready yet
+                continue
+            batch.extend(step)
+            if len(batch) >= BATCH_SIZE * RECORD_WIDTH:
+                ops_queue.put(batch.tobytes())
+                batch = array("q")
+        if batch:
+            ops_queue.put(batch.tobytes())
+        ops_queue.put(_DONE)
+    except Exception as e:
+        ops_queue.put(f"{type(e).__name__}: {e}")
+
+
+class Lane:
+    """
+    One racer: a worker process, the steps it has sent but not yet shown, and
+    the array as of the shared clock.
+    Attributes:
+        name (str): The algorithm name.
+        array (list): The lane's array after ``position`` steps.
+        position (int): The number of steps applied.
+        counters (dict): Compares, swaps and writes applied so far.
+        finished_at (int): The clock value when the lane completed or failed, or
+            None.
+        error (str): The worker's error message, if it failed.
+    """
+
+    def __init__(self, name, values, context):
+        self.name = name
+        self.array = list(values)
+        self.position = 0
+        self.counters = {"compares": 0, "swaps": 0, "writes": 0}
+        self.finished_at = None
+        self.error = None
+        self.marks = {}
+        self.renderer = BarRenderer(PALETTE["bg"], PALETTE["start"], PALETTE["end"])
+        self._queue = context.Queue(maxsize=QUEUE_MAX_BATCHES)
+        self._batches = deque()  # Received array('q') batches
+        self._offset = 0  # Read position inside the first batch, in ints
+        self._buffered = 0  # Steps received but not applied, partition records aside
+        self._done = False  # The worker has sent everything
+        self._process = context.Process(
+            target=_lane_worker,
+            args=(name, list(values), self._queue),
+            name=f"race-{name}",
+            daemon=True,
+        )
+        self._process.start()
+
+    @property
+    def available(self):
+        """The highest clock value this lane can currently reach."""
+        return self.position + self._buffered
+
+    @property
+    def exhausted(self):
+        """True once every step of the lane has been received and applied."""
+        return self._done and self._buffered == 0
+
+    def fill(self, target):
+        """Receive batches without blocking until ``target`` is reachable."""
+        while not self._done and self.available < target:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, bytes):
+                batch = array("q")
+                batch.frombytes(item)
+                self._batches.append(batch)
+                # Partition records only annotate the steps around them, so
+                # they do not count toward the lane's step position
+                opcodes = batch[::RECORD_WIDTH]
+                self._buffered += len(opcodes) - opcodes.count(OP_PARTITION)
+            else:
+                self._done = True
+                if item != _DONE:
+                    self.error = item
+
+    def advance_to(self, clock):
+        """Apply steps until ``position`` reaches ``clock`` (or the lane ends)."""
+        model = self.array
+        counters = self.counters
+        last = None
+        while self.position < clock and self._batches:
+            batch = self._batches[0]
+            k = self._offset
+            opcode, i, j, value = batch[k], batch[k + 1], batch[k + 2], batch[k + 3]
+            if opcode == OP_SWAP:
+                model[i], model[j] = model[j], model[i]
+                counters["swaps"] += 1
+            elif opcode == OP_WRITE:
+                model[i] = value
+                counters["writes"] += 1
+            elif opcode == OP_COMPARE:
+                counters["compares"] += 1
+            if opcode != OP_PARTITION:
+                last = (opcode, i, j)
+                self.position += 1
+                self._buffered -= 1
+            self._offset += RECORD_WIDTH
+            if self._offset >= len(batch):
+                self._batches.popleft()
+                self._offset = 0
+        if last is not None:
+            self.marks = step_marks(*last)
+        if self.exhausted and self.finished_at is None:
+            self.finished_at = self.position
+            self.marks = {}
+
+    def stop(self):
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(timeout=1)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+
+
+class Race:
+    """
+    Runs K algorithms on one input and renders them in tiled viewports.
+    Attributes:
+        names (list): The algorithms racing, in lane order.
+        values (list): The shared input array.
+        steps_per_second (float): Speed of the shared step clock.
+        fps (int): Frame rate of the window.
+        clock (int): Steps every unfinished lane has performed.
+        finish_order (list): Lanes in the order they finished; failed lanes are
+            not ranked.
+    Methods:
+        run(self):
+            Opens the window and runs the race until it is closed.
+    """
+
+    def __init__(self, names, values, steps_per_second=1000, fps=60):
+        self.names = list(names)
+        self.values = list(values)
+        self.steps_per_second = steps_per_second
+        self.fps = fps
+        self.max_value = max(self.values) if self.values else 1
+        self._context = multiprocessing.get_context()
+        self.lanes = []
+        self.clock = 0
+        self.finish_order = []
+        self.paused = False
+
+    def _start(self):
+        self._stop_lanes()
+        self.lanes = [Lane(name, self.values, self._context) for name in self.names]
+        self.clock = 0
+        self.finish_order = []
+        self._step_credit = 0.0  # Fractional steps carried between frames
+
+    def _stop_lanes(self):
+        for lane in self.lanes:
+            lane.stop()
+
+    def _tick(self):
+        """Move the shared clock by one frame's worth of steps, if every lane can."""
+        self._step_credit += self.steps_per_second / self.fps
+        wanted = int(self._step_credit)
+        target = self.clock + wanted
+        running = [lane for lane in self.lanes if lane.finished_at is None]
+        for lane in running:
+            lane.fill(target)
+        reachable = [lane.available for lane in running if not lane.exhausted]
+        clock = min([target] + reachable)
+        self._step_credit -= clock - self.clock
+        self._step_credit = min(self._step_credit, wanted)  # No bursts after a stall
+        self.clock = clock
+        for lane in running:
+            lane.advance_to(clock)
+            if lane.finished_at is not None and lane.error is None:
+                self.finish_order.append(lane)
+
+    def _layout(self, width, height):
+        """Tile rectangles for every lane below the header."""
+        count = len(self.lanes)
+        cols = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        tile_w = width // cols
+        tile_h = (height - HEADER_HEIGHT) // rows
+        return [
+            pygame.Rect(
+                (k % cols) * tile_w,
+                HEADER_HEIGHT + (k // cols) * tile_h,
+                tile_w,
+                tile_h,
+            )
+            for k in range(count)
+        ]
+
+    def _draw(self, screen, font):
+        screen.fill(PALETTE["bg"])
+        speed = f"{self.steps_per_second:,.0f} steps/s [+/-]"
+        state = "PAUSED [P]" if self.paused else "Running [P]"
+        header = (
+            f"Race: {len(self.lanes)} algorithms, n={len(self.values):,}   "
+            f"Clock: {self.clock:,} steps   Speed: {speed}   {state}   "
+            "Restart [R]   Quit [Q]"
+        )
+        screen.blit(font.render(header, True, TEXT_COLOR), (10, 12))
+        for lane, rect in zip(self.lanes, self._layout(*screen.get_size())):
+            self._draw_lane(screen, font, lane, rect)
+        pygame.display.flip()
+
+    def _draw_lane(self, screen, font, lane, rect):
+        pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        if lane.error is not None:
+            status = f"failed: {lane.error}"
+        elif lane.finished_at is not None:
+            place = self.finish_order.index(lane) + 1
+            status = f"#{place} finished in {lane.finished_at:,} steps"
+        else:
+            status = f"{lane.position:,} steps"
+        counters = lane.counters
+        label = (
+            f"{lane.name.replace('_', ' ').title()}  {status}  "
+            f"cmp {counters['compares']:,}  swp {counters['swaps']:,}  "
+            f"wr {counters['writes']:,}"
+        )
+        screen.blit(font.render(label, True, TEXT_COLOR), (rect.x + 8, rect.y + 4))
+        bars = pygame.Rect(
+            rect.x + 1,
+            rect.y + LANE_HEADER_HEIGHT,
+            rect.width - 2,
+            rect.height - LANE_HEADER_HEIGHT - 1,
+        )
+        if bars.width <= 0 or bars.height <= 0:
+            return
+        lane.renderer.configure(
+            bars.width, bars.height, len(lane.array), self.max_value
+        )
+        surface = screen.subsurface(bars)
+        values = np.asarray(lane.array)
+        if surface.get_bytesize() == 4:
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[...] = lane.renderer.rasterize(
+                values, lane.marks, surface.get_shifts()[:3]
+            )
+            del pixels  # Release the surface lock before flipping
+        else:
+            pygame.surfarray.blit_array(
+                surface, lane.renderer.rasterize(values, lane.marks)
+            )
+
+    def _handle_events(self):
+        """Returns False once the window should close."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_q, pygame.K_ESCAPE):
+                    return False
+                if event.key == pygame.K_p:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_r:
+                    self._start()
+                elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+                    self.steps_per_second = min(2**24, self.steps_per_second * 2)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.steps_per_second = max(1, self.steps_per_second / 2)
+        return True
+
+    def run(self):
+        if not pygame.get_init():
+            pygame.init()
+        screen = pygame.display.set_mode((1280, 720), pygame.RESIZABLE)
+        pygame.display.set_caption("Sorting Visualizer - Race")
+        font = pygame.font.SysFont("Consolas", 16)
+        self._start()
+        frame_interval = 1.0 / self.fps
+        next_frame_time = time.perf_counter()
+        try:
+            while self._handle_events():
+                if not self.paused:
+                    self._tick()
+                self._draw(screen, font)
+                next_frame_time += frame_interval
+                now = time.perf_counter()
+                if next_frame_time <= now:  # Fell behind: don't try to catch up
+                    next_frame_time = now + frame_interval
+                else:
+                    time.sleep(next_frame_time - now)
+        finally:
+            self._stop_lanes()
+        return self.finish_order
+
+
+def parse_args(argv=None):
+    algorithms = sorted(discover())
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=algorithms,
+        default=algorithms,
+        help="Algorithms to race (default: all).",
+    )
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument(
+        "--max-value", type=int, help="Largest element (default: --size)."
+    )
+    parser.add_argument("--shape", choices=list(INPUT_SHAPES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--speed", type=float, default=1000, help="Initial steps per second."
+    )
+    parser.add_argument("--fps", type=int, default=60)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    values = make_input(args.shape, args.size, args.max_value or args.size, args.seed)
+    race = Race(args.algorithms, values, args.speed, args.fps)
+    finish_order = race.run()
+    pygame.quit()
+    print(f"\nFinish order on {args.shape} input, n={args.size:,}:")
+    for place, lane in enumerate(finish_order, 1):
+        print(f"  {place}. {lane.name:<16} {lane.finished_at:>12,} steps")
+    for lane in race.lanes:
+        if lane.error is not None:
+            print(f"  -  {lane.name:<16} failed: {lane.error}")
+        elif lane.finished_at is None:
+            print(f"  -  {lane.name:<16} stopped at {lane.position:,} steps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import time
+from array import array
+from instrumented import InstrumentedView
+from steps import (
+    OP_COMPARE,
+    OP_SWAP,
+    OP_WRITE,
+    OP_SWEEP,
+    OP_PARTITION,
+    PROTOCOL_GENERATOR,
+    StepSink,
+    run_algorithm,
+)
+
+# Every record is four ints: (opcode, i, j, value), with -1/0 in unused slots.
+RECORD_WIDTH = 4
+
+
+class Recording:
+    """
+    Compact, array-backed storage for the steps of one algorithm run.
+    Records live in a single flat array('q') of (opcode, i, j, value) quadruples,
+    so a run of millions of steps costs 32 bytes per step instead of a Python
+    tuple and list per step.
+    Attributes:
+        initial_array (list): The array contents before the first step.
+        ops (array.array): Flat opcode/i/j/value storage.
+        record_seconds (float): Wall time spent running the algorithm.
+    Methods:
+        append(self, opcode, i, j, value):
+            Stores one step.
+        __len__(self):
+            Returns the number of recorded steps.
+        __iter__(self):
+            Yields (opcode, i, j, value) tuples in order.
+        nbytes(self):
+            Returns the memory used by the op storage.
+    """
+
+    def __init__(self, initial_array):
+        self.initial_array = list(initial_array)
+        self.ops = array("q")
+        self.record_seconds = 0.0
+
+    def append(self, opcode, i, j, value):
+        self.ops.extend((opcode, i, j, value))
+
+    def __len__(self):
+        return len(self.ops) // RECORD_WIDTH
+
+    def __iter__(self):
+        ops = self.ops
+        for k in range(0, len(ops), RECORD_WIDTH):
+            yield ops[k], ops[k + 1], ops[k + 2], ops[k + 3]
+
+    def nbytes(self):
+        return self.ops.itemsize * len(self.ops)
+
+
+class OpRecorder(StepSink):
+    """A step sink that appends every step to a Recording instead of drawing it."""
+
+    def __init__(self, recording):
+        self._append = recording.ops.extend
+
+    def compare(self, i, j):
+        self._append((OP_COMPARE, i, j, 0))
+
+    def swap(self, i, j):
+        self._append((OP_SWAP, i, j, 0))
+
+    def write(self, i, value):
+        self._append((OP_WRITE, i, -1, value))
+
+    def sweep(self, i):
+        self._append((OP_SWEEP, i, -1, 0))
+
+    def partition(self, lo, hi, lane):
+        self._append((OP_PARTITION, lo, hi, lane))
+
+
+def record_algorithm(sorting_algorithm, protocol, initial_array, counters=None):
+    """
+    Run the algorithm headless on a copy of the array and record every step.
+    With ``counters`` (an OpCounters), the copy is an InstrumentedView that
+    totals the run's element operations, and the recorded steps are counted,
+    as in a live run.
+    """
+    recording = Recording(initial_array)
+    working = list(initial_array)
+    if counters is not None:
+        working = InstrumentedView(working, counters)
+    start = time.perf_counter()
+    if protocol == PROTOCOL_GENERATOR:
+        extend = recording.ops.extend  # Steps are already flat records
+        for step in sorting_algorithm(working):
+            extend(step)
+    else:
+        run_algorithm(sorting_algorithm, protocol, working, OpRecorder(recording))
+    recording.record_seconds = time.perf_counter() - start
+    if counters is not None:
+        opcodes = recording.ops[::RECORD_WIDTH]
+        counters.swaps += opcodes.count(OP_SWAP)
+        counters.callbacks += len(opcodes) - opcodes.count(OP_PARTITION)
+    return recording
+
+
+def replay_ops(ops, sink, model):
+    """
+    Apply (opcode, i, j, value) steps to ``model`` and notify ``sink`` after
+    each one, matching what a live algorithm does.
+    """
+    for opcode, i, j, value in ops:
+        if opcode == OP_COMPARE:
+            sink.compare(i, j)
+        elif opcode == OP_SWAP:
+            model[i], model[j] = model[j], model[i]
+            sink.swap(i, j)
+        elif opcode == OP_WRITE:
+            model[i] = value
+            sink.write(i, value)
+        elif opcode == OP_SWEEP:
+            sink.sweep(i)
+        elif opcode == OP_PARTITION:
+            sink.partition(i, j, value)
+    return model
+
+
+def play_recording(recording, sink, model=None):
+    """
+    Replay recorded steps into a step sink such as Displayer. Each step is
+    applied to ``model`` (a fresh copy of the initial array by default) before
+    the sink is notified.
+    """
+    if model is None:
+        model = list(recording.initial_array)
+    return replay_ops(recording, sink, model)
@@ -0,0 +1,387 @@
+"""
+Run a sorting algorithm in a child process over shared memory.
+
+The array lives in a multiprocessing.shared_memory block. The child process
+sorts it in place, so a busy algorithm has a core of its own, while the
+Pygame process reads the same memory zero-copy for drawing and sound. After
+each step the child publishes a 4-int64 record (opcode, i, j, value) to a
+single-producer, single-consumer ring buffer in a second shared block:
+
+    header: head (written by the child), tail (written by the parent),
+            lead (written by the parent), state (written by the child)
+            reads, writes, comparisons, swaps, callbacks (written by the child)
+    records: RING_CAPACITY slots of RECORD_WIDTH int64s
+
+The child never runs more than ``lead`` steps ahead of the steps the display
+has consumed. The parent tunes ``lead`` to about LEAD_SECONDS of its own
+consumption rate, so the bars shown never run far ahead of the highlighted
+step, and doubles it whenever the display finds the ring empty, since a
+starved display's rate is capped by the lead itself. Pause, single step and
+stop travel to the child over a Pipe as control messages; an error in the
+child travels back the same way.
+"""
+
+import multiprocessing
+import signal
+import time
+from array import array
+from multiprocessing import shared_memory
+
+from discovery import load_algorithm
+from instrumented import OpCounters
+from producer import iter_steps
+from recorder import RECORD_WIDTH
+from storage import numpy_view, typecode_for
+
+RING_CAPACITY = 1 << 16  # Step records in the ring (2 MB)
+LEAD_SECONDS = 1 / 30  # How far the child may run ahead of the display
+PUBLISH_BATCH = 256  # Most steps the child buffers before publishing them
+STEP_WAIT_SECONDS = 0.05  # How long a single step while paused is waited for
+STOP_TIMEOUT_SECONDS = 1.0
+
+# Header slots
+HEAD = 0
+TAIL = 1
+LEAD = 2
+STATE = 3
+READS = 4  # Operation counters, written by the child with every batch
+WRITES = 5
+COMPARISONS = 6
+SWAPS = 7
+CALLBACKS = 8
+HEADER_SIZE = 9
+COUNTER_SLOTS = {
+    "reads": READS,
+    "writes": WRITES,
+    "comparisons": COMPARISONS,
+    "swaps": SWAPS,
+    "callbacks": CALLBACKS,
+}
+HEADER_BYTES = HEADER_SIZE * 8
+
+# Values of the STATE slot
+RUNNING = 0
+DONE = 1
+FAILED = 2
+
+# Control messages, checked by the child once per published batch
+PAUSE = "pause"
+RESUME = "resume"
+STEP = "step"
+STOP = "stop"
+
+
+def _ring_bytes(capacity):
+    return HEADER_BYTES + capacity * RECORD_WIDTH * 8
+
+
+class RunnerStopped(Exception):
+    """Raised inside the child process to unwind an algorithm that was stopped."""
+
+
+class _RingWriter:
+    """
+    The child's end of the ring: publishes batches of steps and obeys control
+    messages, which are checked once per batch. A batch never holds more steps
+    than the display lets the child run ahead, so with a small lead every step
+    is published on its own.
+    """
+
+    def __init__(self, ring, records, capacity, conn, counters):
+        self.ring = ring
+        self.records = records
+        self.capacity = capacity
+        self.conn = conn
+        self.counters = counters
+        self.head = 0
+        self.paused = False
+        self.single_step = False
+
+    def publish(self, batch):
+        """
+        Copy the flat (opcode, i, j, value) list ``batch`` into the ring, clear
+        it, and return how many ints the next batch may hold.
+        """
+        if batch:
+            count = len(batch) // RECORD_WIDTH
+            start = (self.head % self.capacity) * RECORD_WIDTH
+            first = min(len(batch), len(self.records) - start)  # Up to the wrap
+            self.records[start : start + first] = array("q", batch[:first])
+            if first < len(batch):
+                self.records[: len(batch) - first] = array("q", batch[first:])
+            # Publish only once the records are complete
+            counters = self.counters
+            ring = self.ring
+            ring[READS] = counters.reads
+            ring[WRITES] = counters.writes
+            ring[COMPARISONS] = counters.comparisons
+            ring[SWAPS] = counters.swaps
+            ring[CALLBACKS] = counters.callbacks
+            self.head = ring[HEAD] = self.head + count
+            batch.clear()
+        return self._wait_for_room() * RECORD_WIDTH
+
+    def _room(self):
+        ring = self.ring
+        return ring[TAIL] + min(ring[LEAD], self.capacity) - self.head
+
+    def _wait_for_room(self):
+        """Back off while the display is ``lead`` steps behind, watching for control."""
+        conn = self.conn
+        if conn.poll():
+            self._control(conn.recv())
+        delay = 0.00005
+        room = self._room()
+        while room <= 0:
+            if conn.poll(delay):
+                self._control(conn.recv())
+            delay = min(delay * 2, 0.001)
+            room = self._room()
+        if self.single_step:  # Publish this one step, then wait again
+            self.single_step = False
+            return 1
+        return min(room, PUBLISH_BATCH)
+
+    def _wait_while_paused(self):
+        while self.paused and not self.single_step:
+            self._control(self.conn.recv())
+
+    def _control(self, message):
+        if message == STOP:
+            raise RunnerStopped()
+        if message == PAUSE:
+            self.paused = True
+            self._wait_while_paused()
+        elif message == RESUME:
+            self.paused = False
+        elif message == STEP:
+            self.single_step = True
+
+
+def _child(name, array_name, typecode, n, ring_name, capacity, conn, count):
+    """Child process: sort the shared array and publish every step to the ring."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)  # Forked after SDL installed its own
+    array_shm = shared_memory.SharedMemory(name=array_name)
+    ring_shm = shared_memory.SharedMemory(name=ring_name)
+    data = array_shm.buf[: n * array(typecode).itemsize].cast(typecode)
+    ring = ring_shm.buf[:HEADER_BYTES].cast("q")
+    records = ring_shm.buf[HEADER_BYTES : _ring_bytes(capacity)].cast("q")
+    counters = OpCounters()
+    writer = _RingWriter(ring, records, capacity, conn, counters)
+    try:
+        batch = []
+        room = writer.publish(batch)
+        steps = iter_steps(*load_algorithm(name), data, counters if count else None)
+        for step in steps:
+            if step is None:  # A push-style algorithm has no step ready yet
+                continue
+            batch += step
+            if len(batch) >= room:
+                room = writer.publish(batch)
+        writer.publish(batch)
+        ring[STATE] = DONE
+    except RunnerStopped:
+        pass
+    except Exception as e:
+        ring[STATE] = FAILED
+        conn.send(f"{type(e).__name__}: {e}")
+    finally:
+        data.release()
+        ring.release()
+        records.release()
+        array_shm.close()
+        ring_shm.close()
+
+
+class SharedMemoryRunner:
+    """
+    Runs one algorithm in a child process on an array in shared memory, and
+    iterates over its steps from the ring buffer for Displayer.play().
+    The runner is an iterator of (opcode, i, j, value) tuples that have
+    already been applied to ``array``, yielding None while the child has no
+    step ready, like producer.iter_steps(). Closing it stops the child; the
+    shared memory stays mapped until release(), so the final state can still
+    be drawn and copied out.
+    Attributes:
+        name (str): The algorithm name, imported again in the child.
+        array (memoryview): The shared array, typed like the input buffer.
+            Bind it to the Displayer so frames read the child's writes directly.
+        lead (int): The number of steps the child may currently run ahead.
+        error (str): The child's error message, if it failed.
+        counters (OpCounters): The child's operation counts, refreshed from the
+            ring header about every LEAD_SECONDS while steps are consumed. They
+            stay zero when the runner was created with ``count=False``.
+    Methods:
+        __next__(self):
+            Returns the next step, None if none is ready, or raises StopIteration
+            once the child has finished and every step was consumed.
+        set_paused(self, paused):
+            Pauses or resumes the child; called by Displayer._set_paused().
+        close(self):
+            Stops the child process and waits for it.
+        release(self):
+            Unmaps and removes the shared memory blocks.
+    """
+
+    def __init__(self, name, values, capacity=RING_CAPACITY, count=True):
+        self.name = name
+        self.error = None
+        self.capacity = capacity
+        typecode = getattr(values, "typecode", None)
+        if typecode not in ("i", "q"):
+            typecode = typecode_for(max(values) if len(values) else 0)
+        n = len(values)
+        itemsize = array(typecode).itemsize
+        self._array_shm = shared_memory.SharedMemory(
+            create=True, size=max(1, n * itemsize)
+        )
+        self._ring_shm = shared_memory.SharedMemory(
+            create=True, size=_ring_bytes(capacity)
+        )
+        self.array = self._array_shm.buf[: n * itemsize].cast(typecode)
+        numpy_view(self.array)[:] = numpy_view(values)  # One block copy
+        self._ring = self._ring_shm.buf[:HEADER_BYTES].cast("q")
+        self._records = self._ring_shm.buf[HEADER_BYTES : _ring_bytes(capacity)].cast(
+            "q"
+        )
+        self._ring[HEAD] = self._ring[TAIL] = 0
+        self._ring[STATE] = RUNNING
+        self.lead = self._ring[LEAD] = 1  # Grows with the measured consumption rate
+        self._tail = 0
+        self.counters = OpCounters()
+        self._paused = False
+        self._rate_start = time.perf_counter()
+        self._rate_steps = 0
+        self._starved = False  # The display found the ring empty since the last update
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_child,
+            args=(
+                name,
+                self._array_shm.name,
+                typecode,
+                n,
+                self._ring_shm.name,
+                capacity,
+                child_conn,
+                count,
+            ),
+            name=f"sorting-{name}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        ring = self._ring
+        tail = self._tail
+        if tail == ring[HEAD]:
+            if self._paused and self._process.is_alive():
+                self._request_step()
+            if tail == ring[HEAD]:
+                return self._idle()
+        records = self._records
+        base = (tail % self.capacity) * RECORD_WIDTH
+        step = (records[base], records[base + 1], records[base + 2], records[base + 3])
+        self._tail = ring[TAIL] = tail + 1
+        self._rate_steps += 1
+        if self._rate_steps & 15 == 0:  # Checks the clock; cheap, but not free
+            self._update_lead()
+        return step
+
+    def _idle(self):
+        """No record is ready: finish, fail or report that the child is busy."""
+        state = self._ring[STATE]
+        # Re-check after reading the state: the child may just have published
+        if self._tail == self._ring[HEAD]:
+            if state == DONE:
+                self._read_counters()
+                raise StopIteration
+            if state == FAILED or not self._process.is_alive():
+                if self._ring[STATE] == DONE:
+                    return None  # Finished since the state was read; ends next call
+                if self._conn.poll(0.1):
+                    try:
+                        self.error = self._conn.recv()
+                    except EOFError:
+                        pass  # Exited without reporting an error
+                raise RuntimeError(
+                    f"Algorithm '{self.name}' failed in its process: "
+                    f"{self.error or 'exited unexpectedly'}"
+                )
+            if not self._paused:
+                # The measured rate is capped by the lead itself, so a display
+                # that ran out of steps grows the lead right away instead
+                self._starved = True
+                self.lead = self._ring[LEAD] = min(self.lead * 2, self.capacity)
+                self._read_counters()
+                return None
+        self._update_lead()
+        return None
+
+    def _update_lead(self):
+        """Let the child run LEAD_SECONDS of steps ahead at the current rate."""
+        now = time.perf_counter()
+        elapsed = now - self._rate_start
+        if elapsed < LEAD_SECONDS:
+            return
+        rate = self._rate_steps / elapsed
+        target = int(rate * LEAD_SECONDS)
+        if self._starved:
+            target = max(target, self.lead)  # Never shrink while steps ran out
+        # Doubling at most per update, so a stalled display recovers quickly
+        lead = max(1, min(target, self.lead * 2 + 1, self.capacity))
+        self.lead = self._ring[LEAD] = lead
+        self._starved = False
+        self._rate_start = now
+        self._rate_steps = 0
+        self._read_counters()
+
+    def _read_counters(self):
+        ring = self._ring
+        for name, slot in COUNTER_SLOTS.items():
+            setattr(self.counters, name, ring[slot])
+
+    def _request_step(self):
+        """While paused, let the child publish exactly one more step and wait for it."""
+        self._send(STEP)
+        deadline = time.perf_counter() + STEP_WAIT_SECONDS
+        while self._tail == self._ring[HEAD] and time.perf_counter() < deadline:
+            if self._ring[STATE] != RUNNING:
+                break
+            time.sleep(0.0005)
+
+    def _send(self, message):
+        try:
+            self._conn.send(message)
+        except (BrokenPipeError, OSError):
+            pass  # The child has already exited
+
+    def set_paused(self, paused):
+        if paused != self._paused:
+            self._paused = paused
+            self._send(PAUSE if paused else RESUME)
+            self._rate_start = time.perf_counter()
+            self._rate_steps = 0
+
+    def close(self):
+        if self._process.is_alive():
+            self._send(STOP)
+            self._process.join(STOP_TIMEOUT_SECONDS)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+
+    def release(self):
+        """Unmap and unlink the shared blocks. ``array`` is invalid afterwards."""
+        self.close()
+        self.array.release()
+        self._ring.release()
+        self._records.release()
+        for shm in (self._array_shm, self._ring_shm):
+            shm.close()
+            shm.unlink()
@@ -1,51 +1,165 @@
 import numpy as np
 import pygame
 import math
+import os
+from collections import OrderedDict, deque
 
 SAMPLE_RATE = 44100
 SOUND_DURATION_MS = 30
 MIN_FREQ = 100
 MAX_FREQ = 1200
 VOLUME = 0.1
+PITCH_BUCKETS = 256  # Distinct pitches; values are quantized onto these
+SOUND_MEMORY_LIMIT = 4 * 1024 * 1024  # Bytes of pygame Sounds kept alive at once
+MAX_EVENTS_PER_BLOCK = 4096  # Pitch events mixed into one block; older ones are dropped
+PITCH_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".pitch_cache"
+)
 
 
-def generate_sine_wave(freq, duration_samples, sample_rate):
-    """Generates a single sine wave cycle."""
+def generate_sine_waves(freqs, duration_samples, sample_rate):
+    """Generates one faded sine wave per frequency as a (len(freqs), samples) batch."""
     t = np.linspace(0, duration_samples / sample_rate, duration_samples, endpoint=False)
-    wave = np.sin(2 * np.pi * freq * t)
+    waves = np.sin(2 * np.pi * np.asarray(freqs, dtype=np.float64)[:, np.newaxis] * t)
     fade_len = int(0.1 * duration_samples)
     if fade_len > 0:
         fade_curve = np.linspace(1.0, 0.0, fade_len)
-        wave[-fade_len:] *= fade_curve
-    return (wave * 32767 * VOLUME).astype(np.int16)
+        waves[:, -fade_len:] *= fade_curve
+    return (waves * 32767 * VOLUME).astype(np.int16)
+
+
+def generate_sine_wave(freq, duration_samples, sample_rate):
+    """Generates a single sine wave cycle."""
+    return generate_sine_waves([freq], duration_samples, sample_rate)[0]
+
+
+class PitchBank:
+    """
+    A fixed set of quantized pitches, synthesized up front in one NumPy batch.
+    Values are mapped onto ``buckets`` log-spaced frequencies between MIN_FREQ
+    and MAX_FREQ, so the bank size does not depend on the value range. The PCM
+    for every bucket is generated at construction (or loaded from an optional
+    on-disk .npy cache). pygame Sound objects are created from it and kept in
+    an LRU cache with a hard byte limit.
+    Attributes:
+        buckets (int): The number of distinct pitches.
+        frequencies (numpy.ndarray): The frequency of each bucket in Hz.
+        waves (numpy.ndarray): (buckets, samples) int16 mono PCM.
+        float_waves (numpy.ndarray): The same PCM as float32, used for mixing.
+        memory_limit (int): Maximum bytes of Sound objects kept in the cache.
+        cache_path (str): The .npy file the PCM is cached in, or None.
+    Methods:
+        bucket_of(self, value, max_value):
+            Maps a value to the index of its pitch bucket.
+        sound(self, bucket):
+            Returns the pygame Sound for a bucket, creating it if needed.
+    """
+
+    def __init__(
+        self, buckets=PITCH_BUCKETS, memory_limit=SOUND_MEMORY_LIMIT, cache_dir=None
+    ):
+        self.buckets = max(1, int(buckets))
+        self.memory_limit = memory_limit
+        self.frequencies = np.exp(
+            np.linspace(math.log(MIN_FREQ), math.log(MAX_FREQ), self.buckets)
+        )
+        self.cache_path = None
+        if cache_dir:
+            self.cache_path = os.path.join(
+                cache_dir,
+                f"pitch_bank_{self.buckets}_{SAMPLE_RATE}_{SOUND_DURATION_MS}"
+                f"_{MIN_FREQ}_{MAX_FREQ}_{VOLUME}.npy",
+            )
+        self.waves = self._load_or_synthesize()
+        self.float_waves = self.waves.astype(np.float32)
+        self._sound_bytes = self.waves.shape[1] * 2 * 2  # Stereo int16
+        self._sounds = OrderedDict()  # bucket -> Sound, least recently used first
+
+    def _load_or_synthesize(self):
+        duration_samples = int(SAMPLE_RATE * SOUND_DURATION_MS / 1000)
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                waves = np.load(self.cache_path)
+                if waves.shape == (self.buckets, duration_samples):
+                    return waves
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable pitch cache ({e}).")
+        waves = generate_sine_waves(self.frequencies, duration_samples, SAMPLE_RATE)
+        if self.cache_path:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                np.save(self.cache_path, waves)
+            except OSError as e:
+                print(f"Warning: Could not write pitch cache ({e}).")
+        return waves
+
+    def bucket_of(self, value, max_value):
+        if max_value == 0:
+            return 0
+        norm_val = max(0, min(1, value / max_value))
+        return int(norm_val * (self.buckets - 1) + 0.5)
+
+    def sound(self, bucket):
+        sound = self._sounds.get(bucket)
+        if sound is not None:
+            self._sounds.move_to_end(bucket)
+            return sound
+        while self._sounds and (len(self._sounds) + 1) * self._sound_bytes > (
+            self.memory_limit
+        ):
+            self._sounds.popitem(last=False)  # Evict the least recently used
+        stereo_wave = np.repeat(self.waves[bucket][:, np.newaxis], 2, axis=1)
+        sound = pygame.sndarray.make_sound(stereo_wave)
+        self._sounds[bucket] = sound
+        return sound
+
+    def prewarm(self):
+        """Create Sounds for as many buckets as the memory limit allows."""
+        capacity = max(1, self.memory_limit // self._sound_bytes)
+        for bucket in range(min(self.buckets, capacity)):
+            self.sound(bucket)
 
 
 class SoundManager:
     """
     Manages the generation and playback of sounds for visualizing sorting algorithms.
-    The SoundManager initializes the Pygame mixer and creates a cache of sounds
-    corresponding to different values. It generates sine wave sounds with frequencies
-    mapped to the input values, allowing for audio feedback during sorting.
+    The SoundManager initializes the Pygame mixer and a PitchBank of sine wave
+    sounds. Values are mapped onto the bank's quantized frequencies, allowing
+    for audio feedback during sorting with a fixed startup and memory cost.
+    Playback is streamed: pitch events are collected with note() and mixed into
+    a single PCM block per frame by flush(), which queues it on one reserved
+    channel. The cost of audio is therefore per frame rather than per step,
+    and many overlapping steps never run out of mixer channels.
     Attributes:
         max_value (int): The maximum value expected in the data to be sorted.
             Used to normalize the frequency of the generated sounds.
-        _sound_cache (dict): A dictionary to cache generated sounds,
-            where keys are integer representations of values and values are
-            Pygame Sound objects.
+        pitch_bank (PitchBank): The pre-synthesized, memory-bounded sounds.
+        channel (pygame.mixer.Channel): The reserved channel blocks are queued on,
+            or None if the mixer is unavailable.
     Methods:
-        __init__(self, max_value):
+        __init__(self, max_value, pitch_buckets=PITCH_BUCKETS, memory_limit=SOUND_MEMORY_LIMIT, cache_dir=None):
             Initializes the SoundManager, sets up the Pygame mixer if not already
-            initialized, and prepares the sound cache.
+            initialized, and synthesizes the pitch bank.
         _get_sound(self, value):
-            Retrieves a sound from the cache or generates a new one if it doesn't exist.
+            Retrieves the sound of the pitch bucket the value maps to.
             The frequency of the sound is determined by mapping the input value to a
             frequency range between MIN_FREQ and MAX_FREQ.
+        note(self, value):
+            Adds the pitch of a value to the block being collected for this frame.
+        flush(self):
+            Mixes the collected pitches into one block and queues it for playback.
         play_sound(self, value):
-            Plays the sound corresponding to the given value using a Pygame channel.
+            Plays the sound corresponding to the given value right away.
             If the Pygame mixer is not initialized, this method does nothing.
     """
 
-    def __init__(self, max_value):
+    def __init__(
+        self,
+        max_value,
+        pitch_buckets=PITCH_BUCKETS,
+        memory_limit=SOUND_MEMORY_LIMIT,
+        cache_dir=None,
+    ):
         if not pygame.mixer.get_init():
             try:
                 pygame.mixer.init(
@@ -55,35 +169,63 @@ class SoundManager:
             except pygame.error as e:
                 print(f"Warning: Failed to initialize Pygame Mixer: {e}")
         self.max_value = max_value
-        self._sound_cache = {}
+        self.pitch_bank = PitchBank(pitch_buckets, memory_limit, cache_dir)
+        self.channel = None
+        # Pitch buckets noted since the last flush; only the newest are kept,
+        # so the block sounds like the steps the frame shows
+        self._pending = deque(maxlen=MAX_EVENTS_PER_BLOCK)
+        if pygame.mixer.get_init():
+            try:
+                pygame.mixer.set_reserved(1)  # Keep channel 0 for the stream
+                self.channel = pygame.mixer.Channel(0)
+                self.pitch_bank.prewarm()  # Avoid Sound creation mid-animation
+            except pygame.error as e:
+                print(f"Warning: Failed to create sounds: {e}")
 
     def _get_sound(self, value):
-        value_key = int(value)
-        if value_key not in self._sound_cache:
-            if self.max_value == 0:
-                freq = MIN_FREQ
-            else:
-                norm_val = max(0, min(1, value / self.max_value))
-                log_freq = math.log(MIN_FREQ) + norm_val * (
-                    math.log(MAX_FREQ) - math.log(MIN_FREQ)
-                )
-                freq = math.exp(log_freq)
-            duration_samples = int(SAMPLE_RATE * SOUND_DURATION_MS / 1000)
-            wave_data = generate_sine_wave(freq, duration_samples, SAMPLE_RATE)
-            stereo_wave = np.repeat(wave_data[:, np.newaxis], 2, axis=1)
-            sound = pygame.sndarray.make_sound(stereo_wave)
-            self._sound_cache[value_key] = sound
-        return self._sound_cache[value_key]
+        return self.pitch_bank.sound(self.pitch_bank.bucket_of(value, self.max_value))
 
-    def play_sound(self, value):
-        if not pygame.mixer.get_init():
+    def note(self, value):
+        self._pending.append(self.pitch_bank.bucket_of(value, self.max_value))
+
+    def _mix(self, buckets):
+        """Mix a batch of pitch buckets into one stereo int16 Sound."""
+        bank = self.pitch_bank
+        if len(set(buckets)) == 1:
+            return bank.sound(buckets[0])  # A lone pitch is already in the bank
+        counts = np.bincount(np.fromiter(buckets, np.intp), minlength=bank.buckets)
+        active = np.flatnonzero(counts)
+        weights = counts[active].astype(np.float32)
+        block = weights @ bank.float_waves[active]
+        # Distinct pitches add up as sqrt(n), but repeats of one pitch add up
+        # coherently: the root of the summed squared counts covers both and
+        # keeps the loudness of one tone
+        block *= 1.0 / math.sqrt(float(weights @ weights))
+        np.clip(block, -32768, 32767, out=block)
+        stereo = np.repeat(block.astype(np.int16)[:, np.newaxis], 2, axis=1)
+        return pygame.sndarray.make_sound(stereo)
+
+    def flush(self):
+        if not self._pending:
+            return
+        buckets = self._pending
+        self._pending = deque(maxlen=MAX_EVENTS_PER_BLOCK)
+        channel = self.channel
+        if channel is None or not pygame.mixer.get_init():
             return
         try:
-            sound = self._get_sound(value)
-            channel = pygame.mixer.find_channel(True)
-            if channel:
+            sound = self._mix(buckets)
+            if channel.get_busy():
+                channel.queue(sound)  # Replaces any block still waiting
+            else:
                 channel.play(sound)
         except pygame.error as e:
-            print(f"Pygame mixer error playing sound for value {value}: {e}")
+            print(f"Pygame mixer error playing sound block: {e}")
         except Exception as e:
-            print(f"Error generating/playing sound for value {value}: {e}")
+            print(f"Error mixing/playing sound block: {e}")
+
+    def play_sound(self, value):
+        if not pygame.mixer.get_init():
+            return
+        self.note(value)
+        self.flush()
@@ -0,0 +1,194 @@
+"""
+Step event protocol between sorting algorithms and whatever consumes their steps.
+
+The built-in algorithms are generators: ``name(array)`` sorts ``array`` in
+place and yields one ``(opcode, i, j, value)`` tuple after each step, with -1
+or 0 in the unused slots:
+
+    yield OP_COMPARE, i, j, 0   # array[i] is compared with array[j] (j is the probe)
+    yield OP_SWAP, i, j, 0      # array[i] and array[j] have just been exchanged
+    yield OP_WRITE, i, -1, v    # array[i] has just been set to v
+    yield OP_SWEEP, i, -1, 0    # the final sweep reached index i
+
+Algorithms that model several workers, such as the parallel sorts, also
+announce which worker owns which indices. The Displayer tints each lane's
+range in its own color. Consumers that only replay the array ignore this
+opcode, since nothing in the array changes:
+
+    yield OP_PARTITION, lo, hi, lane  # array[lo:hi] now belongs to lane (-1: none)
+
+The consumer pulls steps at its own pace, so pausing costs nothing, a single
+step can be advanced at a time, and a restart simply drops the generator.
+Generator functions are detected automatically.
+
+Push-style modules are still supported. One that sets ``STEP_PROTOCOL = True``
+is called as ``name(array, steps)``. It mutates ``array`` in place and
+reports each step through fixed-arity methods on ``steps``, which never
+receive the array itself. Consumers such as Displayer hold a reference to the
+same buffer and only apply the deltas:
+
+    steps.compare(i, j)  # array[i] is compared with array[j] (j is the probe)
+    steps.swap(i, j)     # array[i] and array[j] have just been exchanged
+    steps.write(i, v)    # array[i] has just been set to v
+    steps.sweep(i)       # the final sweep reached index i
+
+Modules without the flag keep the original ``name(array, update_callback)``
+contract. LegacyCallbackAdapter turns their callbacks into the same steps,
+and producer.iter_steps runs either push style on a worker thread so it can
+be pulled like a generator.
+"""
+
+import inspect
+
+from instrumented import InstrumentedArray
+from storage import snapshot
+
+OP_COMPARE = 0
+OP_SWAP = 1
+OP_WRITE = 2
+OP_SWEEP = 3
+OP_PARTITION = 4
+
+PROTOCOL_GENERATOR = "generator"
+PROTOCOL_STEPS = "steps"
+PROTOCOL_CALLBACK = "callback"
+
+
+class StepSink:
+    """Base step consumer; every step is a no-op unless overridden."""
+
+    def compare(self, i, j):
+        pass
+
+    def swap(self, i, j):
+        pass
+
+    def write(self, i, value):
+        pass
+
+    def sweep(self, i):
+        pass
+
+    def partition(self, lo, hi, lane):
+        pass
+
+
+def _raw(array):
+    """The uncounted storage behind an InstrumentedArray, or ``array`` itself."""
+    return array.data if isinstance(array, InstrumentedArray) else array
+
+
+class LegacyCallbackAdapter:
+    """
+    An update_callback that converts legacy callback calls into step events.
+    Each call is diffed against a shadow copy of the array. The highlighted and
+    moving indices are checked first, and a whole-list comparison catches any
+    write the algorithm did not highlight. Two exchanged values become a swap,
+    other changes become writes, and a call without changes becomes a compare.
+    An InstrumentedArray is diffed through its raw data, so the adapter's own
+    reads are not counted as the algorithm's.
+    """
+
+    def __init__(self, sink, array):
+        self.sink = sink
+        # Same type as the array, so the whole-array check is one C-level compare
+        self._shadow = snapshot(_raw(array))
+
+    def _changed_indices(self, array, candidates):
+        shadow = self._shadow
+        changed = []
+        for i in candidates:
+            if i is not None and 0 <= i < len(shadow) and shadow[i] != array[i]:
+                shadow[i] = array[i]
+                changed.append(i)
+        if shadow != array:  # Something changed outside the highlighted indices
+            for i, (old, new) in enumerate(zip(shadow, array)):
+                if old != new:
+                    shadow[i] = new
+                    changed.append(i)
+        return changed
+
+    def __call__(
+        self, array, highlight_indices=[], moving_index=None, end=False, sweep=False
+    ):
+        sink = self.sink
+        array = _raw(array)
+        changed = self._changed_indices(array, (*highlight_indices, moving_index))
+        if sweep:
+            if moving_index is not None:
+                sink.sweep(moving_index)
+            return
+        if len(changed) == 2:
+            a, b = changed
+            if b != moving_index:
+                a, b = b, a
+            sink.swap(a, b)
+            return
+        if changed:
+            # Report the moving index last so it is the newest step
+            changed.sort(key=lambda i: i == moving_index)
+            for i in changed:
+                sink.write(i, array[i])
+            return
+        others = [i for i in highlight_indices if i != moving_index]
+        if moving_index is not None:
+            sink.compare(others[0] if others else moving_index, moving_index)
+        elif len(others) > 1:
+            sink.compare(others[0], others[1])
+        elif others:
+            sink.compare(others[0], others[0])
+
+
+def module_protocol(module):
+    """Return which calling convention an algorithm module implements."""
+    func = getattr(module, module.__name__, None)
+    if inspect.isgeneratorfunction(func):
+        return PROTOCOL_GENERATOR
+    return (
+        PROTOCOL_STEPS if getattr(module, "STEP_PROTOCOL", False) else PROTOCOL_CALLBACK
+    )
+
+
+def dispatch_steps(step_iter, sink):
+    """Forward (opcode, i, j, value) tuples to the matching sink methods."""
+    compare, swap, write, sweep = sink.compare, sink.swap, sink.write, sink.sweep
+    for opcode, i, j, value in step_iter:
+        if opcode == OP_COMPARE:
+            compare(i, j)
+        elif opcode == OP_SWAP:
+            swap(i, j)
+        elif opcode == OP_WRITE:
+            write(i, value)
+        elif opcode == OP_SWEEP:
+            sweep(i)
+        elif opcode == OP_PARTITION:
+            sink.partition(i, j, value)
+
+
+def count_steps(step_iter, counters):
+    """
+    Yield the steps of ``step_iter`` unchanged while totalling them into
+    ``counters`` (an OpCounters): every step event except partition markers,
+    and every OP_SWAP as a swap.
+    """
+    try:
+        for step in step_iter:
+            if step is not None and step[0] != OP_PARTITION:
+                counters.callbacks += 1
+                if step[0] == OP_SWAP:
+                    counters.swaps += 1
+            yield step
+    finally:
+        close = getattr(step_iter, "close", None)
+        if close is not None:
+            close()  # Stops a push-style producer's worker as well
+
+
+def run_algorithm(func, protocol, array, sink):
+    """Run an algorithm of any protocol to completion against a step sink."""
+    if protocol == PROTOCOL_GENERATOR:
+        dispatch_steps(func(array), sink)
+    elif protocol == PROTOCOL_STEPS:
+        func(array, sink)
+    else:
+        func(array, LegacyCallbackAdapter(sink, array))
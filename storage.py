@@ -0,0 +1,54 @@
+"""
+Compact storage for the array being sorted.
+
+The working data of a run is one contiguous array.array instead of a list of
+boxed ints: 4 bytes per element for values that fit in 32 bits, 8 otherwise.
+Algorithms index and mutate it like a list, and numpy_view() maps the same
+memory into NumPy without copying, so the renderer always sees the current
+state. Copies are made only as snapshots for restart and reset.
+"""
+
+from array import array
+
+import numpy as np
+
+TYPECODES = {"i": np.int32, "q": np.int64}
+
+
+def typecode_for(max_value):
+    """The smallest array typecode that holds every value up to max_value."""
+    return "i" if max_value < 2**31 else "q"
+
+
+def typed_buffer(values, typecode=None):
+    """
+    Copy ``values`` (a list, array.array or NumPy array) into a new typed
+    buffer. NumPy input is copied in one block, without a temporary list.
+    """
+    if typecode is None:
+        typecode = typecode_for(max(values) if len(values) else 0)
+    if isinstance(values, np.ndarray):
+        buffer = array(typecode, [0]) * len(values)
+        numpy_view(buffer)[:] = values
+        return buffer
+    return array(typecode, values)
+
+
+def numpy_view(buffer):
+    """A NumPy array sharing ``buffer``'s memory; lists are converted instead."""
+    if isinstance(buffer, array) and buffer.typecode in TYPECODES:
+        return np.frombuffer(buffer, dtype=TYPECODES[buffer.typecode])
+    return np.asarray(buffer)
+
+
+def snapshot(buffer):
+    """A copy of the same type, for restoring the buffer on restart or reset."""
+    if isinstance(buffer, memoryview):  # Slicing would share the memory
+        return array(buffer.format, buffer.tobytes())
+    return buffer[:]
+
+
+def nbytes(buffer):
+    if isinstance(buffer, array):
+        return buffer.itemsize * len(buffer)
+    return numpy_view(buffer).nbytes
@@ -0,0 +1,29 @@
+from discovery import discover, load_algorithm
+from instrumented import InstrumentedView
+from steps import StepSink, run_algorithm
+from storage import typed_buffer
+
+INPUTS = {
+    "empty": [],
+    "one": [7],
+    "duplicates": [5, 1, 5, 3, 1, 5, 3, 3, 1, 5] * 7,
+    "reversed": list(range(100, 0, -1)),
+}
+
+
+def containers(values):
+    """The array types the application sorts: a list, a typed buffer and a counted view."""
+    yield "list", list(values)
+    yield "typed", typed_buffer(values, "i")
+    yield "view", InstrumentedView(typed_buffer(values, "i"))
+
+
+def test_every_algorithm_sorts_every_container():
+    algorithms = discover(manifest_path=None)
+    assert algorithms
+    for name in algorithms:
+        func, protocol = load_algorithm(name)
+        for shape, values in INPUTS.items():
+            for kind, array in containers(values):
+                run_algorithm(func, protocol, array, StepSink())
+                assert list(array) == sorted(values), (name, shape, kind)
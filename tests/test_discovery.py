@@ -0,0 +1,74 @@
+import json
+import os
+
+from discovery import DEFAULT_METADATA, discover, read_metadata
+
+DECLARED = """
+METADATA = {"avg": "O(n log n)", "best": "O(n)", "rank": 2, "stable": True, "in_place": False}
+
+raise RuntimeError("discovery must not run the module")
+
+
+def declared(array):
+    yield from ()
+"""
+
+
+def write_module(directory, name, source):
+    path = os.path.join(directory, f"{name}.py")
+    with open(path, "w") as f:
+        f.write(source)
+    return path
+
+
+def test_read_metadata_parses_without_running_the_module(tmp_path):
+    path = write_module(tmp_path, "declared", DECLARED)
+    assert read_metadata(path) == {
+        "function": True,
+        "metadata": {
+            "avg": "O(n log n)",
+            "best": "O(n)",
+            "rank": 2,
+            "stable": True,
+            "in_place": False,
+        },
+    }
+
+
+def test_discover_fills_defaults_and_skips_modules_without_their_function(
+    tmp_path, capsys
+):
+    write_module(tmp_path, "declared", DECLARED)
+    write_module(tmp_path, "undeclared", "def undeclared(array):\n    pass\n")
+    write_module(tmp_path, "misnamed", "def other(array):\n    pass\n")
+    write_module(tmp_path, "__init__", "")
+    algorithms = discover(str(tmp_path), manifest_path=None)
+    assert sorted(algorithms) == ["declared", "undeclared"]
+    assert algorithms["declared"]["rank"] == 2
+    assert algorithms["undeclared"] == DEFAULT_METADATA
+    output = capsys.readouterr().out
+    assert "Could not find function 'misnamed'" in output
+    assert "Complexity data missing for 'undeclared'" in output
+
+
+def test_manifest_is_reused_until_a_module_changes(tmp_path):
+    algo_dir = tmp_path / "algorithms"
+    algo_dir.mkdir()
+    manifest = str(tmp_path / "manifest.json")
+    path = write_module(algo_dir, "declared", DECLARED)
+    assert discover(str(algo_dir), manifest)["declared"]["rank"] == 2
+
+    # A fresh manifest entry is trusted without parsing the module again
+    with open(manifest) as f:
+        cached = json.load(f)
+    cached["modules"]["declared"]["metadata"]["rank"] = 5
+    with open(manifest, "w") as f:
+        json.dump(cached, f)
+    assert discover(str(algo_dir), manifest)["declared"]["rank"] == 5
+
+    # A changed module is parsed again and the manifest rewritten
+    write_module(algo_dir, "declared", DECLARED.replace('"rank": 2', '"rank": 3'))
+    os.utime(path, ns=(0, 0))
+    assert discover(str(algo_dir), manifest)["declared"]["rank"] == 3
+    with open(manifest) as f:
+        assert json.load(f)["modules"]["declared"]["metadata"]["rank"] == 3
@@ -0,0 +1,23 @@
+import numpy as np
+
+from input_generators import INPUT_SHAPES, generate, median_of_3_killer_ranks
+
+
+def test_median_of_3_killer_ranks_is_a_permutation():
+    for size in range(2, 65):
+        ranks = median_of_3_killer_ranks(size)
+        assert sorted(ranks.tolist()) == list(range(size)), size
+
+
+def test_nearly_sorted_is_a_permutation_of_the_sorted_input():
+    rng = np.random.default_rng(7)
+    for size in (2, 3, 10, 1000):
+        values = rng.integers(1, size + 1, size)
+        for swaps in (None, 1, size // 2, size):
+            shaped = INPUT_SHAPES["nearly_sorted"](rng, values.copy(), swaps)
+            assert np.array_equal(np.sort(shaped), np.sort(values)), (size, swaps)
+
+
+def test_nearly_sorted_unique_values_stay_distinct():
+    values = generate("nearly_sorted", 1000, 1000, seed=0, unique=True)
+    assert len(np.unique(values)) == 1000
@@ -0,0 +1,66 @@
+from discovery import load_algorithm
+from instrumented import InstrumentedArray, InstrumentedView, OpCounters
+from producer import iter_steps
+from recorder import record_algorithm
+from steps import OP_COMPARE, OP_PARTITION, OP_SWAP, OP_WRITE, count_steps
+from storage import typed_buffer
+
+
+def test_instrumented_array_counts_reads_writes_and_comparisons():
+    array = InstrumentedArray([3, 1, 2])
+    first, second = array[0], array[1]
+    assert second < first
+    array[0], array[1] = second, first
+    buffer = [array[2]]
+    assert not buffer[0] >= array[1]  # Counted on values away from the array too
+    assert first + second == 4  # Arithmetic yields plain ints and is not counted
+    assert array.tolist() == [1, 3, 2]
+    assert array.counters.as_dict() == {
+        "reads": 4,
+        "writes": 2,
+        "comparisons": 2,
+        "swaps": 0,
+        "callbacks": 0,
+    }
+
+
+def test_instrumented_view_counts_and_writes_through():
+    buffer = typed_buffer([5, 4], "i")
+    view = InstrumentedView(buffer)
+    if view[1] < view[0]:
+        view[0], view[1] = view[1], view[0]
+    assert list(buffer) == [4, 5]
+    assert (view.counters.reads, view.counters.writes) == (4, 2)
+    assert view.counters.comparisons == 1
+
+
+def test_count_steps_counts_swaps_only_from_swap_steps():
+    steps = [
+        (OP_COMPARE, 0, 1, 0),
+        (OP_WRITE, 0, -1, 2),
+        (OP_WRITE, 1, -1, 1),
+        (OP_SWAP, 2, 3, 0),
+        (OP_PARTITION, 0, 4, 1),
+        None,
+    ]
+    counters = OpCounters()
+    assert list(count_steps(iter(steps), counters)) == steps
+    assert (counters.swaps, counters.callbacks) == (1, 4)
+
+
+def test_live_and_recorded_runs_count_the_same():
+    values = [9, 3, 7, 1, 8, 2, 6, 4, 5]
+    for name in ("insertion_sort", "quick_sort"):
+        func, protocol = load_algorithm(name)
+        live = OpCounters()
+        array = list(values)
+        for _ in iter_steps(func, protocol, array, live):
+            pass
+        assert array == sorted(values), name
+        recorded = OpCounters()
+        record_algorithm(func, protocol, values, recorded)
+        assert live.as_dict() == recorded.as_dict(), name
+        if name == "insertion_sort":
+            assert live.swaps == 0  # Shifts are writes, not swaps
+        else:
+            assert live.swaps > 0
@@ -0,0 +1,57 @@
+import random
+
+from discovery import discover, load_algorithm
+from recorder import Recording, play_recording, record_algorithm, replay_ops
+from steps import OP_COMPARE, OP_PARTITION, OP_SWAP, OP_SWEEP, OP_WRITE, StepSink
+
+
+class ListSink(StepSink):
+    """Collects every step it is sent as an (opcode, i, j, value) tuple."""
+
+    def __init__(self):
+        self.steps = []
+
+    def compare(self, i, j):
+        self.steps.append((OP_COMPARE, i, j, 0))
+
+    def swap(self, i, j):
+        self.steps.append((OP_SWAP, i, j, 0))
+
+    def write(self, i, value):
+        self.steps.append((OP_WRITE, i, -1, value))
+
+    def sweep(self, i):
+        self.steps.append((OP_SWEEP, i, -1, 0))
+
+    def partition(self, lo, hi, lane):
+        self.steps.append((OP_PARTITION, lo, hi, lane))
+
+
+def test_recording_round_trips_its_steps():
+    steps = [
+        (OP_COMPARE, 0, 1, 0),
+        (OP_SWAP, 0, 1, 0),
+        (OP_PARTITION, 0, 3, 1),
+        (OP_WRITE, 2, -1, 9),
+        (OP_SWEEP, 0, -1, 0),
+    ]
+    recording = Recording([3, 1, 2])
+    for step in steps:
+        recording.append(*step)
+    assert len(recording) == len(steps)
+    assert list(recording) == steps
+    sink = ListSink()
+    assert replay_ops(recording, sink, [3, 1, 2]) == [1, 3, 9]
+    assert sink.steps == steps
+
+
+def test_replaying_a_recorded_run_sorts_the_initial_array():
+    rng = random.Random(4)
+    values = [rng.randint(1, 40) for _ in range(200)]
+    for name in discover(manifest_path=None):
+        func, protocol = load_algorithm(name)
+        recording = record_algorithm(func, protocol, values)
+        assert recording.initial_array == values, name
+        sink = ListSink()
+        assert play_recording(recording, sink) == sorted(values), name
+        assert sink.steps == list(recording), name
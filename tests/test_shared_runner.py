@@ -0,0 +1,37 @@
+import random
+
+from shared_runner import SharedMemoryRunner
+from storage import typed_buffer
+
+
+def run_to_end(runner):
+    """Consume every step, as Displayer.play() would; returns the step count."""
+    steps = 0
+    for step in runner:
+        if step is not None:
+            steps += 1
+    return steps
+
+
+def test_runner_sorts_the_shared_array():
+    rng = random.Random(9)
+    values = [rng.randint(1, 1000) for _ in range(500)]
+    for name in ("merge_sort", "quick_sort"):
+        runner = SharedMemoryRunner(name, typed_buffer(values), capacity=64)
+        try:
+            steps = run_to_end(runner)
+            assert list(runner.array) == sorted(values), name
+            assert steps == runner.counters.callbacks, name
+            assert runner.counters.comparisons > 0, name
+        finally:
+            runner.release()
+
+
+def test_runner_without_counters_and_with_an_empty_array():
+    runner = SharedMemoryRunner("insertion_sort", typed_buffer([]), count=False)
+    try:
+        assert run_to_end(runner) == 0
+        assert list(runner.array) == []
+        assert runner.counters.comparisons == 0
+    finally:
+        runner.release()
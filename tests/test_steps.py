@@ -0,0 +1,65 @@
+from instrumented import InstrumentedArray
+from recorder import OpRecorder, Recording
+from steps import OP_COMPARE, OP_SWAP, OP_SWEEP, OP_WRITE, LegacyCallbackAdapter
+
+
+def adapter_for(array):
+    recording = Recording(array)
+    return LegacyCallbackAdapter(OpRecorder(recording), array), recording
+
+
+def test_unchanged_calls_become_compares():
+    array = [4, 2, 7, 1]
+    callback, recording = adapter_for(array)
+    callback(array, [0, 1])
+    callback(array, [2], moving_index=3)
+    callback(array, [], moving_index=1)
+    assert list(recording) == [
+        (OP_COMPARE, 0, 1, 0),
+        (OP_COMPARE, 2, 3, 0),
+        (OP_COMPARE, 1, 1, 0),
+    ]
+
+
+def test_exchanged_values_become_a_swap_towards_the_moving_index():
+    array = [4, 2, 7, 1]
+    callback, recording = adapter_for(array)
+    array[0], array[2] = array[2], array[0]
+    callback(array, [2, 0], moving_index=0)
+    assert list(recording) == [(OP_SWAP, 2, 0, 0)]
+
+
+def test_changes_become_writes_with_the_moving_index_last():
+    array = [4, 2, 7, 1]
+    callback, recording = adapter_for(array)
+    array[1] = 9
+    callback(array, [], moving_index=1)
+    array[3] = 5  # Not highlighted: found by the whole-array check
+    callback(array, [0])
+    array[0], array[1], array[2] = 8, 8, 8
+    callback(array, [0, 2], moving_index=0)
+    assert list(recording) == [
+        (OP_WRITE, 1, -1, 9),
+        (OP_WRITE, 3, -1, 5),
+        (OP_WRITE, 2, -1, 8),
+        (OP_WRITE, 1, -1, 8),
+        (OP_WRITE, 0, -1, 8),
+    ]
+
+
+def test_sweep_calls_become_sweeps():
+    array = [1, 2, 3]
+    callback, recording = adapter_for(array)
+    callback(array, [], moving_index=2, sweep=True)
+    callback(array, [], sweep=True)
+    assert list(recording) == [(OP_SWEEP, 2, -1, 0)]
+
+
+def test_diffing_an_instrumented_array_is_not_counted():
+    array = InstrumentedArray([3, 1, 2])
+    callback, recording = adapter_for(array)
+    array.data[0], array.data[1] = array.data[1], array.data[0]
+    callback(array, [0, 1], moving_index=1)
+    assert list(recording) == [(OP_SWAP, 0, 1, 0)]
+    assert array.counters.reads == 0
+    assert array.counters.comparisons == 0
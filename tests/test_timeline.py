@@ -0,0 +1,39 @@
+import random
+
+from discovery import load_algorithm
+from recorder import record_algorithm, replay_ops
+from steps import StepSink
+from timeline import Timeline
+
+
+def record(name, size=60, seed=5):
+    rng = random.Random(seed)
+    values = [rng.randint(1, 30) for _ in range(size)]
+    func, protocol = load_algorithm(name)
+    return record_algorithm(func, protocol, values)
+
+
+def test_seek_matches_replaying_up_to_the_step():
+    recording = record("quick_sort")
+    steps = list(recording)
+    timeline = Timeline(recording, keyframe_interval=16)
+    assert len(timeline.keyframes) > 2  # Seeks start from several keyframes
+    model = list(recording.initial_array)
+    for step in range(len(timeline) + 1):
+        expected = replay_ops(steps[:step], StepSink(), list(recording.initial_array))
+        assert timeline.seek(model, step) == step
+        assert model == expected, step
+
+
+def test_seek_clamps_and_iter_from_continues_the_run():
+    recording = record("merge_sort")
+    timeline = Timeline(recording, keyframe_interval=16)
+    model = list(recording.initial_array)
+    assert timeline.seek(model, -5) == 0
+    assert model == recording.initial_array
+    assert timeline.seek(model, len(timeline) + 5) == len(timeline)
+    assert model == sorted(recording.initial_array)
+    middle = len(timeline) // 2
+    timeline.seek(model, middle)
+    assert list(timeline.iter_from(model, middle)) == list(recording)[middle:]
+    assert model == sorted(recording.initial_array)
@@ -0,0 +1,116 @@
+import bisect
+import math
+from array import array
+from recorder import RECORD_WIDTH
+from steps import OP_SWAP, OP_WRITE, OP_PARTITION
+
+KEYFRAME_INTERVAL = 4096  # Minimum steps between two full-array snapshots
+KEYFRAME_MEMORY_BUDGET = 64 * 1024 * 1024  # Bytes all keyframes may use together
+
+
+class Timeline:
+    """
+    A seekable view of a recorded run: the step deltas of a Recording plus
+    periodic full-array keyframes.
+    Seeking to step k restores the nearest keyframe at or before k and
+    replays at most ``interval`` deltas, so any position is reachable in
+    O(n + interval) work without re-running the algorithm. The interval is
+    at least ``keyframe_interval`` and grows as needed to keep every keyframe
+    within ``memory_budget`` bytes: a bigger budget means denser keyframes
+    and faster seeks.
+    Attributes:
+        recording (Recording): The recorded steps.
+        interval (int): Steps between two consecutive keyframes.
+        keyframes (list): array('q') snapshots of the array at every multiple of interval.
+        partition_steps (list): The positions of the OP_PARTITION steps, in order.
+    Methods:
+        __len__(self):
+            Returns the number of steps in the run.
+        seek(self, model, step):
+            Rewrites ``model`` in place to its state after ``step`` steps.
+        step_at(self, step):
+            Returns the (opcode, i, j, value) record of one step.
+        partitions_before(self, step):
+            Returns the (lo, hi, lane) of every partition step before ``step``.
+        iter_from(self, model, step):
+            Yields the steps after ``step``, applying each one to ``model``.
+        nbytes(self):
+            Returns the memory used by the deltas and keyframes.
+    """
+
+    def __init__(
+        self,
+        recording,
+        keyframe_interval=KEYFRAME_INTERVAL,
+        memory_budget=KEYFRAME_MEMORY_BUDGET,
+    ):
+        self.recording = recording
+        total = len(recording)
+        snapshot_bytes = max(1, len(recording.initial_array)) * array("q").itemsize
+        max_keyframes = max(1, memory_budget // snapshot_bytes)
+        self.interval = max(1, keyframe_interval, math.ceil(total / max_keyframes))
+        self.keyframes = self._build_keyframes()
+        opcodes = recording.ops[::RECORD_WIDTH]
+        self.partition_steps = [
+            step for step, opcode in enumerate(opcodes) if opcode == OP_PARTITION
+        ]
+
+    def _build_keyframes(self):
+        model = list(self.recording.initial_array)
+        keyframes = [array("q", model)]
+        total = len(self)
+        for start in range(0, total, self.interval):
+            stop = min(total, start + self.interval)
+            self._apply(model, start, stop)
+            if stop % self.interval == 0 and stop < total:
+                keyframes.append(array("q", model))
+        return keyframes
+
+    def _apply(self, model, start, stop):
+        """Apply the deltas of steps [start, stop) to model."""
+        ops = self.recording.ops
+        for k in range(start * RECORD_WIDTH, stop * RECORD_WIDTH, RECORD_WIDTH):
+            opcode = ops[k]
+            if opcode == OP_SWAP:
+                i, j = ops[k + 1], ops[k + 2]
+                model[i], model[j] = model[j], model[i]
+            elif opcode == OP_WRITE:
+                model[ops[k + 1]] = ops[k + 3]
+
+    def __len__(self):
+        return len(self.recording)
+
+    def seek(self, model, step):
+        step = max(0, min(len(self), step))
+        keyframe = min(step // self.interval, len(self.keyframes) - 1)
+        model[:] = self.keyframes[keyframe]
+        self._apply(model, keyframe * self.interval, step)
+        return step
+
+    def step_at(self, step):
+        k = step * RECORD_WIDTH
+        return tuple(self.recording.ops[k : k + RECORD_WIDTH])
+
+    def partitions_before(self, step):
+        ops = self.recording.ops
+        records = []
+        count = bisect.bisect_left(self.partition_steps, step)
+        for position in self.partition_steps[:count]:
+            k = position * RECORD_WIDTH
+            records.append((ops[k + 1], ops[k + 2], ops[k + 3]))
+        return records
+
+    def iter_from(self, model, step):
+        """Yield the steps after ``step``; ``model`` must be at ``step`` already."""
+        ops = self.recording.ops
+        for k in range(step * RECORD_WIDTH, len(ops), RECORD_WIDTH):
+            opcode, i, j, value = ops[k], ops[k + 1], ops[k + 2], ops[k + 3]
+            if opcode == OP_SWAP:
+                model[i], model[j] = model[j], model[i]
+            elif opcode == OP_WRITE:
+                model[i] = value
+            yield opcode, i, j, value
+
+    def nbytes(self):
+        keyframe_bytes = sum(k.itemsize * len(k) for k in self.keyframes)
+        return self.recording.nbytes() + keyframe_bytes